@@ -1 +1,29 @@
-from .inflation import calc_inflation, Location, latest_cpi_df
+import importlib
+
+from .location import Location
+
+
+def register_accessors():
+    """
+    Registers the `ausdex` accessors for pandas DataFrames and Series (e.g. `df.ausdex.inflate(...)`).
+
+    Importing `ausdex.accessor` or `ausdex.inflation` does the same. Calling this more than once has no effect.
+    """
+    from . import accessor  # noqa: F401
+
+
+# These submodules import heavy dependencies (e.g. pandas and plotly) so they are only imported when first used
+LAZY_SUBMODULES = ("inflation", "files", "dates", "viz")
+
+
+def __getattr__(name):
+    if name in LAZY_SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+
+    # The inflation module imports pandas so it is only imported when it is first used
+    if name in ("calc_inflation", "latest_cpi_df"):
+        from . import inflation
+
+        return getattr(inflation, name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
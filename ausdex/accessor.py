@@ -0,0 +1,132 @@
+from datetime import datetime
+from typing import Union, Optional, List
+
+import numpy as np
+import pandas as pd
+
+from .location import Location
+from .dates import convert_date
+
+
+def get_cpi(cpi=None):
+    # The inflation module registers these accessors when it is imported so it is imported here only when needed
+    from .inflation import _cpi
+
+    return cpi or _cpi
+
+
+@pd.api.extensions.register_dataframe_accessor("ausdex")
+class AusdexDataFrameAccessor:
+    """
+    Adjusts the columns of a DataFrame for inflation with `df.ausdex.inflate(...)`.
+
+    The accessor is registered when `ausdex.accessor` (or `ausdex.inflation`) is imported.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self._df = df
+
+    def _column_or_value(self, value):
+        if isinstance(value, str) and value in self._df.columns:
+            return self._df[value]
+        return value
+
+    def inflate(
+        self,
+        value: Union[str, List[str]],
+        date: Union[str, List[str], datetime],
+        location: Union[Location, str] = Location.AUSTRALIA,
+        to: Union[str, datetime, None] = None,
+        date_format: Optional[str] = None,
+        cpi=None,
+    ) -> Union[pd.Series, pd.DataFrame]:
+        """
+        Adjusts one or more columns of values for inflation.
+
+        The CPI lookups run directly on the columns of the DataFrame. Each date column and the location column
+        are converted only once even when they are shared by several value columns.
+
+        Args:
+            value (str, List[str]): The name of the column (or a list of columns) with the values to adjust.
+            date (str, List[str], datetime): The name of the column with the dates that the values are in relation to.
+                This can be a list with a date column for each value column, or a single date for all the rows.
+            location (Location, str): The name of a column with the location for each row or a single location for all the rows.
+                Default is 'Australia'.
+            to (str, datetime, optional): The name of a column with the dates to adjust the values to
+                or a single date for all the rows. Defaults to the current date.
+            date_format (str, optional): The strftime format of date strings. If not given, then the format is inferred.
+            cpi (CPI, optional): The CPI object to use. Defaults to the module-level CPI object.
+
+        Returns:
+            Union[pd.Series, pd.DataFrame]: The adjusted values with the same index as the DataFrame.
+                If `value` is a single column then it is a Series, otherwise it is a DataFrame with a column for each value column.
+        """
+        table = get_cpi(cpi).table
+        values = [value] if isinstance(value, str) else list(value)
+        dates = date if isinstance(date, list) else [date] * len(values)
+        if len(dates) != len(values):
+            raise ValueError("There must be one date column for each value column.")
+
+        columns = table.columns(self._column_or_value(location))
+        evaluation_date = datetime.now() if to is None else self._column_or_value(to)
+        evaluation_cpi = table.lookup(convert_date(evaluation_date, format=date_format), columns)
+
+        # The ratio of the CPIs is calculated once for each distinct date column
+        factors = {}
+        for date_column in dates:
+            key = date_column if isinstance(date_column, str) else id(date_column)
+            if key not in factors:
+                original_date = convert_date(self._column_or_value(date_column), format=date_format)
+                factors[key] = evaluation_cpi / table.lookup(original_date, columns)
+
+        results = {}
+        for value_column, date_column in zip(values, dates):
+            factor = factors[date_column if isinstance(date_column, str) else id(date_column)]
+            results[value_column] = self._df[value_column].to_numpy(dtype=float, copy=False) * factor
+
+        if isinstance(value, str):
+            return pd.Series(results[value], index=self._df.index, name=value)
+        return pd.DataFrame(results, index=self._df.index)
+
+
+@pd.api.extensions.register_series_accessor("ausdex")
+class AusdexSeriesAccessor:
+    """
+    Adjusts a Series of values for inflation with `series.ausdex.inflate(...)`.
+
+    The accessor is registered when `ausdex.accessor` (or `ausdex.inflation`) is imported.
+    """
+
+    def __init__(self, series: pd.Series):
+        self._series = series
+
+    def inflate(
+        self,
+        date: Union[pd.Series, np.ndarray, str, datetime],
+        location: Union[Location, str, pd.Series] = Location.AUSTRALIA,
+        to: Union[pd.Series, str, datetime, None] = None,
+        date_format: Optional[str] = None,
+        cpi=None,
+    ) -> pd.Series:
+        """
+        Adjusts the values in the Series for inflation.
+
+        Args:
+            date (pd.Series, np.ndarray, str, datetime): The dates that the values are in relation to.
+            location (Location, str, pd.Series): The location for each value or a single location for all the values.
+                Default is 'Australia'.
+            to (pd.Series, str, datetime, optional): The dates to adjust the values to. Defaults to the current date.
+            date_format (str, optional): The strftime format of date strings. If not given, then the format is inferred.
+            cpi (CPI, optional): The CPI object to use. Defaults to the module-level CPI object.
+
+        Returns:
+            pd.Series: The adjusted values with the same index and name as the Series.
+        """
+        result = get_cpi(cpi).calc_inflation(
+            self._series.to_numpy(dtype=float, copy=False),
+            original_date=date,
+            evaluation_date=to,
+            location=location,
+            date_format=date_format,
+        )
+        return pd.Series(result, index=self._series.index, name=self._series.name)
@@ -0,0 +1,184 @@
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+def is_polars(obj) -> bool:
+    """
+    Returns whether or not an object comes from Polars.
+
+    This checks the module of the object's type so that Polars does not need to be imported.
+    """
+    return type(obj).__module__.startswith("polars.")
+
+
+def is_arrow(obj) -> bool:
+    """Returns whether or not an object is an Apache Arrow array (or chunked array) or a Polars Series."""
+    return type(obj).__module__.startswith("pyarrow.") or is_polars(obj)
+
+
+def chunks(array) -> list:
+    """Returns the contiguous arrays of an Arrow array, a chunked array or a Polars Series."""
+    if is_polars(array):
+        array = array.to_arrow()
+    return list(array.chunks) if hasattr(array, "chunks") else [array]
+
+
+def concatenate(arrays: list, dtype) -> np.ndarray:
+    """Joins the arrays for each chunk. A single chunk is returned as it is so that it is not copied."""
+    if len(arrays) == 1:
+        return arrays[0]
+    if not arrays:
+        return np.empty(0, dtype=dtype)
+    return np.concatenate(arrays)
+
+
+def to_numpy_values(array) -> np.ndarray:
+    """
+    Returns the values of an Arrow array as float64.
+
+    Float64 chunks without nulls are read from the Arrow buffers without copying. Nulls become NaN.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    values = []
+    for chunk in chunks(array):
+        if chunk.type != pa.float64():
+            chunk = chunk.cast(pa.float64())
+        if chunk.null_count:
+            chunk = pc.fill_null(chunk, np.nan)
+        values.append(chunk.to_numpy(zero_copy_only=True))
+    return concatenate(values, float)
+
+
+def to_numpy_dates(array) -> np.ndarray:
+    """
+    Returns the dates in an Arrow array as a NumPy array.
+
+    Date and timestamp chunks are converted directly to datetime64[D] from their integer buffers
+    (timestamps with a time zone use the date in UTC) and nulls become NaT.
+    Other types (e.g. strings) are returned as object arrays to be parsed by `convert_date`.
+    """
+    import pyarrow as pa
+
+    dates = []
+    for chunk in chunks(array):
+        if pa.types.is_date(chunk.type) or pa.types.is_timestamp(chunk.type):
+            dates.append(chunk.to_numpy(zero_copy_only=False).astype("datetime64[D]", copy=False))
+        else:
+            dates.append(chunk.to_numpy(zero_copy_only=False))
+    if len({date.dtype for date in dates}) > 1:
+        dates = [date.astype(object) for date in dates]
+    return concatenate(dates, "datetime64[D]")
+
+
+def to_pandas_locations(array) -> pd.Series:
+    """
+    Returns the locations in an Arrow array as a categorical pandas Series.
+
+    Dictionary-encoded chunks (e.g. Polars categoricals) keep their codes
+    so that each distinct location is only resolved once.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    categories = []
+    codes = []
+    for chunk in chunks(array):
+        if not pa.types.is_dictionary(chunk.type):
+            chunk = pc.dictionary_encode(chunk)
+        chunk_codes = pc.fill_null(chunk.indices.cast(pa.int64()), -1).to_numpy(zero_copy_only=False)
+        # The codes are shifted so that they index into the categories of all the chunks so far
+        offset = len(categories)
+        codes.append(np.where(chunk_codes >= 0, chunk_codes + offset, -1))
+        categories.extend(chunk.dictionary.to_pylist())
+
+    # The same location can appear in the dictionaries of different chunks so the categories are made unique
+    unique_categories, category_codes = np.unique(np.array(categories, dtype=object), return_inverse=True)
+    category_codes = np.append(category_codes, -1)
+    return pd.Series(pd.Categorical.from_codes(category_codes[concatenate(codes, np.int64)], unique_categories))
+
+
+def from_numpy(result, like: list):
+    """
+    Returns the result of a calculation as an Arrow array (or a Polars Series if any of the inputs is a Polars Series).
+
+    The Arrow array uses the buffer of the NumPy array without copying it and NaN values are marked as null.
+    A scalar result (e.g. for inputs with a single element) becomes an array with one element
+    so that the type of the result does not depend on the length of the inputs.
+    Scalars are only returned as they are if none of the inputs are Arrow arrays or Polars Series.
+    """
+    if not any(is_arrow(obj) for obj in like):
+        return result
+
+    import pyarrow as pa
+
+    array = pa.array(np.atleast_1d(np.asarray(result, dtype=float)), from_pandas=True)
+    polars_inputs = [obj for obj in like if is_polars(obj)]
+    if polars_inputs:
+        import polars as pl
+
+        return pl.Series(getattr(polars_inputs[0], "name", ""), array)
+    return array
+
+
+def to_numpy_arguments(value, original_date, evaluation_date, location):
+    """Converts the Arrow arguments to `CPI.calc_inflation` to NumPy arrays and pandas Series."""
+    if is_arrow(value):
+        value = to_numpy_values(value)
+    if is_arrow(original_date):
+        original_date = to_numpy_dates(original_date)
+    if is_arrow(evaluation_date):
+        evaluation_date = to_numpy_dates(evaluation_date)
+    if is_arrow(location):
+        location = to_pandas_locations(location)
+    return value, original_date, evaluation_date, location
+
+
+def calc_inflation(cpi, value, original_date, evaluation_date, location, date_format: Optional[str] = None, **kwargs):
+    """
+    Adjusts values for inflation where any of the arguments are Arrow arrays or Polars Series.
+
+    The arguments are read from the Arrow buffers rather than being converted to pandas first (see `to_numpy_values`,
+    `to_numpy_dates` and `to_pandas_locations`) and the result is returned as an Arrow array or a Polars Series.
+
+    Args:
+        cpi (CPI): The CPI object to adjust the values with.
+        value: The values to adjust.
+        original_date: The dates that the values are in relation to.
+        evaluation_date: The dates to adjust the values to.
+        location: The location for calculating the CPI.
+        date_format (str, optional): The strftime format of date strings. If not given, then the format is inferred.
+        **kwargs: Other keyword arguments for `CPI.calc_inflation`.
+
+    Returns:
+        The adjusted values as an Arrow array or a Polars Series.
+    """
+    like = [value, original_date, evaluation_date, location]
+    value, original_date, evaluation_date, location = to_numpy_arguments(
+        value, original_date, evaluation_date, location
+    )
+    result = cpi.calc_inflation(
+        value, original_date, evaluation_date=evaluation_date, location=location, date_format=date_format, **kwargs
+    )
+    return from_numpy(result, like)
+
+
+def cpi_at(cpi, date, location, date_format: Optional[str] = None):
+    """
+    Returns the CPI for dates where the dates or the locations are Arrow arrays or Polars Series.
+
+    Args:
+        cpi (CPI): The CPI object.
+        date: The dates.
+        location: The location for each date or a single location.
+        date_format (str, optional): The strftime format of date strings. If not given, then the format is inferred.
+
+    Returns:
+        The CPI values as an Arrow array or a Polars Series.
+    """
+    _, converted_date, _, converted_location = to_numpy_arguments(None, date, None, location)
+    result = cpi.cpi_at(converted_date, location=converted_location, date_format=date_format)
+    return from_numpy(result, [date, location])
@@ -0,0 +1,81 @@
+import sys
+import contextlib
+from datetime import datetime
+from pathlib import Path
+from typing import Union, TextIO, Optional
+
+import pandas as pd
+
+from .location import Location
+from .inflation import CPI, _cpi
+
+
+def adjust_csv(
+    input: Union[str, Path, TextIO],
+    output: Union[str, Path, TextIO, None],
+    value_column: str,
+    original_date_column: str,
+    evaluation_date_column: Optional[str] = None,
+    location_column: Optional[str] = None,
+    evaluation_date: Union[datetime, str, None] = None,
+    location: Union[Location, str] = Location.AUSTRALIA,
+    output_column: str = "adjusted",
+    chunksize: int = 100_000,
+    date_format: Optional[str] = None,
+    cpi: Optional[CPI] = None,
+) -> int:
+    """
+    Adjusts a column of values in a CSV file for inflation.
+
+    The CSV file is streamed in chunks so that memory use does not grow with the size of the input.
+    The rows are written to the output with the adjusted values in a new column.
+
+    Args:
+        input (str, Path, TextIO): The CSV file to read. If '-' then it reads from stdin.
+        output (str, Path, TextIO, None): The CSV file to write. If None or '-' then it writes to stdout.
+        value_column (str): The name of the column with the values to be adjusted.
+        original_date_column (str): The name of the column with the dates that the values are in relation to.
+        evaluation_date_column (str, optional): The name of the column with the dates to adjust the values to.
+            If not given, then `evaluation_date` is used for all rows.
+        location_column (str, optional): The name of the column with the location for each row.
+            If not given, then `location` is used for all rows.
+        evaluation_date (datetime, str, optional): The date to adjust all the values to. Defaults to the current date.
+        location (Location, str, optional): The location for calculating the CPI for all rows. Default is 'Australia'.
+        output_column (str): The name of the column for the adjusted values. Default 'adjusted'.
+        chunksize (int): The number of rows to read at a time. Default 100,000.
+        date_format (str, optional): The strftime format of the dates. If not given, then the format is inferred.
+        cpi (CPI, optional): The CPI object to use. Defaults to the module-level CPI object.
+
+    Returns:
+        int: The number of rows adjusted.
+    """
+    cpi = cpi or _cpi
+    if str(input) == "-":
+        input = sys.stdin
+    if output is None or str(output) == "-":
+        output = sys.stdout
+    if evaluation_date is None:
+        evaluation_date = datetime.now()
+
+    with contextlib.ExitStack() as stack:
+        if not hasattr(output, "write"):
+            output = stack.enter_context(open(output, "w", newline=""))
+
+        # The dates are read as strings because pandas would read a column of years (e.g. '2000') as integers
+        # which are not years to `convert_date`, or as floats if a chunk has blank rows
+        date_columns = [original_date_column] + ([evaluation_date_column] if evaluation_date_column else [])
+        rows = 0
+        for chunk in pd.read_csv(input, chunksize=chunksize, dtype={column: str for column in date_columns}):
+            adjusted = cpi.calc_inflation(
+                chunk[value_column],
+                chunk[original_date_column],
+                evaluation_date=chunk[evaluation_date_column] if evaluation_date_column else evaluation_date,
+                location=chunk[location_column] if location_column else location,
+                date_format=date_format,
+            )
+
+            chunk[output_column] = adjusted
+            chunk.to_csv(output, header=(rows == 0), index=False)
+            rows += len(chunk)
+
+    return rows
@@ -0,0 +1,111 @@
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+import numpy as np
+
+from .dates import convert_date
+from .table import CPITable
+
+
+BLOCK_SIZE = 1 << 20
+
+
+def is_scalar(obj) -> bool:
+    """Returns whether or not an argument is a single value which applies to all the rows."""
+    return np.ndim(obj) == 0
+
+
+def output_array(out: Union[np.ndarray, str, Path, None], size: int) -> np.ndarray:
+    """
+    Returns the array to write the adjusted values to.
+
+    If `out` is a path then a float64 .npy file is created and memory-mapped.
+    If it is None then an array is allocated in memory.
+    """
+    if out is None:
+        return np.empty(size)
+    if isinstance(out, (str, Path)):
+        return np.lib.format.open_memmap(out, mode="w+", dtype=float, shape=(size,))
+    if out.shape != (size,):
+        raise ValueError(f"The output array has the shape {out.shape} but there are {size} values.")
+    return out
+
+
+def calc_inflation_blocks(
+    table: CPITable,
+    value,
+    original_date,
+    evaluation_date,
+    location,
+    out: Union[np.ndarray, str, Path, None] = None,
+    block_size: int = BLOCK_SIZE,
+    date_format: Optional[str] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> np.ndarray:
+    """
+    Adjusts arrays of values for inflation one block of rows at a time.
+
+    This is for arrays which are larger than memory
+    (e.g. `np.memmap` arrays or .npy files loaded with `np.load(path, mmap_mode='r')`).
+    Each block of the inputs is read, converted and adjusted before the result is written to the output,
+    so the temporary arrays are never larger than the block size.
+
+    Args:
+        table (CPITable): The CPI values for each location.
+        value (np.ndarray): The values to adjust.
+        original_date: The dates that the values are in relation to, as an array or a single date.
+        evaluation_date: The dates to adjust the values to, as an array or a single date.
+        location: The location for each value or a single location.
+        out (np.ndarray, str, Path, optional): The float64 array to write the adjusted values to
+            or the path to a .npy file to create. If not given, then an array is allocated in memory.
+        block_size (int): The number of rows in each block. Default 1,048,576.
+        date_format (str, optional): The strftime format of date strings. If not given, then the format is inferred.
+        progress (Callable[[int, int], None], optional): A function which is called after each block
+            with the number of rows adjusted so far and the total number of rows.
+
+    Raises:
+        ValueError: If the arrays have different lengths or the block size is not positive.
+
+    Returns:
+        np.ndarray: The output array with the adjusted values.
+    """
+    if block_size < 1:
+        raise ValueError("The block size must be positive.")
+
+    arguments = [value, original_date, evaluation_date, location]
+    sizes = {len(argument) for argument in arguments if not is_scalar(argument)}
+    if len(sizes) != 1:
+        raise ValueError("At least one argument must be an array and the arrays must all have the same length.")
+    size = sizes.pop()
+    out = output_array(out, size)
+
+    # Single dates and locations are converted once rather than for each block
+    if is_scalar(original_date):
+        original_date = convert_date(original_date, format=date_format)
+    if is_scalar(evaluation_date):
+        evaluation_date = convert_date(evaluation_date, format=date_format)
+    if is_scalar(location):
+        location = table.columns(location)
+
+    def block(argument, start, stop):
+        return argument if is_scalar(argument) else argument[start:stop]
+
+    for start in range(0, size, block_size):
+        stop = min(start + block_size, size)
+        columns = location if is_scalar(location) else table.columns(location[start:stop])
+        original_dates = block(original_date, start, stop)
+        evaluation_dates = block(evaluation_date, start, stop)
+        if not is_scalar(original_dates):
+            original_dates = convert_date(original_dates, format=date_format)
+        if not is_scalar(evaluation_dates):
+            evaluation_dates = convert_date(evaluation_dates, format=date_format)
+
+        original_cpi = table.lookup(original_dates, columns)
+        evaluation_cpi = table.lookup(evaluation_dates, columns)
+        np.divide(block(value, start, stop) * evaluation_cpi, original_cpi, out=out[start:stop])
+        if progress:
+            progress(stop, size)
+
+    if isinstance(out, np.memmap):
+        out.flush()
+    return out
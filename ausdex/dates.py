@@ -1,40 +1,244 @@
-from typing import Union
+import re
+from typing import Union, Optional
 import numpy as np
 import pandas as pd
-import modin.pandas as mpd
-from datetime import datetime, timedelta
+from datetime import date as datetime_date, datetime
 import calendar
 
+from . import instrument
 
-def convert_date(date: Union[datetime, str, pd.Series, np.ndarray]) -> np.ndarray:
+
+def is_modin(obj) -> bool:
+    """
+    Returns whether or not an object comes from modin.
+
+    This checks the module of the object's type so that modin does not need to be imported.
+    """
+    return type(obj).__module__.startswith("modin.")
+
+
+# Formats which are parsed without pandas: YYYY, YYYY-MM, YYYY-MM-DD, YYYYQn, YYYY-Qn and ABS-style Mar-2020
+DATE_PATTERN = re.compile(
+    r"^(?P<year>\d{4})(?:-(?P<month>\d{2})(?:-(?P<day>\d{2}))?|-?[Qq](?P<quarter>[1-4]))?$"
+    r"|^(?P<month_name>[A-Za-z]{3})-(?P<month_name_year>\d{4})$"
+)
+MONTH_ABBREVIATIONS = {name.lower(): index for index, name in enumerate(calendar.month_abbr) if name}
+
+
+def parse_date_string(string: str) -> Optional[datetime]:
+    """
+    Parses a date string in one of the common formats without using pandas.
+
+    The result is the same as with `pd.to_datetime`.
+
+    Args:
+        string (str): The date string. The accepted formats are YYYY, YYYY-MM, YYYY-MM-DD, YYYYQn, YYYY-Qn and Mar-2020.
+
+    Returns:
+        datetime, optional: The date or None if the string is not in one of these formats.
+    """
+    match = DATE_PATTERN.match(string)
+    if not match:
+        return None
+
+    try:
+        if match["month_name"]:
+            month = MONTH_ABBREVIATIONS.get(match["month_name"].lower())
+            return datetime(int(match["month_name_year"]), month, 1) if month else None
+        if match["quarter"]:
+            return datetime(int(match["year"]), 3 * int(match["quarter"]) - 2, 1)
+        return datetime(int(match["year"]), int(match["month"] or 1), int(match["day"] or 1))
+    except ValueError:
+        # Leave invalid dates for pandas so that the errors are consistent
+        return None
+
+
+def parse_dates(dates: np.ndarray, format: Optional[str] = None) -> np.ndarray:
+    """
+    Parses an array of date strings (or other objects) to datetime64[D].
+
+    Each unique value is only parsed once and the results are broadcast back to the shape of the input.
+    Strings in common formats are parsed without pandas (see `parse_date_string`) and the rest are parsed with `pd.to_datetime`.
+
+    Args:
+        dates (np.ndarray): The dates to parse.
+        format (str, optional): The strftime format of the dates which is passed to `pd.to_datetime`.
+            If given then all the dates are parsed with this format.
+
+    Returns:
+        np.ndarray: The dates with datatype datetime64[D]. Missing values are NaT.
+    """
+    dates = np.asarray(dates, dtype=object)
+    codes, uniques = pd.factorize(dates.ravel())
+
+    if format:
+        parsed = np.array(pd.to_datetime(uniques, format=format), dtype="datetime64[D]")
+    else:
+        parsed = np.empty(len(uniques), dtype="datetime64[D]")
+        remaining = []
+        for index, value in enumerate(uniques):
+            result = parse_date_string(value) if isinstance(value, str) else None
+            if result is None:
+                remaining.append(index)
+            else:
+                parsed[index] = result
+        if remaining:
+            parsed[remaining] = np.array(pd.to_datetime(uniques[remaining]), dtype="datetime64[D]")
+
+    # Missing values have the code -1 which selects the final item
+    parsed = np.append(parsed, np.datetime64("NaT"))
+
+    return parsed[codes].reshape(dates.shape)
+
+
+# Fractions of a day smaller than this are treated as rounding error so that decimal years round trip exactly
+DAY_TOLERANCE = 1e-6
+
+
+def days_before_year(years: np.ndarray) -> np.ndarray:
+    """Returns the number of days from 1970-01-01 to the first day of each year using integer arithmetic."""
+    previous = years - 1
+    return 365 * (years - 1970) + previous // 4 - previous // 100 + previous // 400 - 477
+
+
+def is_leap_year(years: np.ndarray) -> np.ndarray:
+    """Returns whether or not each year is a leap year."""
+    return (years % 4 == 0) & ((years % 100 != 0) | (years % 400 == 0))
+
+
+def decimal_year_to_datetime64(decimal_years: Union[float, np.ndarray]) -> np.ndarray:
+    """
+    Converts decimal years (e.g. 2005.5) to dates.
+
+    The fraction of the year is converted to days in that year and then truncated to the day.
+    This is vectorized so that no Python work is done per element.
+
+    Args:
+        decimal_years (float, np.ndarray): The decimal years.
+
+    Returns:
+        np.ndarray: The dates with the datatype datetime64[D] in the same shape as the input. NaN values give NaT.
+    """
+    decimal_years = np.asarray(decimal_years, dtype=float)
+    missing = np.isnan(decimal_years)
+    decimal_years = np.where(missing, 1970.0, decimal_years)
+    whole_years = np.floor(decimal_years)
+    years = whole_years.astype(np.int64)
+
+    days_in_year = 365 + is_leap_year(years)
+    days_of_year = np.floor((decimal_years - whole_years) * days_in_year + DAY_TOLERANCE).astype(np.int64)
+    days = np.asarray(days_before_year(years) + days_of_year)
+
+    dates = days.view("datetime64[D]")
+    dates[missing] = np.datetime64("NaT")
+    return dates
+
+
+def datetime64_to_decimal_year(dates: np.ndarray) -> np.ndarray:
+    """
+    Converts dates to decimal years (e.g. 1996-07-02 is 1996.5).
+
+    The decimal year is the year plus the number of days since the start of the year divided by the number of days in the year.
+    This is vectorized with integer arithmetic so that no Python work is done per element.
+
+    Args:
+        dates (np.ndarray): The dates which are converted to the datatype datetime64[D].
+
+    Returns:
+        np.ndarray: The decimal years as floats in the same shape as the input. NaT values give NaN.
+    """
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    missing = np.isnat(dates)
+    days = np.where(missing, 0, dates.view(np.int64))
+
+    # Estimate the year and then correct it by at most a year in either direction
+    years = np.floor_divide(days, 365.2425).astype(np.int64) + 1970
+    years -= days < days_before_year(years)
+    years += days >= days_before_year(years + 1)
+
+    days_of_year = days - days_before_year(years)
+    decimal_years = np.asarray(years + days_of_year / (365 + is_leap_year(years)))
+    decimal_years[missing] = np.nan
+    return decimal_years
+
+
+@instrument.timed("convert_date", rows=np.size)
+def convert_date(
+    date: Union[datetime, str, pd.Series, np.ndarray], format: Optional[str] = None
+) -> np.ndarray:
     """Receives `date` from a variety of datatypes and converts it into a numeric value in a numpy array.
 
     If `date` is a vector then it returns a vector otherwise it returns a single scalar value.
+    Floats (and arrays of floats) are treated as decimal years (e.g. 2005.5).
 
     Args:
         date (Union[datetime, str, pd.Series, np.ndarray]): The date to be converted
+        format (str, optional): The strftime format of date strings which is passed to `pd.to_datetime`.
+            If not given, then common formats are parsed directly and others are inferred by pandas.
 
     Returns:
         np.ndarray: A NumPy array with datatype datetime64[D].
     """
     if isinstance(date, int):
-        date = pd.to_datetime(str(date))
-    elif isinstance(date, float):
-        year = int(date)
-        days_in_year = 366 if calendar.isleap(year) else 365
-        date = datetime(year, 1, 1) + timedelta(days=(date % 1) * days_in_year)
+        date = str(date)
+
+    if isinstance(date, float):
+        return decimal_year_to_datetime64(date)
+    elif isinstance(date, str):
+        return parse_dates(np.array(date, dtype=object), format=format)
     elif isinstance(date, np.ndarray):
+        if np.issubdtype(date.dtype, np.datetime64):
+            return date.astype("datetime64[D]", copy=False)
+        if np.issubdtype(date.dtype, np.floating):
+            return decimal_year_to_datetime64(date)
         if np.issubdtype(date.dtype, np.integer):
             date = date.astype(str)
-        date = pd.to_datetime(date)
-    elif type(date) == mpd.Series:
-        date = mpd.to_datetime(date)
+        if date.dtype.kind in "OUS":
+            return parse_dates(date, format=format)
+        date = pd.to_datetime(date, format=format)
+    elif isinstance(date, pd.Series) and date.dtype == object:
+        return parse_dates(date.to_numpy(), format=format)
+    elif isinstance(date, pd.Series) and np.issubdtype(date.dtype, np.floating):
+        return decimal_year_to_datetime64(date.to_numpy())
+    elif is_modin(date):
+        import modin.pandas as mpd
+
+        date = mpd.to_datetime(date, format=format)
     else:
-        date = pd.to_datetime(date)
+        date = pd.to_datetime(date, format=format)
 
     return np.array(date, dtype="datetime64[D]")
 
 
+# The dates which `scalar_to_days` accepts
+SCALAR_DATE_TYPES = (str, datetime_date, int, float, np.datetime64)
+EPOCH_ORDINAL = datetime_date(1970, 1, 1).toordinal()
+
+
+def scalar_to_days(
+    date: Union[datetime, str, int, float, np.datetime64], format: Optional[str] = None
+) -> Optional[int]:
+    """
+    Converts a single date to the number of days since 1970-01-01 in the same way as `convert_date`.
+
+    Dates and naive datetimes are converted with integer arithmetic and other values are converted with `convert_date`.
+
+    Args:
+        date (datetime, str, int, float, np.datetime64): The date. Floats are decimal years.
+        format (str, optional): The strftime format of date strings. If not given, then the format is inferred.
+
+    Returns:
+        int, optional: The number of days since 1970-01-01 or None if the date is missing.
+    """
+    if isinstance(date, datetime_date) and getattr(date, "tzinfo", None) is None:
+        return date.toordinal() - EPOCH_ORDINAL
+
+    converted = convert_date(date, format=format)
+    if np.isnat(converted):
+        return None
+    return int(converted.astype(np.int64))
+
+
 def timestamp_to_decimal_year(date):
     return np.array(date.year + (date.dayofyear - 1) / (365.0 + date.is_leap_year * 1.0))
 
@@ -71,11 +275,11 @@ def date_time_to_decimal_year(
         # if a scalar numerical value, then assume that this is already as a numerical date
         return np.array([date])
     elif isinstance(date, (datetime, pd.Timestamp, np.datetime64)):
-        # if a scalar date value, then convert to pandas to be converted to decimal year
-        return timestamp_to_decimal_year(pd.to_datetime(date))
-    elif isinstance(date, (pd.Series, mpd.Series, np.ndarray)):
+        # if a scalar date value, then convert to be converted to decimal year
+        return datetime64_to_decimal_year(convert_date(date))
+    elif isinstance(date, (pd.Series, np.ndarray)) or is_modin(date):
         if date.dtype in [float, int]:
             # if it is already an array of numerical values, then just return it
             return date
 
-    return timestamp_to_decimal_year(pd.to_datetime(convert_date(date)))
+    return datetime64_to_decimal_year(convert_date(date))
@@ -0,0 +1,150 @@
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .dates import convert_date, is_modin
+from .location import Location
+from .table import CPITable, LOCATIONS, location_index
+
+
+def is_dask(obj) -> bool:
+    """
+    Returns whether or not an object is a dask collection.
+
+    This checks the module of the object's type so that dask does not need to be imported.
+    """
+    return type(obj).__module__.startswith("dask.")
+
+
+def is_distributed(obj) -> bool:
+    """Returns whether or not an object is a modin or dask Series (or DataFrame) which is partitioned across workers."""
+    return is_modin(obj) or is_dask(obj)
+
+
+def to_datetime(dates, format: Optional[str] = None):
+    """Converts a modin or dask Series to datetimes without collecting it on the driver."""
+    if np.issubdtype(dates.dtype, np.datetime64):
+        return dates
+    if np.issubdtype(dates.dtype, np.floating):
+        raise ValueError("Decimal years are not supported for modin or dask Series.")
+    if is_dask(dates):
+        import dask.dataframe as dd
+
+        return dd.to_datetime(dates, format=format)
+
+    import modin.pandas as mpd
+
+    return mpd.to_datetime(dates, format=format)
+
+
+def quarter_keys(year, month):
+    """
+    Returns the number of quarters since the year 0 for the quarter which contains each date.
+
+    The quarters begin on the 1st of March, June, September and December like the quarters in the CPI data.
+    This works for scalars and for modin and dask Series.
+    """
+    return (year * 12 + month - 3) // 3
+
+
+def table_quarter_keys(table: CPITable) -> np.ndarray:
+    """Returns the key of each quarter in a CPITable (see `quarter_keys`)."""
+    dates = pd.DatetimeIndex(table.dates)
+    return quarter_keys(dates.year.to_numpy(), dates.month.to_numpy())
+
+
+def cpi_lookup(table: CPITable) -> pd.Series:
+    """
+    Returns the CPI values of a table in a small pandas Series which is sent to every partition.
+
+    The index is the key of each quarter (see `quarter_keys`) multiplied by the number of locations
+    plus the index of the location.
+    """
+    index = table_quarter_keys(table)[:, None] * len(LOCATIONS) + np.arange(len(LOCATIONS))[None, :]
+    return pd.Series(table.values.ravel(), index=index.ravel().astype(float))
+
+
+def cpi_at(
+    table: CPITable,
+    date,
+    location: Union[Location, str, pd.Series] = Location.AUSTRALIA,
+    date_format: Optional[str] = None,
+):
+    """
+    Returns the CPI for dates and locations where at least one of them is a modin or dask Series.
+
+    The dates are reduced to quarter keys with arithmetic on each partition and these are mapped to the CPI values
+    with a small lookup Series so the result stays partitioned in the same way as the input.
+    Dates before the first quarter, missing dates and locations which are not recognized give NaN.
+
+    Args:
+        table (CPITable): The CPI values for each location.
+        date: The dates as a modin or dask Series, or a single date.
+        location: The locations as a modin or dask Series, or a single location.
+        date_format (str, optional): The strftime format of date strings. If not given, then the format is inferred.
+
+    Raises:
+        ValueError: If the dates are decimal years or if the other argument is an array which is not distributed.
+
+    Returns:
+        A modin or dask Series with the CPI values.
+    """
+    keys = table_quarter_keys(table)
+    if is_distributed(date):
+        dates = to_datetime(date, format=date_format)
+        # Dates after the last quarter are clipped to it and dates before the first quarter are not in the lookup
+        date_keys = quarter_keys(dates.dt.year, dates.dt.month).clip(upper=keys[-1])
+    else:
+        rows, missing = table.rows(convert_date(date, format=date_format))
+        if rows.size != 1:
+            raise ValueError("The dates must be a single date or a modin or dask Series.")
+        date_keys = np.nan if missing.item() else float(keys[rows.item()])
+
+    if is_distributed(location):
+        indices = {str(location): index for index, location in enumerate(LOCATIONS)}
+        names = location.astype(str).str.title()
+        columns = names.map(indices, meta=(names.name, "f8")) if is_dask(names) else names.map(indices)
+    elif isinstance(location, str):
+        columns = location_index(location)
+    else:
+        raise ValueError("The locations must be a single location or a modin or dask Series.")
+
+    lookup_keys = date_keys * len(LOCATIONS) + columns
+    if is_dask(lookup_keys):
+        return lookup_keys.map(cpi_lookup(table), meta=(lookup_keys.name, "f8"))
+    return lookup_keys.map(cpi_lookup(table))
+
+
+def calc_inflation(
+    table: CPITable,
+    value,
+    original_date,
+    evaluation_date,
+    location: Union[Location, str, pd.Series] = Location.AUSTRALIA,
+    date_format: Optional[str] = None,
+):
+    """
+    Adjusts values for inflation where the values, the dates or the locations are modin or dask Series.
+
+    The calculation runs on each partition and the result stays distributed
+    so that it can be larger than the memory of the driver.
+
+    Args:
+        table (CPITable): The CPI values for each location.
+        value: The values to adjust.
+        original_date: The dates that the values are in relation to.
+        evaluation_date: The dates to adjust the values to.
+        location: The location for calculating the CPI.
+        date_format (str, optional): The strftime format of date strings. If not given, then the format is inferred.
+
+    Returns:
+        A modin or dask Series with the adjusted values.
+    """
+
+    def cpis(date):
+        if is_distributed(date) or is_distributed(location):
+            return cpi_at(table, date, location, date_format=date_format)
+        return table.lookup(convert_date(date, format=date_format), table.columns(location)).item()
+
+    return value * cpis(evaluation_date) / cpis(original_date)
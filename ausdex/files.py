@@ -1,12 +1,29 @@
 import sys
+import json
+import time
+import shutil
+import email.utils
 from pathlib import Path
 from appdirs import user_cache_dir
-from typing import Union
+from typing import Union, Iterator, List, Tuple, Optional
+import urllib.error
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+from . import instrument
+from .lock import file_lock
+from .snapshot import atomic_write
+
 
 ACCEPTED_QUARTERS = ("mar", "jun", "sep", "dec")
+CPI_FILE_ID = "640101"
+ABS_CPI_URL = "https://www.abs.gov.au/statistics/economy/price-indexes-and-inflation/consumer-price-index-australia"
+PROBE_TIMEOUT = 10.0
+PROBE_QUARTERS = 4
+DOWNLOAD_TIMEOUT = 60.0
+RELEASE_LAG = timedelta(days=21)
+NEGATIVE_PROBE_TTL = timedelta(hours=6)
 
 
 class DownloadError(Exception):
@@ -24,32 +41,189 @@ def get_cached_path(filename: str) -> Path:
     return cache_dir / filename
 
 
-def cached_download(url: str, local_path: Union[str, Path], force: bool = False, verbose:bool = False) -> None:
+def cached_download(
+    url: str,
+    local_path: Union[str, Path],
+    force: bool = False,
+    verbose: bool = False,
+    max_age: Optional[float] = None,
+) -> None:
     """
     Downloads a file if a local file does not already exist.
 
+    The `ETag` and `Last-Modified` headers of the download are stored in a sidecar file next to the local file
+    (see `metadata_path`). If `max_age` is given and the local file was last checked longer ago than that,
+    then the file is revalidated with a conditional request so that it is only downloaded again if it has changed.
+
     Args:
         url (str): The url of the file to download.
         local_path (str, Path): The local path of where the file should be.
             If this file isn't there or the file size is zero then this function downloads it to this location.
         force (bool): Whether or not the file should be forced to download again even if present in the local path.
             Default False.
+        max_age (float, optional): The number of seconds that a local file is trusted before it is revalidated.
+            If None, then a local file is trusted forever. Default None.
 
     Raises:
         DownloadError: Raises an exception if it cannot download the file.
         IOError: Raises an exception if the file does not exist or is empty after downloading.
     """
     local_path = Path(local_path)
-    if (not local_path.exists() or local_path.stat().st_size == 0) or force:
+
+    def missing() -> bool:
+        return not local_path.exists() or local_path.stat().st_size == 0
+
+    if missing() or force:
+        instrument.count("download.cache_misses")
+        # Only one process downloads the file while the others wait for it
+        with file_lock(local_path):
+            if missing() or force:
+                download(url, local_path)
+    elif max_age is not None and not is_fresh(local_path, max_age):
+        instrument.count("download.revalidations")
         try:
-            urllib.request.urlretrieve(url, local_path)
-        except Exception:
-            raise DownloadError(f"Error downloading {url}")
+            with file_lock(local_path):
+                # Another process may have revalidated the file while this one waited for the lock
+                if not is_fresh(local_path, max_age):
+                    revalidate(url, local_path)
+        except (urllib.error.URLError, OSError) as error:
+            # The cached file is still usable if the server cannot be reached
+            print(f"WARNING: Cannot revalidate {local_path.name} ({error}). Using the cached file.", file=sys.stderr)
+    else:
+        instrument.count("download.cache_hits")
 
-    if not local_path.exists() or local_path.stat().st_size == 0:
+    if missing():
         raise IOError(f"Error reading {local_path}")
 
 
+@instrument.timed("download")
+def download(url: str, local_path: Path, timeout: float = DOWNLOAD_TIMEOUT) -> None:
+    """
+    Downloads a file to a temporary path and moves it into place so that other processes never read a partial file.
+
+    The download runs while other processes wait for the lock on the file,
+    so it gives up if the server does not respond for `DOWNLOAD_TIMEOUT` seconds.
+
+    Args:
+        url (str): The url of the file to download.
+        local_path (Path): The local path of where the file should be.
+        timeout (float): The number of seconds to wait for the server to respond.
+
+    Raises:
+        DownloadError: Raises an exception if it cannot download the file.
+    """
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            atomic_write(local_path, lambda f: shutil.copyfileobj(response, f))
+            headers = response.headers
+    except Exception:
+        raise DownloadError(f"Error downloading {url}")
+
+    if local_path.exists() and local_path.stat().st_size > 0:
+        write_metadata(local_path, url, headers)
+
+
+def metadata_path(local_path: Union[str, Path]) -> Path:
+    """
+    Returns the path of the sidecar file with the HTTP metadata of a downloaded file.
+
+    For example, '640101-jun-2021.xls' has the metadata file '640101-jun-2021.xls.meta.json'.
+    """
+    local_path = Path(local_path)
+    return local_path.with_name(f"{local_path.name}.meta.json")
+
+
+def read_metadata(local_path: Union[str, Path]) -> dict:
+    """
+    Reads the HTTP metadata of a downloaded file.
+
+    Args:
+        local_path (str, Path): The path to the downloaded file.
+
+    Returns:
+        dict: The metadata with the keys 'url', 'etag', 'last_modified' and 'checked'.
+            If the sidecar file is missing or corrupt, then it returns an empty dictionary.
+    """
+    try:
+        metadata = json.loads(metadata_path(local_path).read_text())
+    except (OSError, ValueError):
+        return {}
+    return metadata if isinstance(metadata, dict) else {}
+
+
+def write_metadata(local_path: Union[str, Path], url: str, headers) -> None:
+    """
+    Writes the HTTP metadata of a downloaded file to its sidecar file with the current time as the time it was checked.
+
+    Args:
+        local_path (str, Path): The path to the downloaded file.
+        url (str): The url that the file was downloaded from.
+        headers: The headers of the HTTP response.
+    """
+
+    def header(name: str) -> Optional[str]:
+        value = headers.get(name) if headers is not None else None
+        return value if isinstance(value, str) else None
+
+    metadata = dict(url=url, etag=header("ETag"), last_modified=header("Last-Modified"), checked=time.time())
+    try:
+        atomic_write(metadata_path(local_path), lambda f: f.write(json.dumps(metadata).encode()))
+    except OSError:
+        # The metadata only allows cheaper revalidation so a read-only cache should not stop the download
+        pass
+
+
+def is_fresh(local_path: Union[str, Path], max_age: float) -> bool:
+    """
+    Checks whether a downloaded file was checked against the server within the last `max_age` seconds.
+
+    If there is no metadata for the file, then the modification time of the file is used.
+    """
+    checked = read_metadata(local_path).get("checked")
+    if not isinstance(checked, (int, float)):
+        checked = Path(local_path).stat().st_mtime
+    return time.time() - checked <= max_age
+
+
+def revalidate(url: str, local_path: Union[str, Path], timeout: float = DOWNLOAD_TIMEOUT) -> bool:
+    """
+    Checks whether a downloaded file has changed on the server with a conditional request and downloads it if it has.
+
+    The request uses the `ETag` and `Last-Modified` values stored when the file was downloaded.
+    If the server responds with '304 Not Modified' then only the time that the file was checked is updated.
+
+    Args:
+        url (str): The url of the file.
+        local_path (str, Path): The path to the downloaded file.
+        timeout (float): The number of seconds to wait for the server to respond.
+
+    Raises:
+        urllib.error.URLError: If the server cannot be reached or it responds with an error.
+
+    Returns:
+        bool: True if the file changed and it was downloaded again.
+    """
+    local_path = Path(local_path)
+    metadata = read_metadata(local_path)
+    last_modified = metadata.get("last_modified") or email.utils.formatdate(local_path.stat().st_mtime, usegmt=True)
+    request = urllib.request.Request(url, headers={"If-Modified-Since": last_modified})
+    if metadata.get("etag"):
+        request.add_header("If-None-Match", metadata["etag"])
+
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            atomic_write(local_path, lambda f: shutil.copyfileobj(response, f))
+            headers = response.headers
+    except urllib.error.HTTPError as error:
+        if error.code != 304:
+            raise
+        write_metadata(local_path, url, {"ETag": metadata.get("etag"), "Last-Modified": last_modified})
+        return False
+
+    write_metadata(local_path, url, headers)
+    return True
+
+
 def cached_download_abs(
     id: str,
     quarter: str,
@@ -57,6 +231,7 @@ def cached_download_abs(
     extension: str,
     local_path: Union[Path, str, None] = None,
     force: bool = False,
+    max_age: Optional[float] = None,
 ) -> Path:
     """
     Downloads a file from the ABS if a local file does not already exist.
@@ -72,6 +247,8 @@ def cached_download_abs(
         local_path (str, Path): The local path of where the file should be.
             If this file isn't there or the file size is zero then this function downloads it to this location.
         force (bool): Whether or not the file should be forced to download again even if present in the local path.
+        max_age (float, optional): The number of seconds that a local file is trusted before it is revalidated.
+            If None, then a local file is trusted forever. Default None.
 
     Raises:
         ValueError: If the value for `quarter` cannot be understood.
@@ -81,9 +258,35 @@ def cached_download_abs(
     Returns:
         Path: The path to the downloaded ABS datafile.
     """
+    url, local_path = abs_url_and_path(id, quarter, year, local_path)
+    cached_download(url, local_path, force=force, max_age=max_age)
+
+    return local_path
+
+
+def abs_url_and_path(
+    id: str, quarter: str, year: Union[int, str], local_path: Union[Path, str, None] = None
+) -> Tuple[str, Path]:
+    """
+    Returns the URL of a file from the ABS and the local path where it is cached.
+
+    Args:
+        id (str): The ABS id for the datafile. For Australian Consumer Price Index the ID is 640101.
+        quarter (str): The quarter of the file in question. One of "mar", "jun", "sep", or "dec".
+        year (str, int): The year for the file in question.
+        local_path (Path, str, optional): The path to where the file should be downloaded.
+            If None, then it is in the user's cache directory.
+
+    Raises:
+        ValueError: If the value for `quarter` cannot be understood.
+
+    Returns:
+        Tuple[str, Path]: The URL and the local path for the ABS datafile.
+    """
     quarter = quarter.lower()[:3]
     if quarter not in ACCEPTED_QUARTERS:
         raise ValueError(f"Cannot understand quarter {quarter}.")
+    year = int(year)
 
     if (year == 2021 and quarter == 'dec') or year > 2021:
         extension = "xlsx"
@@ -94,19 +297,83 @@ def cached_download_abs(
         online_dir = f"{quarter}-quarter-{year}"
     else:
         online_dir = f"{quarter}-{year}"
-    
 
-    local_path = local_path or get_cached_path(f"{id}-{quarter}-{year}.{extension}")
-    local_path = Path(local_path)
-    
-    url = f"https://www.abs.gov.au/statistics/economy/price-indexes-and-inflation/consumer-price-index-australia/{online_dir}/{id}.{extension}"
-    cached_download(url, local_path, force=force)
+    local_path = Path(local_path or get_cached_path(f"{id}-{quarter}-{year}.{extension}"))
+    url = f"{ABS_CPI_URL}/{online_dir}/{id}.{extension}"
+    return url, local_path
 
-    return local_path
+
+def probe_url(url: str, timeout: float = PROBE_TIMEOUT) -> Optional[bool]:
+    """
+    Checks whether a file is available at a URL with a HEAD request so that the file itself is not downloaded.
+
+    Args:
+        url (str): The url of the file to check.
+        timeout (float): The number of seconds to wait for the server to respond.
+
+    Returns:
+        bool, optional: True if the server reports that the file exists, False if the server reports that it does not
+            (404 or 410) and None if it cannot be known
+            (e.g. the connection failed or timed out, or the server had an error).
+    """
+    request = urllib.request.Request(url, method="HEAD")
+    try:
+        with urllib.request.urlopen(request, timeout=timeout):
+            return True
+    except urllib.error.HTTPError as error:
+        if error.code in (404, 410):
+            return False
+        # Some servers do not allow HEAD requests so the file may still be available
+        return True if error.code == 405 else None
+    except (urllib.error.URLError, OSError, ValueError):
+        return None
+
+
+def url_exists(url: str, timeout: float = PROBE_TIMEOUT) -> bool:
+    """
+    Checks whether a file is available at a URL (see `probe_url`).
+
+    Args:
+        url (str): The url of the file to check.
+        timeout (float): The number of seconds to wait for the server to respond.
+
+    Returns:
+        bool: True if the server reports that the file exists.
+    """
+    return probe_url(url, timeout=timeout) is True
+
+
+def previous_quarters(date: datetime) -> Iterator[Tuple[str, int]]:
+    """
+    Yields the quarters of ABS releases before a date, starting with the most recent and going back to 1948.
+
+    Args:
+        date (datetime): The date before which the quarters should be.
+
+    Yields:
+        Tuple[str, int]: The quarter (one of "mar", "jun", "sep", or "dec") and the year.
+    """
+    year = date.year
+    quarter_index = (date.month - 3) // 3
+    if quarter_index == -1:
+        quarter_index = 3
+        year -= 1
+
+    while year >= 1948:
+        yield ACCEPTED_QUARTERS[quarter_index], year
+        quarter_index -= 1
+        if quarter_index == -1:
+            quarter_index = 3
+            year -= 1
 
 
 def cached_download_abs_excel(
-    id: str, quarter: str, year: Union[str, int], local_path: Union[Path, str, None] = None, force: bool = False
+    id: str,
+    quarter: str,
+    year: Union[str, int],
+    local_path: Union[Path, str, None] = None,
+    force: bool = False,
+    max_age: Optional[float] = None,
 ) -> Path:
     """
     Gets am Excel file from the Australian Burau of Statistics.
@@ -121,6 +388,8 @@ def cached_download_abs_excel(
             If None, then it is downloaded in the user's cache directory.
         force (bool): Whether or not the file should be forced to download again even if present in the local path.
             Default False.
+        max_age (float, optional): The number of seconds that a local file is trusted before it is revalidated.
+            If None, then a local file is trusted forever. Default None.
 
     Raises:
         ValueError: Raises this error if the quarter cannot be understood.
@@ -129,18 +398,158 @@ def cached_download_abs_excel(
         Path: The path to the cached ABS datafile
     """
     local_path = cached_download_abs(
-        quarter=quarter, year=year, id=id, extension="xlsx", local_path=local_path, force=force
+        quarter=quarter, year=year, id=id, extension="xlsx", local_path=local_path, force=force, max_age=max_age
     )
 
     return local_path
 
 
+def workbook_quarter(path: Union[str, Path]) -> Optional[datetime]:
+    """
+    Returns the date of the last quarter in a cached ABS datafile from its filename.
+
+    For example, '640101-jun-2021.xls' gives 1 June 2021 which is the date of the June 2021 quarter in the CPI data.
+
+    Args:
+        path (str, Path): The path to the cached datafile.
+
+    Returns:
+        datetime, optional: The date of the quarter or None if the filename does not have a quarter and a year.
+    """
+    parts = Path(path).stem.split("-")
+    if len(parts) < 3 or parts[-2] not in ACCEPTED_QUARTERS or not parts[-1].isdigit():
+        return None
+    return datetime(int(parts[-1]), (ACCEPTED_QUARTERS.index(parts[-2]) + 1) * 3, 1)
+
+
+def latest_cached_workbook(id: str = CPI_FILE_ID) -> Optional[Path]:
+    """
+    Finds the most recent ABS datafile in the user's cache directory without any network requests.
+
+    Args:
+        id (str): The ABS id for the datafile. Default is the id for the Australian Consumer Price Index, 640101.
+
+    Returns:
+        Path, optional: The path to the cached datafile for the most recent quarter or None if there are none.
+    """
+    cache_dir = get_cached_path("")
+    workbooks = [
+        path
+        for path in cache_dir.glob(f"{id}-*.xls*")
+        if path.suffix in (".xls", ".xlsx") and workbook_quarter(path) and path.stat().st_size > 0
+    ]
+    return max(workbooks, key=workbook_quarter, default=None)
+
+
+def newest_cached_quarter(
+    id: str, quarters: List[Tuple[str, int]], local_path: Union[Path, str, None] = None
+) -> Optional[Path]:
+    """
+    Finds the cached datafile for the most recent of some quarters without any network requests.
+
+    Args:
+        id (str): The ABS id for the datafile.
+        quarters (List[Tuple[str, int]]): The quarters and years in order from the most recent
+            (see `previous_quarters`).
+        local_path (Path, str, optional): The path to where the file would have been downloaded.
+            If None, then the user's cache directory is used.
+
+    Returns:
+        Path, optional: The path to the cached datafile or None if none of the quarters are cached.
+    """
+    for quarter, year in quarters:
+        _, path = abs_url_and_path(id, quarter, year, local_path)
+        if path.exists() and path.stat().st_size > 0:
+            return path
+    return None
+
+
+def release_due(quarter: str, year: Union[int, str]) -> datetime:
+    """
+    Returns the earliest date that the ABS is expected to publish the data for a quarter.
+
+    The ABS publishes the CPI about four weeks after the end of each quarter
+    so this is the end of the quarter plus `RELEASE_LAG`.
+
+    Args:
+        quarter (str): The quarter in question. One of "mar", "jun", "sep", or "dec".
+        year (str, int): The year in question.
+
+    Returns:
+        datetime: The date from which the data for the quarter might be available.
+    """
+    month = (ACCEPTED_QUARTERS.index(quarter) + 1) * 3
+    end_of_quarter = datetime(int(year) + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return end_of_quarter + RELEASE_LAG
+
+
+def failed_probes_path() -> Path:
+    """Returns the path of the file in the user's cache which records the URLs which were recently unavailable."""
+    return get_cached_path("failed-probes.json")
+
+
+def read_failed_probes() -> dict:
+    """
+    Reads the URLs which were recently unavailable.
+
+    Returns:
+        dict: The time (seconds since the epoch) until which each URL should not be tried again.
+            Entries which have expired are left out.
+            If the file is missing or corrupt, then it returns an empty dictionary.
+    """
+    try:
+        failed = json.loads(failed_probes_path().read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(failed, dict):
+        return {}
+
+    now = time.time()
+    return {url: expiry for url, expiry in failed.items() if isinstance(expiry, (int, float)) and expiry > now}
+
+
+def record_failed_probes(urls) -> None:
+    """
+    Records that URLs were unavailable so that they are not tried again until `NEGATIVE_PROBE_TTL` has passed.
+
+    Only URLs which the server reported as missing (404 or 410) should be recorded (see `probe_url`).
+
+    Args:
+        urls (Iterable[str]): The URLs which were unavailable.
+    """
+    expiry = time.time() + NEGATIVE_PROBE_TTL.total_seconds()
+    try:
+        with file_lock(failed_probes_path(), timeout=5.0):
+            failed = read_failed_probes()
+            failed.update({url: expiry for url in urls})
+            atomic_write(failed_probes_path(), lambda f: f.write(json.dumps(failed, indent=1).encode()))
+    except OSError:
+        # Recording failures only avoids network requests so a read-only cache should not stop the download
+        pass
+
+
+@instrument.timed("find_workbook")
 def cached_download_abs_excel_by_date(
-    id: str, date: Union[datetime, None] = None, local_path: Union[Path, str, None] = None, force: bool = False
+    id: str,
+    date: Union[datetime, None] = None,
+    local_path: Union[Path, str, None] = None,
+    force: bool = False,
+    max_age: Optional[float] = None,
 ) -> Path:
     """
     Gets a datafile from the Australian Burau of Statistics before a specific date.
 
+    The quarters which are not cached already are probed concurrently with HEAD requests in groups of `PROBE_QUARTERS`
+    and the most recent quarter which is available is downloaded.
+
+    Quarters are not probed if the ABS is not expected to have released them yet (see `release_due`)
+    or if the ABS reported that they did not exist within the last `NEGATIVE_PROBE_TTL` (see `read_failed_probes`).
+    This means that the newest cached file is used without any network requests or warnings
+    until a new release is due.
+    If a probe fails without an answer from the ABS (e.g. the network is down), then older quarters are not probed
+    and nothing is recorded, because a quarter which could not be checked may still be available.
+    The newest of the older quarters which is cached already is used instead (see `newest_cached_quarter`).
+
     Args:
         id (str): The ABS id for the datafile. For Australian Consumer Price Index (CPI) the ID is 640101.
         date (datetime, optional): The date before which the CPI data should be valid.
@@ -149,33 +558,100 @@ def cached_download_abs_excel_by_date(
             If None, then it is downloaded in the user's cache directory.
         force (bool): Whether or not the file should be forced to download again even if present in the local path.
             Default False.
+        max_age (float, optional): The number of seconds that a local file is trusted before it is revalidated.
+            If None, then a local file is trusted forever. Default None.
+
+    Only one process (or thread) at a time looks for the datafile. The others wait for the lock and then find
+    the file which it downloaded (or the quarters which it recorded as missing) without probing the ABS again.
 
     Returns:
         Path: The path to the cached ABS datafile.
     """
-    date = date or datetime.now()
-    file = None
-    while file is None and date > datetime(1948, 1, 1):
-        year = date.year
-        quarter_index = (date.month - 3) // 3
-        if quarter_index == -1:
-            quarter_index = 3
-            year -= 1
-        quarter = ACCEPTED_QUARTERS[quarter_index]
+    with file_lock(get_cached_path(f"{id}.resolve")):
+        # The cache and the failed probes are read once the lock is held so that they include the other processes' work
+        return find_abs_excel_by_date(id, date=date, local_path=local_path, force=force, max_age=max_age)
 
-        try:
-            file = cached_download_abs_excel(id, quarter, year, local_path=local_path, force=force)
-            break
-        except (DownloadError, IOError):
-            print(f"WARNING: CPI data for Quarter {quarter.title()} {year} not yet available.", file=sys.stderr)
 
-        date -= timedelta(days=89)  # go back approximately a quarter
+def find_abs_excel_by_date(
+    id: str,
+    date: Union[datetime, None] = None,
+    local_path: Union[Path, str, None] = None,
+    force: bool = False,
+    max_age: Optional[float] = None,
+) -> Path:
+    """
+    Probes the ABS for the most recent datafile before a specific date and downloads it.
 
-    return file
+    This should only be called while holding the lock in `cached_download_abs_excel_by_date`.
+    The arguments are the same as for `cached_download_abs_excel_by_date`.
+
+    Returns:
+        Path: The path to the cached ABS datafile.
+    """
+    quarters = list(previous_quarters(date or datetime.now()))
+    now = datetime.now()
+    failed = {} if force else read_failed_probes()
+    unavailable = []
+    # The executor does not wait for the probes of older quarters once a more recent quarter is found
+    executor = ThreadPoolExecutor(max_workers=PROBE_QUARTERS)
+    try:
+        for start in range(0, len(quarters), PROBE_QUARTERS):
+            candidates = quarters[start : start + PROBE_QUARTERS]
+            urls, probes = [], []
+            for quarter, year in candidates:
+                url, path = abs_url_and_path(id, quarter, year, local_path)
+                urls.append(url)
+                if not force and path.exists() and path.stat().st_size > 0:
+                    # Older quarters do not need to be probed if this quarter is cached already
+                    probes.append(None)
+                    break
+                elif not force and (release_due(quarter, year) > now or url in failed):
+                    instrument.count("probe.skipped")
+                    probes.append(False)
+                else:
+                    instrument.count("probe.requests")
+                    probes.append(executor.submit(probe_url, url))
+
+            # The candidates are in order from the most recent so the first one which is available wins
+            for index, ((quarter, year), url, probe) in enumerate(zip(candidates, urls, probes)):
+                available = probe is None
+                if probe is not None and probe is not False:
+                    with instrument.timer("probe.wait"):
+                        available = probe.result()
+                    if available is None:
+                        instrument.count("probe.errors")
+                        message = f"Cannot check whether CPI data for Quarter {quarter.title()} {year} is available."
+                        print(f"WARNING: {message}", file=sys.stderr)
+                        # Older quarters are not probed but one which is cached already can still be used
+                        return newest_cached_quarter(id, quarters[start + index :], local_path)
+                    if available is False:
+                        # Only a definitive answer from the ABS is remembered
+                        unavailable.append(url)
+                if available:
+                    try:
+                        return cached_download_abs_excel(
+                            id, quarter, year, local_path=local_path, force=force, max_age=max_age
+                        )
+                    except (DownloadError, IOError):
+                        pass
+                elif probe is False:
+                    # Quarters which are not due yet or which were missing recently are skipped without a warning
+                    continue
+                print(f"WARNING: CPI data for Quarter {quarter.title()} {year} not yet available.", file=sys.stderr)
+    finally:
+        executor.shutdown(wait=False)
+        if unavailable:
+            record_failed_probes(unavailable)
+
+    return None
 
 
 def cached_download_cpi(
-    *, date: Union[datetime, None] = None, local_path: Union[Path, str, None] = None, force: bool = False
+    *,
+    date: Union[datetime, None] = None,
+    local_path: Union[Path, str, None] = None,
+    force: bool = False,
+    max_age: Optional[float] = None,
 ) -> Path:
     """
     Returns the path to the latest cached file with the Australian Consumer Price Index (CPI) data.
@@ -189,9 +665,12 @@ def cached_download_cpi(
             If None, then it is downloaded in the user's cache directory.
         force (bool): Whether or not the file should be forced to download again even if present in the local path.
             Default False.
+        max_age (float, optional): The number of seconds that a local file is trusted before it is revalidated.
+            If None, then a local file is trusted forever. Default None.
 
     Returns:
         Path: The path to the cached datafile.
     """
-    CPI_FILE_ID = "640101"
-    return cached_download_abs_excel_by_date(id=CPI_FILE_ID, date=date, local_path=local_path, force=force)
+    return cached_download_abs_excel_by_date(
+        id=CPI_FILE_ID, date=date, local_path=local_path, force=force, max_age=max_age
+    )
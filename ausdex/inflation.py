@@ -1,39 +1,257 @@
+import sys
+import threading
 from datetime import datetime
-from typing import Union
+from pathlib import Path
+from typing import Callable, Union, Optional
 import pandas as pd
-import modin.pandas as mpd
 import numpy as np
 import numbers
 
-from cached_property import cached_property
+from cached_property import threaded_cached_property
 
+from . import accessor  # Registers the `ausdex` accessors for pandas objects
 from .location import Location
-from .files import cached_download_cpi
+from .files import cached_download_cpi, latest_cached_workbook, workbook_quarter, DownloadError
 from .dates import convert_date
+from . import arrow, blocks, distributed, instrument, parallel
+from .lock import optional_file_lock
+from .snapshot import read_snapshot, write_snapshot, snapshot_path
+from .snapshot import read_bundled_snapshot, bundled_snapshot_date, BUNDLED_SNAPSHOT
+from .table import CPITable, table_paths
+
+
+def read_cpi_workbook(path: Union[str, Path]) -> pd.DataFrame:
+    """
+    Parses the Australian Consumer Price Index (CPI) data from the ABS Excel workbook (file id '640101').
+
+    Args:
+        path (str, Path): The path to the workbook.
+
+    Returns:
+        pd.DataFrame: The CPI data with a float64 column for each series and a 'Date' column of datetime64 values.
+            The index of the DataFrame is the relevant date for each row.
+    """
+    excel_file = pd.ExcelFile(path)
+    df = excel_file.parse("Data1")
+
+    # Get rid of extra headers
+    df = df.iloc[9:]
+
+    df = df.rename(columns={"Unnamed: 0": "Date"})
+    # The header rows leave every column with the object dtype so the columns are typed once here
+    df = df.astype({column: float for column in df.columns if column != "Date"})
+    df["Date"] = pd.to_datetime(df["Date"])
+    df.index = pd.DatetimeIndex(df["Date"])
+
+    return df
 
 
 class CPI:
-    """A class to manage the Australian Consumer Index (CPI) data."""
+    """
+    A class to manage the Australian Consumer Index (CPI) data.
+
+    Args:
+        memory_map (bool): Whether or not to memory-map the CPI table from files in the cache directory.
+            The files are built once from the workbook and the pages are shared between all the processes which use them.
+            Default False.
+        factor_matrix_budget (int): The maximum number of bytes to use for caching matrices of inflation factors
+            (see `inflation_factors`). If a matrix for the location fits in this budget then `calc_inflation` adjusts values
+            by multiplying them by a single factor gathered from this matrix. Default 0 which does not cache any matrices.
+        max_age (float, optional): The number of seconds that the cached workbook is trusted before it is revalidated
+            with the ABS (see `refresh`). If None, then the cached workbook is trusted forever. Default None.
+        prefer_bundled (bool): Whether or not to use the CPI data bundled with the package without any network requests.
+            A workbook in the cache directory is still used if it is more recent than the bundled data.
+            If False, then the bundled data is only used if the CPI data cannot be downloaded. Default False.
+    """
+
+    def __init__(
+        self,
+        memory_map: bool = False,
+        factor_matrix_budget: int = 0,
+        max_age: Optional[float] = None,
+        prefer_bundled: bool = False,
+    ):
+        self.memory_map = memory_map
+        self.factor_matrix_budget = factor_matrix_budget
+        self.max_age = max_age
+        self.prefer_bundled = prefer_bundled
+        self.factor_matrices = {}
+        self.source = None
+        self.lock = threading.RLock()
+
+    def find_source(self) -> Path:
+        """
+        Finds the most recent CPI data which is available.
+
+        This is either a workbook from the ABS in the cache directory or the snapshot bundled with the package.
+        The bundled snapshot is used if `prefer_bundled` is set or if the workbook cannot be downloaded,
+        unless there is a cached workbook which is more recent.
+
+        Raises:
+            DownloadError: If the CPI data cannot be downloaded and there is no bundled data.
+
+        Returns:
+            Path: The path to the workbook or to the bundled snapshot.
+        """
+        if self.prefer_bundled:
+            local_path = latest_cached_workbook()
+        else:
+            try:
+                local_path = cached_download_cpi(max_age=self.max_age)
+            except (DownloadError, OSError):
+                local_path = None
+
+        bundled_date = bundled_snapshot_date()
+        if bundled_date and (local_path is None or (workbook_quarter(local_path) or datetime.min) < bundled_date):
+            if local_path is None and not self.prefer_bundled:
+                print(
+                    f"WARNING: Cannot download the CPI data. Using the data bundled up to {bundled_date:%b %Y}.",
+                    file=sys.stderr,
+                )
+            return BUNDLED_SNAPSHOT
+
+        if local_path is None:
+            raise DownloadError("Cannot download the CPI data and there is no bundled CPI data.")
+        return Path(local_path)
+
+    def workbook_path(self) -> Path:
+        """Returns the path to the CPI data in use (see `find_source`) and remembers which version of the data it is."""
+        local_path = self.find_source()
+        if self.source is None:
+            self.source = (local_path, local_path.stat().st_mtime_ns)
+        return local_path
+
+    def refresh(self) -> bool:
+        """
+        Checks whether there is new or revised CPI data and clears the data in memory if there is.
+
+        The cached workbook is revalidated with the ABS if it is older than `max_age`,
+        so calling this regularly in a long-running process is cheap when nothing has changed.
 
-    @cached_property
+        Returns:
+            bool: True if the CPI data changed and it will be loaded again when it is next needed.
+        """
+        with self.lock:
+            local_path = self.find_source()
+            source = (local_path, local_path.stat().st_mtime_ns)
+            if self.source is None or source == self.source:
+                return False
+
+            for name in ["latest_cpi_df", "table"]:
+                self.__dict__.pop(name, None)
+            self.factor_matrices = {}
+            self.source = None
+            return True
+
+    @threaded_cached_property
     def latest_cpi_df(self) -> pd.DataFrame:
         """
         Returns a Pandas DataFrame with the latest Australian Consumer Price Index (CPI) data.
 
+        The parsed workbook is stored as a binary snapshot next to the downloaded file so that later processes
+        can skip parsing the Excel file. The snapshot is rebuilt if it is stale or corrupt.
+        If the data bundled with the package is used, then no workbook is parsed at all.
+        The data is loaded only once even if many threads read this property at the same time.
+
         Returns:
             pd.DataFrame: The latest Australian Consumer Price Index (CPI) data. The index of the series is the relevant date for each row.
         """
-        local_path = cached_download_cpi()
-        excel_file = pd.ExcelFile(local_path)
-        df = excel_file.parse("Data1")
+        local_path = self.workbook_path()
+        if local_path == BUNDLED_SNAPSHOT:
+            instrument.count("snapshot.bundled")
+            with instrument.timer("load.snapshot"):
+                return read_bundled_snapshot()
+
+        with instrument.timer("load.snapshot"):
+            df = read_snapshot(local_path)
+        if df is None:
+            instrument.count("snapshot.misses")
+            # Only one process parses the workbook while the others wait for its snapshot
+            with optional_file_lock(snapshot_path(local_path)):
+                df = read_snapshot(local_path)
+                if df is None:
+                    with instrument.timer("parse.workbook"):
+                        df = read_cpi_workbook(local_path)
+                    try:
+                        write_snapshot(df, local_path)
+                    except OSError:
+                        # The snapshot is only an optimization so a read-only cache should not stop the loading
+                        pass
+        else:
+            instrument.count("snapshot.hits")
+
+        return df
 
-        # Get rid of extra headers
-        df = df.iloc[9:]
+    @threaded_cached_property
+    def table(self) -> CPITable:
+        """
+        Returns the CPI for each location per quarter as typed NumPy arrays.
 
-        df = df.rename(columns={"Unnamed: 0": "Date"})
-        df.index = df["Date"]
+        If `memory_map` is set, then the arrays are memory-mapped from files next to the cached workbook.
+        These files are built if they are missing or stale.
+        Like `latest_cpi_df`, the table is built only once even if many threads read it at the same time.
 
-        return df
+        Returns:
+            CPITable: The CPI values for each location.
+        """
+        if self.memory_map:
+            local_path = self.workbook_path()
+            # The package directory may be read-only so the bundled data is not memory-mapped
+            if local_path != BUNDLED_SNAPSHOT:
+                table = CPITable.load(local_path)
+                if table is None:
+                    with optional_file_lock(table_paths(local_path)["metadata"]):
+                        table = CPITable.load(local_path)
+                        if table is None:
+                            self.build_table().save(local_path)
+                            table = CPITable.load(local_path)
+                return table
+
+        return self.build_table()
+
+    def build_table(self) -> CPITable:
+        """Builds the CPI table in memory from the latest CPI data."""
+        return CPITable.from_dataframe(
+            self.latest_cpi_df, columns=[self.column_name(location) for location in Location]
+        )
+
+    def inflation_factors(self, location: Union[Location, str] = Location.AUSTRALIA) -> np.ndarray:
+        """
+        Returns a matrix of the inflation factors between every pair of quarters for a location.
+
+        The entry at [i, j] is the CPI of quarter i divided by the CPI of quarter j,
+        where the quarters are in the order of `table.dates`.
+        The matrix is built when it is first needed and it is cached if it fits within `factor_matrix_budget`.
+
+        Args:
+            location (Union[Location, str], optional): The location for calculating the CPI. Default is 'Australia'.
+
+        Returns:
+            np.ndarray: A read-only square float64 matrix of inflation factors.
+        """
+        column = self.table.columns(location)
+        matrix = self._cached_factor_matrix(column)
+        if matrix is None:
+            matrix = self.table.factor_matrix(column)
+            matrix.flags.writeable = False
+        return matrix
+
+    def _cached_factor_matrix(self, column: int) -> Optional[np.ndarray]:
+        matrix = self.factor_matrices.get(column)
+        if matrix is not None:
+            return matrix
+
+        with self.lock:
+            if column not in self.factor_matrices:
+                used = sum(matrix.nbytes for matrix in self.factor_matrices.values())
+                if used + len(self.table.dates) ** 2 * np.dtype(float).itemsize > self.factor_matrix_budget:
+                    return None
+
+                matrix = self.table.factor_matrix(column)
+                matrix.flags.writeable = False
+                self.factor_matrices[column] = matrix
+
+            return self.factor_matrices[column]
 
     def column_name(self, location: Union[Location, str] = Location.AUSTRALIA):
         return f"Index Numbers ;  All groups CPI ;  {str(location).title()} ;"
@@ -51,14 +269,20 @@ class CPI:
                 Default is 'Australia'.
 
         Returns:
-            pd.Series: The CPIs per quarter.
+            pd.Series: The CPIs per quarter as float64 values with a DatetimeIndex.
         """
-        df = self.latest_cpi_df
-
-        return df[self.column_name(location)]
+        return pd.Series(
+            self.table.column(location),
+            index=pd.DatetimeIndex(self.table.dates, name="Date"),
+            name=self.column_name(location),
+            copy=True,
+        )
 
     def cpi_at(
-        self, date: Union[datetime, str, pd.Series, np.ndarray], location: Union[Location, str] = Location.AUSTRALIA
+        self,
+        date: Union[datetime, str, pd.Series, np.ndarray],
+        location: Union[Location, str, pd.Series, np.ndarray, list] = Location.AUSTRALIA,
+        date_format: Optional[str] = None,
     ) -> Union[float, np.ndarray]:
         """
         Returns the CPI (Consumer Price Index) for a date (or a number of dates).
@@ -69,23 +293,34 @@ class CPI:
 
         Args:
             date (Union[datetime, str, pd.Series, np.ndarray]): The date(s) to get the CPI(s) for.
-            location (Union[Location, str], optional): The location for calculating the CPI.
+            location (Union[Location, str, pd.Series, np.ndarray, list], optional): The location for calculating the CPI.
                 Options are 'Australia', 'Sydney', 'Melbourne', 'Brisbane', 'Adelaide', 'Perth', 'Hobart', 'Darwin', and 'Canberra'.
+                This can also be an array (or categorical Series) with a location for each date.
                 Default is 'Australia'.
+            date_format (str, optional): The strftime format of date strings. If not given, then the format is inferred.
 
         Returns:
             Union[float, np.ndarray]: The CPI value(s).
+                If `date` or `location` is a modin or dask Series then the result is a Series with the same partitions.
+                If `date` or `location` is an Arrow array or a Polars Series then the result is an Arrow array
+                (or a Polars Series).
         """
-        date = convert_date(date)
+        if isinstance(location, str):
+            cpi = self.table.scalar(date, location, date_format=date_format)
+            if cpi is not None:
+                return cpi
 
-        cpi_series = self.cpi_series(location=location)
+        if arrow.is_arrow(date) or arrow.is_arrow(location):
+            return arrow.cpi_at(self, date, location, date_format=date_format)
+        if distributed.is_distributed(date) or distributed.is_distributed(location):
+            return distributed.cpi_at(self.table, date, location, date_format=date_format)
 
-        min_date = cpi_series.index.min()
-        cpis = np.array(
-            cpi_series[np.searchsorted(cpi_series.index, date, side="right") - 1],
-            dtype=float,
-        )
-        cpis[date < min_date] = np.nan
+        return self._cpi_at(date, self.table.columns(location), date_format=date_format)
+
+    def _cpi_at(
+        self, date, columns: Union[int, np.ndarray], date_format: Optional[str] = None
+    ) -> Union[float, np.ndarray]:
+        cpis = self.table.lookup(convert_date(date, format=date_format), columns)
 
         # TODO check if the date difference is greater than 3 months
 
@@ -99,7 +334,9 @@ class CPI:
         value: Union[numbers.Number, np.ndarray, pd.Series],
         original_date: Union[datetime, str],
         evaluation_date: Union[datetime, str, None] = None,
-        location: Union[Location, str] = Location.AUSTRALIA,
+        location: Union[Location, str, pd.Series, np.ndarray, list] = Location.AUSTRALIA,
+        date_format: Optional[str] = None,
+        n_jobs: Optional[int] = None,
     ):
         """
         Adjusts a value (or list of values) for inflation.
@@ -108,20 +345,113 @@ class CPI:
             value (Union[numbers.Number, np.ndarray, pd.Series]): The value to be converted.
             original_date (Union[datetime, str]): The date that the value is in relation to.
             evaluation_date (Union[datetime, str], optional): The date to adjust the value to. Defaults to the current date.
-            location (Union[Location, str], optional): The location for calculating the CPI.
+            location (Union[Location, str, pd.Series, np.ndarray, list], optional): The location for calculating the CPI.
                 Options are 'Australia', 'Sydney', 'Melbourne', 'Brisbane', 'Adelaide', 'Perth', 'Hobart', 'Darwin', and 'Canberra'.
+                This can also be an array (or categorical Series) with a location for each value.
                 Default is 'Australia'.
+            date_format (str, optional): The strftime format of date strings. If not given, then the format is inferred.
+            n_jobs (int, optional): The number of processes to split large arrays across. -1 uses all the CPUs.
+                Arrays with fewer than a million values are adjusted in this process. Default None (a single process).
 
         Returns:
             Union[float, np.ndarray]: The adjusted value.
+                If any of the arguments is a modin or dask Series then the calculation runs on each partition
+                and the result stays distributed.
+                If any of the arguments is an Arrow array or a Polars Series then the result is an Arrow array
+                (or a Polars Series) with nulls where the CPI is not available.
         """
         if evaluation_date is None:
             evaluation_date = datetime.now()
 
-        original_cpi = self.cpi_at(original_date, location=location)
-        evaluation_cpi = self.cpi_at(evaluation_date, location=location)
+        # Single values (e.g. from web handlers) skip the array machinery and use the table's cache of CPIs
+        if n_jobs is None and isinstance(value, (int, float, np.number)) and isinstance(location, str):
+            original_cpi = self.table.scalar(original_date, location, date_format=date_format)
+            evaluation_cpi = self.table.scalar(evaluation_date, location, date_format=date_format)
+            if original_cpi is not None and evaluation_cpi is not None:
+                return value * evaluation_cpi / original_cpi
+
+        if any(arrow.is_arrow(arg) for arg in (value, original_date, evaluation_date, location)):
+            return arrow.calc_inflation(
+                self, value, original_date, evaluation_date, location, date_format=date_format, n_jobs=n_jobs
+            )
+        if any(distributed.is_distributed(arg) for arg in (value, original_date, evaluation_date, location)):
+            return distributed.calc_inflation(
+                self.table, value, original_date, evaluation_date, location=location, date_format=date_format
+            )
+
+        columns = self.table.columns(location)
+        if n_jobs is not None:
+            result = parallel.calc_inflation(
+                self.table, value, original_date, evaluation_date, columns, date_format=date_format, n_jobs=n_jobs
+            )
+            if result is not None:
+                return result
+
+        factors = None if isinstance(columns, np.ndarray) else self._cached_factor_matrix(columns)
+        if factors is not None:
+            original_rows, original_missing = self.table.rows(convert_date(original_date, format=date_format))
+            evaluation_rows, evaluation_missing = self.table.rows(convert_date(evaluation_date, format=date_format))
+            # A single gather from the flattened matrix is faster than indexing it with two arrays
+            factor = np.asarray(factors.ravel().take(evaluation_rows * factors.shape[1] + original_rows))
+            factor[np.broadcast_to(original_missing | evaluation_missing, factor.shape)] = np.nan
+            if factor.size == 1:
+                factor = factor.item()
+            return value * factor
+
+        original_cpi = self._cpi_at(original_date, columns, date_format=date_format)
+        evaluation_cpi = self._cpi_at(evaluation_date, columns, date_format=date_format)
         return value * evaluation_cpi / original_cpi
 
+    def calc_inflation_blocks(
+        self,
+        value: np.ndarray,
+        original_date: Union[datetime, str, np.ndarray],
+        evaluation_date: Union[datetime, str, np.ndarray, None] = None,
+        location: Union[Location, str, np.ndarray] = Location.AUSTRALIA,
+        out: Union[np.ndarray, str, Path, None] = None,
+        block_size: int = blocks.BLOCK_SIZE,
+        date_format: Optional[str] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> np.ndarray:
+        """
+        Adjusts arrays which are larger than memory for inflation one block of rows at a time.
+
+        The inputs can be `np.memmap` arrays (or .npy files loaded with `np.load(path, mmap_mode='r')`).
+        Only one block of each input is read at a time and the results are written to `out`,
+        so the memory used depends on the block size rather than the number of values.
+
+        Args:
+            value (np.ndarray): The values to be converted.
+            original_date (Union[datetime, str, np.ndarray]): The dates that the values are in relation to.
+            evaluation_date (Union[datetime, str, np.ndarray], optional): The dates to adjust the values to.
+                Defaults to the current date.
+            location (Union[Location, str, np.ndarray], optional): The location for each value or a single location.
+                Default is 'Australia'.
+            out (Union[np.ndarray, str, Path], optional): The float64 array to write the adjusted values to
+                or the path to a .npy file to create. If not given, then an array is allocated in memory.
+            block_size (int): The number of rows in each block. Default 1,048,576.
+            date_format (str, optional): The strftime format of date strings. If not given, then the format is inferred.
+            progress (Callable[[int, int], None], optional): A function which is called after each block
+                with the number of rows adjusted so far and the total number of rows.
+
+        Returns:
+            np.ndarray: The output array with the adjusted values.
+        """
+        if evaluation_date is None:
+            evaluation_date = datetime.now()
+
+        return blocks.calc_inflation_blocks(
+            self.table,
+            value,
+            original_date,
+            evaluation_date,
+            location,
+            out=out,
+            block_size=block_size,
+            date_format=date_format,
+            progress=progress,
+        )
+
     def calc_inflation_timeseries(
         self,
         compare_date: Union[datetime, str],
@@ -130,26 +460,32 @@ class CPI:
         value=1,
         location: Union[Location, str] = Location.AUSTRALIA,
     ) -> pd.Series:
-        compare_date = convert_date(compare_date)
-        if start_date != None:
-            start_date = convert_date(start_date).item()
-        if end_date != None:
-            end_date = convert_date(end_date).item()
+        table = self.table
+        # The quarters from the start date to the end date inclusive
+        start, stop = 0, len(table.dates)
+        if start_date is not None:
+            start = np.searchsorted(table.dates, convert_date(start_date), side="left")
+        if end_date is not None:
+            stop = np.searchsorted(table.dates, convert_date(end_date), side="right")
 
-        cpi_ts = self.cpi_series(location=location)[start_date:end_date].copy()
         evaluation_cpi = self.cpi_at(compare_date, location=location)
-        inflation = value * (evaluation_cpi / cpi_ts)
-        return inflation
+        return pd.Series(
+            value * (evaluation_cpi / table.column(location)[start:stop]),
+            index=pd.DatetimeIndex(table.dates[start:stop], name="Date"),
+            name=self.column_name(location),
+        )
 
 
-_cpi = CPI()
+_cpi = CPI(prefer_bundled=instrument.environment_flag("AUSDEX_PREFER_BUNDLED"))
 
 
 def calc_inflation(
     value: Union[numbers.Number, np.ndarray, pd.Series],
     original_date: Union[datetime, str],
     evaluation_date: Union[datetime, str] = None,
-    location: Union[Location, str] = Location.AUSTRALIA,
+    location: Union[Location, str, pd.Series, np.ndarray, list] = Location.AUSTRALIA,
+    date_format: Optional[str] = None,
+    n_jobs: Optional[int] = None,
 ) -> Union[float, np.ndarray]:
     """
     Adjusts a value (or list of values) for inflation.
@@ -158,9 +494,13 @@ def calc_inflation(
         value (numbers.Number, np.ndarray, pd.Series): The value to be converted.
         original_date (datetime, str): The date that the value is in relation to.
         evaluation_date (datetime, str, optional): The date to adjust the value to. Defaults to the current date.
-        location (Location, str, optional): The location for calculating the CPI.
+        location (Location, str, pd.Series, np.ndarray, list, optional): The location for calculating the CPI.
             Options are 'Australia', 'Sydney', 'Melbourne', 'Brisbane', 'Adelaide', 'Perth', 'Hobart', 'Darwin', and 'Canberra'.
+            This can also be an array (or categorical Series) with a location for each value.
             Default is 'Australia'.
+        date_format (str, optional): The strftime format of date strings. If not given, then the format is inferred.
+        n_jobs (int, optional): The number of processes to split large arrays across. -1 uses all the CPUs.
+            Arrays with fewer than a million values are adjusted in this process. Default None (a single process).
 
     Returns:
         Union[float, np.ndarray]: The adjusted value.
@@ -170,9 +510,73 @@ def calc_inflation(
         original_date=original_date,
         evaluation_date=evaluation_date,
         location=location,
+        date_format=date_format,
+        n_jobs=n_jobs,
+    )
+
+
+def calc_inflation_blocks(
+    value: np.ndarray,
+    original_date: Union[datetime, str, np.ndarray],
+    evaluation_date: Union[datetime, str, np.ndarray, None] = None,
+    location: Union[Location, str, np.ndarray] = Location.AUSTRALIA,
+    out: Union[np.ndarray, str, Path, None] = None,
+    block_size: int = blocks.BLOCK_SIZE,
+    date_format: Optional[str] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> np.ndarray:
+    """
+    Adjusts arrays which are larger than memory for inflation one block of rows at a time.
+
+    See `CPI.calc_inflation_blocks`.
+
+    Args:
+        value (np.ndarray): The values to be converted.
+        original_date (datetime, str, np.ndarray): The dates that the values are in relation to.
+        evaluation_date (datetime, str, np.ndarray, optional): The dates to adjust the values to.
+            Defaults to the current date.
+        location (Location, str, np.ndarray, optional): The location for each value or a single location.
+            Default is 'Australia'.
+        out (np.ndarray, str, Path, optional): The float64 array to write the adjusted values to
+            or the path to a .npy file to create. If not given, then an array is allocated in memory.
+        block_size (int): The number of rows in each block. Default 1,048,576.
+        date_format (str, optional): The strftime format of date strings. If not given, then the format is inferred.
+        progress (Callable[[int, int], None], optional): A function which is called after each block
+            with the number of rows adjusted so far and the total number of rows.
+
+    Returns:
+        np.ndarray: The output array with the adjusted values.
+    """
+    return _cpi.calc_inflation_blocks(
+        value,
+        original_date=original_date,
+        evaluation_date=evaluation_date,
+        location=location,
+        out=out,
+        block_size=block_size,
+        date_format=date_format,
+        progress=progress,
     )
 
 
+def inflation_factors(location: Union[Location, str] = Location.AUSTRALIA) -> np.ndarray:
+    """
+    Returns a matrix of the inflation factors between every pair of quarters for a location.
+
+    The entry at [i, j] is the CPI of quarter i divided by the CPI of quarter j.
+    The quarters are in the order of the rows in `latest_cpi_df`.
+
+    Args:
+        location (Location, str, optional): The location for calculating the CPI.
+            Options are 'Australia', 'Sydney', 'Melbourne', 'Brisbane', 'Adelaide', 'Perth', 'Hobart', 'Darwin', and 'Canberra'.
+            Default is 'Australia'.
+
+    Returns:
+        np.ndarray: A read-only square float64 matrix of inflation factors.
+    """
+    return _cpi.inflation_factors(location)
+
+
 def latest_cpi_df() -> pd.DataFrame:
     """
     Returns a pandas DataFrame with the latest CPI data from the Australian Bureau of Statistics.
@@ -0,0 +1,259 @@
+import os
+import sys
+import time
+import atexit
+import logging
+import functools
+import threading
+import contextlib
+from typing import Callable, Iterator, Optional, TextIO
+
+
+ENVIRONMENT_VARIABLE = "AUSDEX_INSTRUMENT"
+FALSE_VALUES = ("", "0", "false", "no")
+
+logger = logging.getLogger(__name__)
+
+Sink = Callable[[str, str, float], None]
+
+_enabled = False
+_lock = threading.Lock()
+_counters = {}
+_timers = {}
+_sinks = []
+
+
+def enabled() -> bool:
+    """Returns whether or not the counters and timers are being recorded."""
+    return _enabled
+
+
+def enable():
+    """Starts recording the counters and timers."""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """Stops recording the counters and timers. The statistics recorded so far are kept."""
+    global _enabled
+    _enabled = False
+
+
+def reset():
+    """Clears the statistics recorded so far."""
+    with _lock:
+        _counters.clear()
+        _timers.clear()
+
+
+def add_sink(sink: Sink):
+    """
+    Adds a function which is called with each event as it is recorded.
+
+    The function is called with the kind of event ('count' or 'time'), the name of the counter or timer
+    and the amount (the number counted or the number of seconds).
+    """
+    with _lock:
+        _sinks.append(sink)
+
+
+def remove_sink(sink: Sink):
+    """Removes a function added with `add_sink`."""
+    with _lock:
+        if sink in _sinks:
+            _sinks.remove(sink)
+
+
+def log_sink(kind: str, name: str, amount: float):
+    """A sink which writes each event to the 'ausdex.instrument' logger at the DEBUG level."""
+    if kind == "time":
+        logger.debug("%s took %.6f s", name, amount)
+    else:
+        logger.debug("%s +%g", name, amount)
+
+
+def emit(kind: str, name: str, amount: float):
+    for sink in list(_sinks):
+        sink(kind, name, amount)
+
+
+def count(name: str, amount: float = 1):
+    """
+    Adds to a named counter if instrumentation is enabled.
+
+    Args:
+        name (str): The name of the counter, e.g. 'download.cache_hits'.
+        amount (float): The amount to add. Default 1.
+    """
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+    emit("count", name, amount)
+
+
+def record_time(name: str, seconds: float):
+    """Adds a duration to a named timer if instrumentation is enabled."""
+    if not _enabled:
+        return
+    with _lock:
+        calls, total = _timers.get(name, (0, 0.0))
+        _timers[name] = (calls + 1, total + seconds)
+    emit("time", name, seconds)
+
+
+class Timer:
+    """Measures the time taken by the code in a `with` block and records it with `record_time`."""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        record_time(self.name, time.perf_counter() - self.start)
+
+
+_null_timer = contextlib.nullcontext()
+
+
+def timer(name: str):
+    """
+    Returns a context manager which records the time taken by a `with` block in a named timer.
+
+    If instrumentation is disabled, then it returns a shared context manager which does nothing.
+
+    Args:
+        name (str): The name of the timer, e.g. 'parse.workbook'.
+    """
+    return Timer(name) if _enabled else _null_timer
+
+
+def timed(name: str, rows: Optional[Callable] = None):
+    """
+    Decorates a function so that the time of each call is recorded in a named timer.
+
+    When instrumentation is disabled, the decorated function only checks a flag before calling the original function.
+
+    Args:
+        name (str): The name of the timer.
+        rows (Callable, optional): A function of the result which gives a number to add to the counter '{name}.rows'.
+    """
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                result = function(*args, **kwargs)
+            finally:
+                # Calls which fail (e.g. downloads which time out) are timed as well
+                record_time(name, time.perf_counter() - start)
+            if rows:
+                count(f"{name}.rows", rows(result))
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def stats() -> dict:
+    """
+    Returns a snapshot of the statistics recorded so far.
+
+    Returns:
+        dict: A dictionary with the 'counters' (a dictionary of the name and the total of each counter)
+            and the 'timers' (a dictionary of the name of each timer and a dictionary with its number of 'calls',
+            its 'total' number of seconds and the 'mean' number of seconds).
+    """
+    with _lock:
+        counters = dict(_counters)
+        timers = {
+            name: dict(calls=calls, total=total, mean=total / calls) for name, (calls, total) in _timers.items()
+        }
+    return dict(counters=counters, timers=timers)
+
+
+def report(file: Optional[TextIO] = None):
+    """
+    Writes a summary of the statistics recorded so far.
+
+    Args:
+        file (TextIO, optional): The file to write to. Defaults to stderr.
+    """
+    file = file or sys.stderr
+    recorded = stats()
+    for name, total in sorted(recorded["counters"].items()):
+        print(f"{name}: {total:g}", file=file)
+    for name, timer in sorted(recorded["timers"].items()):
+        print(f"{name}: {timer['calls']} calls, {timer['total']:.6f} s total, {timer['mean']:.6f} s mean", file=file)
+
+
+@contextlib.contextmanager
+def instrumented(sink: Optional[Sink] = None, clear: bool = True) -> Iterator[Callable[[], dict]]:
+    """
+    Records the counters and timers within a `with` block.
+
+    For example::
+
+        with instrumented() as recorded:
+            calc_inflation(values, dates)
+        print(recorded())
+
+    Args:
+        sink (Callable, optional): A function which is called with each event in the block (see `add_sink`).
+            `log_sink` writes the events to the 'ausdex.instrument' logger.
+        clear (bool): Whether or not to clear the statistics recorded before the block. Default True.
+
+    Yields:
+        Callable[[], dict]: The `stats` function which returns a snapshot of the statistics.
+    """
+    was_enabled = _enabled
+    if clear:
+        reset()
+    if sink:
+        add_sink(sink)
+    enable()
+    try:
+        yield stats
+    finally:
+        if not was_enabled:
+            disable()
+        if sink:
+            remove_sink(sink)
+
+
+def environment_flag(name: str) -> bool:
+    """
+    Returns whether an environment variable is set to turn an option on.
+
+    The option is off if the variable is not set, is empty or is '0', 'false' or 'no' (in any case).
+    """
+    return os.environ.get(name, "").strip().lower() not in FALSE_VALUES
+
+
+def enable_from_environment():
+    """
+    Enables instrumentation if the environment variable AUSDEX_INSTRUMENT is set.
+
+    A summary of the statistics is written to stderr when the process exits (see `report`).
+    If its value is 'log', then the events are also written to the 'ausdex.instrument' logger as they happen.
+    """
+    if not environment_flag(ENVIRONMENT_VARIABLE) or _enabled:
+        return
+    if os.environ[ENVIRONMENT_VARIABLE].strip().lower() == "log":
+        add_sink(log_sink)
+    enable()
+    atexit.register(report)
+
+
+enable_from_environment()
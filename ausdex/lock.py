@@ -0,0 +1,164 @@
+import os
+import json
+import time
+import socket
+import contextlib
+from pathlib import Path
+from typing import Iterator, Union
+
+
+LOCK_TIMEOUT = 120.0
+LOCK_STALE_AFTER = 600.0
+
+
+class LockTimeoutError(TimeoutError):
+    pass
+
+
+def lock_path(path: Union[str, Path]) -> Path:
+    """
+    Returns the path of the lock file which guards a file in the cache.
+
+    For example, '640101-jun-2021.xls' is guarded by '640101-jun-2021.xls.lock'.
+    """
+    path = Path(path)
+    return path.with_name(f"{path.name}.lock")
+
+
+def process_exists(pid: int) -> bool:
+    """Checks whether a process with this id is running on this machine."""
+    if os.name == "nt":
+        # os.kill would terminate the process on Windows so assume that it is running
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def is_stale(path: Path, stale_after: float) -> bool:
+    """
+    Checks whether a lock file was left behind by a process which crashed.
+
+    The lock is stale if the process which holds it is no longer running on this machine
+    or if it was created more than `stale_after` seconds ago.
+    """
+    try:
+        try:
+            holder = json.loads(path.read_text())
+            created = float(holder["created"])
+        except (ValueError, KeyError, TypeError):
+            # The holder may not have written its details yet so only the age of the file can be used
+            holder = {}
+            created = path.stat().st_mtime
+    except FileNotFoundError:
+        # The lock was released in the meantime
+        return False
+
+    if time.time() - created > stale_after:
+        return True
+    if holder.get("host") != socket.gethostname() or not isinstance(holder.get("pid"), int):
+        return False
+    return not process_exists(holder["pid"])
+
+
+def remove_stale_lock(path: Path, stale_after: float) -> None:
+    """
+    Removes a lock file if it is stale.
+
+    The lock file is renamed before it is checked again so that if several processes find the same stale lock,
+    only one of them removes it and a new lock created in the meantime is not removed by mistake.
+    """
+    claimed = path.with_name(f"{path.name}.{os.getpid()}.stale")
+    try:
+        os.rename(path, claimed)
+    except FileNotFoundError:
+        return
+
+    if is_stale(claimed, stale_after):
+        claimed.unlink(missing_ok=True)
+        return
+
+    # Another process took the lock in the meantime so it is restored unless yet another process has taken it since
+    try:
+        os.link(claimed, path)
+    except FileExistsError:
+        pass
+    claimed.unlink(missing_ok=True)
+
+
+@contextlib.contextmanager
+def file_lock(
+    path: Union[str, Path], timeout: float = LOCK_TIMEOUT, stale_after: float = LOCK_STALE_AFTER
+) -> Iterator[Path]:
+    """
+    Holds an advisory lock on a file so that only one process (or thread) at a time downloads or builds it.
+
+    The lock is a separate file next to the guarded file (see `lock_path`) which is created exclusively.
+    It records the process id, the host and the time it was created so that a lock left behind by a process
+    which crashed can be recovered.
+
+    Args:
+        path (str, Path): The path to the file which is guarded by the lock.
+        timeout (float): The number of seconds to wait for another process to release the lock. Default 120.
+        stale_after (float): The number of seconds after which a lock is considered to be abandoned. Default 600.
+
+    Raises:
+        LockTimeoutError: If the lock is not released by another process within `timeout` seconds.
+
+    Yields:
+        Path: The path to the lock file.
+    """
+    path = lock_path(path)
+    path.parent.mkdir(exist_ok=True, parents=True)
+    deadline = time.monotonic() + timeout
+    delay = 0.01
+    while True:
+        try:
+            file_descriptor = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            if is_stale(path, stale_after):
+                remove_stale_lock(path, stale_after)
+                continue
+            if time.monotonic() > deadline:
+                raise LockTimeoutError(f"Timed out waiting for the lock {path}")
+            time.sleep(delay)
+            delay = min(delay * 2, 0.5)
+
+    holder = json.dumps(dict(pid=os.getpid(), host=socket.gethostname(), created=time.time()))
+    try:
+        with os.fdopen(file_descriptor, "w") as f:
+            f.write(holder)
+        yield path
+    finally:
+        # The lock is only removed if another process has not taken it over because it seemed to be abandoned
+        try:
+            if path.read_text() == holder:
+                path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+@contextlib.contextmanager
+def optional_file_lock(path: Union[str, Path], **kwargs) -> Iterator[None]:
+    """
+    Holds the lock from `file_lock` if possible and otherwise continues without it.
+
+    This is for building files which are only optimizations and which are written atomically,
+    so the lock only stops several processes from doing the same work at once.
+    It continues without the lock if the lock file cannot be created (e.g. in a read-only directory) or if it times out.
+
+    Args:
+        path (str, Path): The path to the file which is guarded by the lock.
+        **kwargs: The keyword arguments for `file_lock`.
+    """
+    with contextlib.ExitStack() as stack:
+        try:
+            stack.enter_context(file_lock(path, **kwargs))
+        except OSError:
+            pass
+        yield
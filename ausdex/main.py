@@ -7,9 +7,7 @@ import typer
 from typing import Optional
 import subprocess
 
-from .inflation import calc_inflation
 from .location import Location
-from . import viz
 
 app = typer.Typer()
 
@@ -76,6 +74,7 @@ def inflation(
             Options are 'Australia', 'Sydney', 'Melbourne', 'Brisbane', 'Adelaide', 'Perth', 'Hobart', 'Darwin', and 'Canberra'.
             Default is 'Australia'.
     """
+    from .inflation import calc_inflation
 
     result = calc_inflation(
         value=value, original_date=original_date, evaluation_date=evaluation_date, location=location
@@ -83,6 +82,123 @@ def inflation(
     typer.echo(f"{result:.2f}")
 
 
+@app.command()
+def adjust_csv(
+    input: str = typer.Argument("-", help="The CSV file to read. If '-' then it reads from stdin."),
+    value_column: str = typer.Option(..., help="The column with the dollar values to be converted."),
+    original_date_column: str = typer.Option(..., help="The column with the dates that the values are in relation to."),
+    evaluation_date_column: str = typer.Option(None, help="The column with the dates to adjust the values to."),
+    location_column: str = typer.Option(None, help="The column with the location for calculating the CPI."),
+    evaluation_date: str = typer.Option(
+        None, help="The date to adjust the values to if there is no evaluation date column. Defaults to the current date."
+    ),
+    location: Location = typer.Option(
+        Location.AUSTRALIA,
+        case_sensitive=False,
+        help="The location for calculating the CPI if there is no location column.",
+    ),
+    output: str = typer.Option("-", help="The CSV file to write. If '-' then it writes to stdout."),
+    output_column: str = typer.Option("adjusted", help="The name of the column for the adjusted values."),
+    chunksize: int = typer.Option(100_000, help="The number of rows to read at a time."),
+    date_format: str = typer.Option(
+        None, help="The strftime format of the dates (e.g. '%d/%m/%Y'). If not given, then the format is inferred."
+    ),
+):
+    """
+    Adjusts a column of Australian dollars in a CSV file for inflation.
+
+    The CSV file is read in chunks so that large files can be adjusted with constant memory use.
+
+    Args:
+        input (str): The CSV file to read. If '-' then it reads from stdin.
+        value_column (str): The column with the dollar values to be converted.
+        original_date_column (str): The column with the dates that the values are in relation to.
+        evaluation_date_column (str, optional): The column with the dates to adjust the values to.
+        location_column (str, optional): The column with the location for calculating the CPI.
+        evaluation_date (str, optional): The date to adjust the values to if there is no evaluation date column.
+            Defaults to the current date.
+        location (Location, optional): The location for calculating the CPI if there is no location column.
+            Default is 'Australia'.
+        output (str): The CSV file to write. If '-' then it writes to stdout.
+        output_column (str): The name of the column for the adjusted values. Default 'adjusted'.
+        chunksize (int): The number of rows to read at a time. Default 100,000.
+        date_format (str, optional): The strftime format of the dates. If not given, then the format is inferred.
+    """
+    from .batch import adjust_csv
+
+    adjust_csv(
+        input,
+        output,
+        value_column=value_column,
+        original_date_column=original_date_column,
+        evaluation_date_column=evaluation_date_column,
+        location_column=location_column,
+        evaluation_date=evaluation_date,
+        location=location,
+        output_column=output_column,
+        chunksize=chunksize,
+        date_format=date_format,
+    )
+
+
+@app.command()
+def serve(
+    host: str = typer.Option("127.0.0.1", help="The host to listen on."),
+    port: int = typer.Option(8000, help="The port to listen on."),
+    memory_map: bool = typer.Option(False, help="Whether or not to memory-map the CPI table from the cache directory."),
+    max_age: float = typer.Option(
+        None, help="The number of seconds between checks with the ABS for new or revised CPI data. Defaults to never."
+    ),
+):
+    """
+    Runs an HTTP server which adjusts values for inflation with the CPI data kept in memory.
+
+    Args:
+        host (str): The host to listen on. Default '127.0.0.1'.
+        port (int): The port to listen on. Default 8000.
+        memory_map (bool): Whether or not to memory-map the CPI table from the cache directory. Default False.
+        max_age (float, optional): The number of seconds between checks with the ABS for new or revised CPI data.
+            If not given, then the CPI data is not checked again while the server runs.
+    """
+    from .inflation import CPI
+    from .server import serve
+
+    typer.echo(f"Serving on http://{host}:{port}")
+    serve(host=host, port=port, cpi=CPI(memory_map=memory_map, max_age=max_age))
+
+
+@app.command()
+def bundle_snapshot(
+    workbook: Path = typer.Argument(
+        None, help="The ABS workbook with the CPI data (file id '640101'). Defaults to the latest workbook from the ABS."
+    ),
+):
+    """
+    Saves the CPI data from a workbook as the snapshot which is bundled with the package.
+
+    This should be run before building a release so that the package can be used without network access.
+
+    Args:
+        workbook (Path, optional): The ABS workbook with the CPI data (file id '640101').
+            Defaults to the latest workbook from the ABS.
+    """
+    from .files import cached_download_cpi
+    from .inflation import read_cpi_workbook
+    from .snapshot import write_snapshot, read_bundled_snapshot, BUNDLED_SNAPSHOT
+
+    workbook = workbook or cached_download_cpi()
+    if workbook is None:
+        typer.echo("Cannot download the CPI data to bundle.", err=True)
+        raise typer.Exit(code=1)
+    BUNDLED_SNAPSHOT.parent.mkdir(exist_ok=True, parents=True)
+    path = write_snapshot(read_cpi_workbook(workbook), workbook, path=BUNDLED_SNAPSHOT)
+    # A release should not ship a snapshot which the package cannot read
+    if read_bundled_snapshot() is None:
+        typer.echo(f"Cannot read the CPI data written to '{path}'.", err=True)
+        raise typer.Exit(code=1)
+    typer.echo(f"Wrote the CPI data from '{workbook}' to '{path}'.")
+
+
 @app.command()
 def plot_inflation(
     compare_date: str = typer.Argument(..., help="Date to set relative value of the dollars too."),
@@ -117,14 +233,14 @@ def plot_inflation(
         end_date (str, optional): Date to set the end of the time series graph too. Defaults to None, which will set the end date to the most recent quarter.
         value (float, optional): Value you in `compare_date` dollars to plot on the time series. Defaults to 1.
     """
-    from ausdex.viz import plot_inflation_timeseries
+    from .viz import plot_inflation_timeseries, write_fig
 
     fig = plot_inflation_timeseries(
         compare_date=compare_date, start_date=start_date, end_date=end_date, value=value, location=location
     )
     if output:
         print(f"Writing figure to '{output}'.")
-        viz.write_fig(fig, output)
+        write_fig(fig, output)
     if show:
         fig.show()
 
@@ -161,12 +277,12 @@ def plot_cpi(
         location (List[location]): The location for calculating the CPI.
         title (str, optional): A custom title of the plot.
     """
-    from ausdex.viz import plot_cpi_timeseries
+    from .viz import plot_cpi_timeseries, write_fig
 
     fig = plot_cpi_timeseries(start_date=start_date, end_date=end_date, locations=location, title=title)
     if output:
         print(f"Writing figure to '{output}'.")
-        viz.write_fig(fig, output)
+        write_fig(fig, output)
     if show:
         fig.show()
 
@@ -200,7 +316,7 @@ def plot_cpi_change(
         output (Path): The path to where the figure will be saved. Output can be PDF, SVG, JPG, PNG or HTML based on the extension.
         location (List[location]): The location for calculating the CPI.
     """
-    from ausdex.viz import plot_cpi_change
+    from .viz import plot_cpi_change
 
     fig = plot_cpi_change(
         start_date=start_date,
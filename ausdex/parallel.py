@@ -0,0 +1,212 @@
+import os
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .dates import convert_date
+from .table import CPITable
+
+
+PARALLEL_MIN_ROWS = 1_000_000
+CHUNKS_PER_JOB = 4
+
+# The shared memory blocks and arrays which are attached in each worker process
+_worker_blocks = []
+_worker_arrays = {}
+_worker_date_format = None
+
+
+def resolve_n_jobs(n_jobs: Optional[int]) -> int:
+    """
+    Returns the number of processes to use.
+
+    None and 1 mean a single process. Negative numbers count back from the number of CPUs so -1 uses all of them.
+    """
+    if n_jobs is None:
+        return 1
+    if n_jobs < 0:
+        n_jobs = (os.cpu_count() or 1) + 1 + n_jobs
+    return max(n_jobs, 1)
+
+
+def share(stack: contextlib.ExitStack, array, dtype=None) -> Tuple[str, tuple, str]:
+    """
+    Copies an array into a new block of shared memory which is released when the stack is closed.
+
+    The values are written straight into the block (and cast to `dtype` if it is given)
+    so no other copy of the array is made.
+
+    Returns:
+        Tuple[str, tuple, str]: The name of the block, the shape and the datatype
+            so that other processes can attach to it.
+    """
+    array = np.asarray(array)
+    dtype = np.dtype(dtype or array.dtype)
+    block = shared_memory.SharedMemory(create=True, size=max(array.size * dtype.itemsize, 1))
+    stack.callback(block.unlink)
+    stack.callback(block.close)
+    np.ndarray(array.shape, dtype=dtype, buffer=block.buf)[...] = array
+    return block.name, array.shape, dtype.str
+
+
+def attach(spec: Tuple[str, tuple, str]) -> np.ndarray:
+    """Returns an array in a block of shared memory created with `share`."""
+    name, shape, dtype = spec
+    block = shared_memory.SharedMemory(name=name)
+    _worker_blocks.append(block)
+    return np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def is_shareable_dates(dates) -> bool:
+    """
+    Returns whether or not an array of dates can be put in shared memory as it is and converted by the workers.
+
+    Arrays of datetime64 values, decimal years and integer years can be. Arrays of strings and objects cannot,
+    so chunks of them are sent to the workers instead.
+    """
+    return isinstance(dates, np.ndarray) and dates.dtype.kind in "Mfiu"
+
+
+def adjust(
+    table: CPITable,
+    arrays: dict,
+    start: int,
+    stop: int,
+    chunks: Optional[dict] = None,
+    date_format: Optional[str] = None,
+):
+    """
+    Adjusts the values in rows `start` to `stop` for inflation and writes them to the output array.
+
+    Arrays with a single item are broadcast to all the rows. The dates are converted here
+    so that the conversion is split across the processes as well.
+
+    Args:
+        table (CPITable): The CPI values for each location.
+        arrays (dict): The inputs and the output array.
+        start (int): The first row.
+        stop (int): The row after the last row.
+        chunks (dict, optional): Inputs which only have the rows from `start` to `stop` (e.g. arrays of date strings).
+        date_format (str, optional): The strftime format of date strings. If not given, then the format is inferred.
+    """
+    chunks = chunks or {}
+
+    def rows(name):
+        if name in chunks:
+            return chunks[name]
+        array = arrays[name]
+        return array if array.size == 1 else array[start:stop]
+
+    columns = rows("columns") if arrays["columns"].ndim else int(arrays["columns"])
+    original_cpi = table.lookup(convert_date(rows("original_date"), format=date_format), columns)
+    evaluation_cpi = table.lookup(convert_date(rows("evaluation_date"), format=date_format), columns)
+    arrays["output"][start:stop] = rows("value") * evaluation_cpi / original_cpi
+
+
+def initialize_worker(specs: dict, date_format: Optional[str] = None):
+    """Attaches a worker process to the shared inputs, output and CPI table."""
+    global _worker_date_format
+    _worker_date_format = date_format
+    _worker_arrays.clear()
+    for block in _worker_blocks:
+        block.close()
+    _worker_blocks.clear()
+    _worker_arrays.update({name: attach(spec) for name, spec in specs.items()})
+
+
+def adjust_chunk(start: int, stop: int, chunks: Optional[dict] = None):
+    """
+    Adjusts a chunk of rows in a worker process.
+
+    Only the bounds of the chunk are sent to the worker, along with the rows of any dates which cannot be shared
+    (e.g. strings).
+    """
+    table = _worker_arrays.get("table")
+    if table is None:
+        table = _worker_arrays["table"] = CPITable(_worker_arrays["cpi_dates"], _worker_arrays["cpi_values"])
+    adjust(table, _worker_arrays, start, stop, chunks=chunks, date_format=_worker_date_format)
+
+
+def calc_inflation(
+    table: CPITable,
+    value,
+    original_date,
+    evaluation_date,
+    columns: Union[int, np.ndarray],
+    date_format: Optional[str] = None,
+    n_jobs: Optional[int] = -1,
+) -> Optional[Union[np.ndarray, pd.Series]]:
+    """
+    Adjusts large arrays of values for inflation with a pool of processes.
+
+    The numeric inputs, the output and the CPI table are written straight into shared memory and each process
+    attaches to them, so only the bounds of each chunk are sent to the processes.
+    Arrays of date strings (or other objects) cannot be shared, so each process is sent its chunk of them.
+    The dates are converted by the processes so that the parsing is split across them as well.
+
+    Args:
+        table (CPITable): The CPI values for each location.
+        value: The values to adjust.
+        original_date: The dates that the values are in relation to.
+        evaluation_date: The dates to adjust the values to.
+        columns (int, np.ndarray): The column of the table for all the values or for each value.
+        date_format (str, optional): The strftime format of date strings. If not given, then the format is inferred.
+        n_jobs (int, optional): The number of processes. -1 uses all the CPUs. Default -1.
+
+    Returns:
+        Union[np.ndarray, pd.Series], optional: The adjusted values (as a Series if `value` is a Series).
+            None if there are fewer than `PARALLEL_MIN_ROWS` rows or only one process,
+            because starting the processes would take longer than adjusting the values in this process.
+    """
+    n_jobs = resolve_n_jobs(n_jobs)
+    size = max(np.size(value), np.size(original_date), np.size(evaluation_date), np.size(columns))
+    if n_jobs == 1 or size < PARALLEL_MIN_ROWS:
+        return None
+
+    inputs = dict(value=value, original_date=original_date, evaluation_date=evaluation_date, columns=columns)
+    for name, array in inputs.items():
+        if isinstance(array, pd.Series):
+            array = array.to_numpy()
+        elif isinstance(array, (list, tuple)):
+            array = np.asarray(array, dtype=object if name.endswith("date") else None)
+        if np.ndim(array) > 1 or np.size(array) not in (1, size):
+            raise ValueError(f"The {name.replace('_', ' ')} cannot be broadcast to {size} rows.")
+        if name.endswith("date") and np.size(array) == 1:
+            # A single date is converted once here
+            array = convert_date(array, format=date_format)
+        inputs[name] = array
+
+    # Dates which cannot be put in shared memory (e.g. strings) are sent to the processes one chunk at a time
+    bounds = np.linspace(0, size, min(n_jobs * CHUNKS_PER_JOB, size) + 1, dtype=int)
+    unshared = [name for name in ("original_date", "evaluation_date") if not is_shareable_dates(inputs[name])]
+    chunks = [{name: inputs[name][start:stop] for name in unshared} for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    with contextlib.ExitStack() as stack:
+        specs = dict(
+            value=share(stack, inputs["value"], dtype=float),
+            columns=share(stack, inputs["columns"], dtype=np.intp),
+            cpi_dates=share(stack, table.dates),
+            cpi_values=share(stack, table.values),
+        )
+        for name in ("original_date", "evaluation_date"):
+            if name not in unshared:
+                specs[name] = share(stack, inputs[name])
+        # The output is allocated in shared memory and copied out once at the end
+        output_block = shared_memory.SharedMemory(create=True, size=size * np.dtype(float).itemsize)
+        stack.callback(output_block.unlink)
+        stack.callback(output_block.close)
+        specs["output"] = (output_block.name, (size,), np.dtype(float).str)
+
+        with ProcessPoolExecutor(n_jobs, initializer=initialize_worker, initargs=(specs, date_format)) as executor:
+            # The results are consumed so that errors in the workers are raised here
+            list(executor.map(adjust_chunk, bounds[:-1], bounds[1:], chunks))
+
+        output = np.ndarray((size,), dtype=float, buffer=output_block.buf).copy()
+
+    if isinstance(value, pd.Series):
+        return pd.Series(output, index=value.index, name=value.name)
+    return output
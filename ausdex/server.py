@@ -0,0 +1,292 @@
+import sys
+import copy
+import json
+import asyncio
+import inspect
+import threading
+import traceback
+from datetime import datetime
+from http import HTTPStatus
+from typing import Optional, Tuple
+from urllib.parse import urlsplit, parse_qsl
+
+import numpy as np
+
+from .files import DownloadError
+from .inflation import CPI, _cpi
+
+
+JSON_CONTENT_TYPE = "application/json"
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+MAX_BODY_SIZE = 256 * 1024 * 1024
+
+
+class HTTPError(Exception):
+    """An error which is returned to the client with an HTTP status code."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def to_json_values(result):
+    """Converts a scalar or NumPy array result into JSON values with NaN as null."""
+    values = np.asarray(result, dtype=float)
+    values = np.where(np.isnan(values), None, values.astype(object))
+    return values.tolist()
+
+
+class CPIService:
+    """
+    Answers requests for inflation adjustments and CPI values with a warm CPI object.
+
+    Args:
+        cpi (CPI, optional): The CPI object to use. Defaults to the module-level CPI object.
+    """
+
+    def __init__(self, cpi: Optional[CPI] = None):
+        self.cpi = cpi or _cpi
+
+    def warm(self):
+        """Loads the CPI data so that the first request does not need to wait for it."""
+        self.cpi.table
+
+    def reload(self) -> Optional[CPI]:
+        """
+        Checks for new or revised CPI data with a copy of the CPI object and loads the data into the copy.
+
+        The CPI object which answers the requests is not changed, so this can run in a worker thread
+        while the requests are still answered with the current data.
+
+        Returns:
+            CPI, optional: The copy with the new data loaded or None if the CPI data has not changed.
+        """
+        cpi = copy.copy(self.cpi)
+        # The copy must not hold the lock of the CPI object in use while it downloads and parses the data
+        cpi.lock = threading.RLock()
+        if not cpi.refresh():
+            return None
+        cpi.table
+        return cpi
+
+    async def refresh_periodically(self, interval: float):
+        """
+        Checks for new or revised CPI data every `interval` seconds and loads it straight away if it changed.
+
+        The network requests and the parsing happen in a worker thread so that the event loop keeps answering requests.
+        The new data is swapped in once it is completely loaded.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                cpi = await loop.run_in_executor(None, self.reload)
+            except (DownloadError, OSError, ValueError) as error:
+                print(f"WARNING: Cannot refresh the CPI data ({error}).", file=sys.stderr)
+                continue
+            if cpi is not None:
+                self.cpi = cpi
+
+    def inflation(self, value, original_date, evaluation_date=None, location="Australia") -> dict:
+        if value is None or original_date is None:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Both 'value' and 'original_date' are required.")
+        if isinstance(value, list):
+            value = np.asarray(value, dtype=float)
+        elif isinstance(value, str):
+            value = float(value)
+        for name, dates in [("original_date", original_date), ("evaluation_date", evaluation_date)]:
+            if isinstance(dates, list) and isinstance(value, np.ndarray) and len(dates) != len(value):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, f"'{name}' must have the same length as 'value'.")
+        if isinstance(original_date, list):
+            original_date = np.asarray(original_date, dtype=object)
+        if isinstance(evaluation_date, list):
+            # Values are adjusted to the current date when the evaluation date of a row is left out
+            now = datetime.now()
+            evaluation_date = np.asarray([now if date is None else date for date in evaluation_date], dtype=object)
+
+        result = self.cpi.calc_inflation(
+            value, original_date=original_date, evaluation_date=evaluation_date, location=location
+        )
+        return dict(value=to_json_values(result))
+
+    def cpi_at(self, date, location="Australia") -> dict:
+        if date is None:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'date' is required.")
+        if isinstance(date, list):
+            date = np.asarray(date, dtype=object)
+        return dict(cpi=to_json_values(self.cpi.cpi_at(date, location=location)))
+
+    def timeseries(self, compare_date, start_date=None, end_date=None, value=1, location="Australia") -> dict:
+        if compare_date is None:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'compare_date' is required.")
+        series = self.cpi.calc_inflation_timeseries(
+            compare_date, start_date=start_date, end_date=end_date, value=float(value), location=location
+        )
+        return dict(
+            dates=[date.strftime("%Y-%m-%d") for date in series.index],
+            values=to_json_values(series.to_numpy(dtype=float)),
+        )
+
+    def handle(self, method: str, target: str, content_type: str, body: bytes) -> Tuple[HTTPStatus, str, bytes]:
+        """
+        Handles a request and returns the status, the content type and the body of the response.
+
+        GET requests take their parameters from the query string.
+        POST requests take a JSON object where each parameter can be a list for batches,
+        or NDJSON with one JSON object per line which gives one line in the response for each line of the request.
+        """
+        url = urlsplit(target)
+        endpoints = {"/inflation": self.inflation, "/cpi": self.cpi_at, "/timeseries": self.timeseries}
+        if url.path == "/health":
+            return HTTPStatus.OK, JSON_CONTENT_TYPE, json.dumps(dict(status="ok")).encode()
+        if url.path not in endpoints:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"Cannot find '{url.path}'.")
+        endpoint = endpoints[url.path]
+
+        if method == "GET":
+            result = self.call(endpoint, dict(parse_qsl(url.query)))
+            return HTTPStatus.OK, JSON_CONTENT_TYPE, json.dumps(result).encode()
+        if method != "POST" or endpoint == self.timeseries:
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"Cannot use {method} with '{url.path}'.")
+
+        try:
+            if content_type == NDJSON_CONTENT_TYPE:
+                records = [json.loads(line) for line in body.splitlines() if line.strip()]
+            else:
+                parameters = json.loads(body or b"{}")
+        except json.JSONDecodeError as error:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"Cannot decode JSON: {error}")
+
+        if content_type != NDJSON_CONTENT_TYPE:
+            if not isinstance(parameters, dict):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "The body must be a JSON object.")
+            return HTTPStatus.OK, JSON_CONTENT_TYPE, json.dumps(self.call(endpoint, parameters)).encode()
+
+        # Gather the records into columns so that the whole batch is calculated with a single vectorized call
+        if not records:
+            return HTTPStatus.OK, NDJSON_CONTENT_TYPE, b""
+        # A field which a record leaves out gets the same default as it would in a request on its own
+        names = set().union(*records)
+        defaults = {
+            name: parameter.default
+            for name, parameter in inspect.signature(endpoint).parameters.items()
+            if parameter.default is not inspect.Parameter.empty
+        }
+        columns = {name: [record.get(name, defaults.get(name)) for record in records] for name in names}
+        result = self.call(endpoint, columns)
+        output_name, values = next(iter(result.items()))
+        lines = [json.dumps({output_name: value}) for value in values]
+        return HTTPStatus.OK, NDJSON_CONTENT_TYPE, ("\n".join(lines) + "\n").encode()
+
+    def call(self, endpoint, parameters: dict) -> dict:
+        unknown = set(parameters) - set(inspect.signature(endpoint).parameters)
+        if unknown:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"Unknown parameters: {', '.join(sorted(unknown))}.")
+        return endpoint(**parameters)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Reads HTTP/1.1 requests from a connection and writes the responses until the connection is closed."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, header_value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = header_value.strip()
+
+                keep_alive = headers.get("connection", "").lower() != "close"
+                try:
+                    method, target, _ = request_line.decode("latin-1").split()
+                    content_length = int(headers.get("content-length", 0))
+                    if content_length > MAX_BODY_SIZE:
+                        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "The request body is too large.")
+                    body = await reader.readexactly(content_length) if content_length else b""
+                    content_type = headers.get("content-type", JSON_CONTENT_TYPE).split(";")[0].strip()
+                    status, response_type, response = self.handle(method, target, content_type, body)
+                except HTTPError as error:
+                    status, response_type = error.status, JSON_CONTENT_TYPE
+                    response = json.dumps(dict(error=error.message)).encode()
+                except (ValueError, TypeError, KeyError, OverflowError) as error:
+                    status, response_type = HTTPStatus.BAD_REQUEST, JSON_CONTENT_TYPE
+                    response = json.dumps(dict(error=str(error))).encode()
+                except Exception as error:
+                    # e.g. the CPI data cannot be downloaded. The client still gets a response on this connection.
+                    traceback.print_exc(file=sys.stderr)
+                    status, response_type = HTTPStatus.INTERNAL_SERVER_ERROR, JSON_CONTENT_TYPE
+                    response = json.dumps(dict(error=f"{type(error).__name__}: {error}")).encode()
+
+                writer.write(
+                    (
+                        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                        f"Content-Type: {response_type}\r\n"
+                        f"Content-Length: {len(response)}\r\n"
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                    ).encode("latin-1")
+                    + response
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def start_server(host: str = "127.0.0.1", port: int = 8000, cpi: Optional[CPI] = None) -> asyncio.AbstractServer:
+    """
+    Starts an HTTP server which adjusts values for inflation with a warm CPI object.
+
+    If the CPI object has a `max_age`, then the CPI data is refreshed in the background at that interval.
+
+    Args:
+        host (str): The host to listen on. Default '127.0.0.1'.
+        port (int): The port to listen on. If 0 then a free port is chosen. Default 8000.
+        cpi (CPI, optional): The CPI object to use. Defaults to the module-level CPI object.
+
+    Returns:
+        asyncio.AbstractServer: The server which is listening for connections.
+    """
+    service = CPIService(cpi)
+    service.warm()
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    if service.cpi.max_age is not None:
+        service.refresh_task = asyncio.ensure_future(service.refresh_periodically(service.cpi.max_age))
+    return server
+
+
+def serve(host: str = "127.0.0.1", port: int = 8000, cpi: Optional[CPI] = None):
+    """
+    Runs an HTTP server which adjusts values for inflation until it is interrupted.
+
+    The CPI data is loaded once when the server starts. The endpoints are:
+
+    * GET /inflation?value=...&original_date=...&evaluation_date=...&location=...
+    * GET /cpi?date=...&location=...
+    * GET /timeseries?compare_date=...&start_date=...&end_date=...&value=...&location=...
+    * POST /inflation and POST /cpi with a JSON object where the parameters can be lists for batches
+      or with NDJSON (Content-Type: application/x-ndjson) with one object per line.
+    * GET /health
+
+    Args:
+        host (str): The host to listen on. Default '127.0.0.1'.
+        port (int): The port to listen on. Default 8000.
+        cpi (CPI, optional): The CPI object to use. Defaults to the module-level CPI object.
+    """
+
+    async def run():
+        server = await start_server(host, port, cpi=cpi)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
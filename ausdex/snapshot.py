@@ -0,0 +1,179 @@
+import os
+import json
+import hashlib
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Union, Optional
+
+import numpy as np
+import pandas as pd
+
+
+SNAPSHOT_VERSION = 1
+BUNDLED_SNAPSHOT = Path(__file__).parent / "data" / "640101.snapshot.npz"
+
+
+def source_key(path: Union[str, Path], checksum: bool = True) -> dict:
+    """
+    Returns the values which identify a particular version of a source file.
+
+    Args:
+        path (str, Path): The path to the source file.
+        checksum (bool): Whether to include the SHA256 hash of the file, which means reading the whole file.
+            Default True.
+
+    Returns:
+        dict: The size, the modification time (in nanoseconds) and the SHA256 hash of the file.
+    """
+    path = Path(path)
+    stat = path.stat()
+    key = dict(size=stat.st_size, mtime=stat.st_mtime_ns)
+    if not checksum:
+        return key
+
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha256.update(block)
+
+    return dict(key, sha256=sha256.hexdigest())
+
+
+def atomic_write(path: Path, write: Callable):
+    """
+    Writes a file atomically so that other processes never read a partially written file.
+
+    Args:
+        path (Path): The path to the file.
+        write (Callable): A function which writes the contents to the binary file object that it receives.
+    """
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "wb") as f:
+            write(f)
+        os.replace(temporary_path, path)
+    except BaseException:
+        Path(temporary_path).unlink(missing_ok=True)
+        raise
+
+
+def snapshot_path(source: Union[str, Path]) -> Path:
+    """
+    Returns the path of the snapshot for a source file.
+
+    The snapshot is stored next to the source file, e.g. '640101-jun-2021.xls' has the snapshot '640101-jun-2021.snapshot.npz'.
+    """
+    source = Path(source)
+    return source.with_name(f"{source.stem}.snapshot.npz")
+
+
+def write_snapshot(df: pd.DataFrame, source: Union[str, Path], path: Union[str, Path, None] = None) -> Path:
+    """
+    Writes a compact binary snapshot of a DataFrame parsed from a CPI workbook.
+
+    The snapshot is written atomically.
+
+    Args:
+        df (pd.DataFrame): The DataFrame parsed from the source workbook.
+            It must have a 'Date' column and all other columns must be numeric.
+        source (str, Path): The path to the workbook that the DataFrame was parsed from.
+        path (str, Path, optional): The path to write the snapshot to. Defaults to the path given by `snapshot_path`.
+
+    Returns:
+        Path: The path to the snapshot.
+    """
+    source = Path(source)
+    path = Path(path or snapshot_path(source))
+    columns = [column for column in df.columns if column != "Date"]
+
+    atomic_write(
+        path,
+        lambda f: np.savez(
+            f,
+            version=np.array(SNAPSHOT_VERSION),
+            source=np.array(json.dumps(source_key(source))),
+            dates=np.array(pd.to_datetime(df["Date"]), dtype="datetime64[ns]"),
+            values=np.array(df[columns], dtype=float),
+            columns=np.array(columns, dtype=str),
+        ),
+    )
+
+    return path
+
+
+def read_snapshot(source: Union[str, Path]) -> Optional[pd.DataFrame]:
+    """
+    Reads the snapshot of a CPI workbook if it exists and is still valid.
+
+    Args:
+        source (str, Path): The path to the workbook.
+
+    Returns:
+        pd.DataFrame, optional: The DataFrame in the same format as if it were parsed from the workbook.
+            If the snapshot is missing, stale or corrupt then it returns None.
+    """
+    return load_snapshot(snapshot_path(source), source)
+
+
+def load_snapshot(path: Union[str, Path], source: Union[str, Path, None] = None) -> Optional[pd.DataFrame]:
+    """
+    Loads a snapshot of a CPI workbook.
+
+    Args:
+        path (str, Path): The path to the snapshot.
+        source (str, Path, optional): The path to the workbook that the snapshot should match.
+            If None, then the snapshot is not checked against a workbook.
+
+    Returns:
+        pd.DataFrame, optional: The DataFrame in the same format as if it were parsed from the workbook.
+            If the snapshot is missing, stale or corrupt then it returns None.
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+
+    try:
+        with np.load(path, allow_pickle=False) as snapshot:
+            if snapshot["version"].item() != SNAPSHOT_VERSION:
+                return None
+            if source is not None and json.loads(snapshot["source"].item()) != source_key(source):
+                return None
+
+            dates = snapshot["dates"]
+            values = snapshot["values"]
+            columns = snapshot["columns"].tolist()
+    except Exception:
+        return None
+
+    df = pd.DataFrame(values, columns=columns, dtype=float)
+    df.insert(0, "Date", pd.to_datetime(dates))
+    df.index = pd.DatetimeIndex(df["Date"])
+
+    return df
+
+
+def read_bundled_snapshot() -> Optional[pd.DataFrame]:
+    """
+    Reads the CPI data which is bundled with the package so that it can be used without network access.
+
+    Returns:
+        pd.DataFrame, optional: The bundled CPI data or None if the package does not include it.
+    """
+    return load_snapshot(BUNDLED_SNAPSHOT)
+
+
+def bundled_snapshot_date() -> Optional[datetime]:
+    """
+    Returns the date of the last quarter in the CPI data which is bundled with the package.
+
+    Returns:
+        datetime, optional: The date of the last quarter or None if the package does not include bundled data.
+    """
+    try:
+        with np.load(BUNDLED_SNAPSHOT, allow_pickle=False) as snapshot:
+            if snapshot["version"].item() != SNAPSHOT_VERSION:
+                return None
+            return snapshot["dates"][-1].astype("datetime64[us]").item()
+    except Exception:
+        return None
@@ -0,0 +1,294 @@
+import json
+import functools
+from datetime import datetime
+from pathlib import Path
+from typing import Union, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import instrument
+from .dates import DATE_PATTERN, SCALAR_DATE_TYPES, scalar_to_days
+from .location import Location
+from .snapshot import atomic_write, source_key
+
+
+LOCATIONS = list(Location)
+SCALAR_CACHE_SIZE = 4096
+
+
+def location_index(location: Union[Location, str]) -> int:
+    """
+    Returns the index of the column for a location in a CPITable.
+
+    Args:
+        location (Location, str): The location. Strings are case insensitive.
+
+    Raises:
+        ValueError: If the location cannot be understood.
+
+    Returns:
+        int: The index of the location in the columns of the table.
+    """
+    return LOCATIONS.index(Location(str(location).title()))
+
+
+def location_indices(locations) -> np.ndarray:
+    """
+    Returns the index of the column in a CPITable for each location in an array.
+
+    The unique locations are resolved once so that this is fast for large (or categorical) arrays.
+
+    Args:
+        locations (array-like): The locations. These can be a list, a NumPy array or a (categorical) pandas Series.
+
+    Raises:
+        ValueError: If one of the locations cannot be understood.
+
+    Returns:
+        np.ndarray: The index of the column for each location. Missing locations have the index -1.
+    """
+    if isinstance(locations, pd.Series) and isinstance(locations.dtype, pd.CategoricalDtype):
+        codes, categories = locations.cat.codes.to_numpy(), locations.cat.categories
+    else:
+        codes, categories = pd.factorize(np.asarray(locations, dtype=object))
+
+    category_indices = np.array([location_index(category) for category in categories] + [-1], dtype=np.intp)
+
+    # Missing values have the code -1 which selects the final item of `category_indices`
+    return category_indices[codes]
+
+
+def table_paths(source: Union[str, Path]) -> dict:
+    """
+    Returns the paths of the files in the memory-mapped layout for a source workbook.
+
+    The files are stored next to the source, e.g. '640101-jun-2021.xls' has the files
+    '640101-jun-2021.cpi-dates.npy', '640101-jun-2021.cpi-values.npy', '640101-jun-2021.cpi-day-rows.npy'
+    and '640101-jun-2021.cpi.json'.
+    """
+    source = Path(source)
+    return dict(
+        dates=source.with_name(f"{source.stem}.cpi-dates.npy"),
+        values=source.with_name(f"{source.stem}.cpi-values.npy"),
+        day_rows=source.with_name(f"{source.stem}.cpi-day-rows.npy"),
+        metadata=source.with_name(f"{source.stem}.cpi.json"),
+    )
+
+
+class CPITable:
+    """
+    The CPI for each location per quarter as typed NumPy arrays.
+
+    Attributes:
+        dates (np.ndarray): The date of each quarter with the datatype datetime64[D].
+        values (np.ndarray): A float64 matrix with the CPI values with a row for each quarter and a column for each location.
+            It is stored in column-major order so that the values for each location are contiguous.
+        first_day (int): The first date in the table as the number of days since 1970-01-01.
+        day_rows (np.ndarray): The row of the quarter for each day from the first date to the last date in the table.
+            This turns lookups into integer arithmetic and a single gather rather than a search.
+            It is saved with the other arrays so that it is memory-mapped too (see `load`).
+        scalar_cache (Callable): The memoized CPI for single dates and locations (see `scalar`).
+            It belongs to the table so that it is cleared when the data is refreshed.
+    """
+
+    def __init__(self, dates: np.ndarray, values: np.ndarray, day_rows: Optional[np.ndarray] = None):
+        self.dates = dates
+        self.values = values
+        self.first_day = int(dates[0].astype(np.int64))
+        if day_rows is None:
+            day_rows = np.searchsorted(dates, np.arange(dates[0], dates[-1] + 1), side="right") - 1
+        self.day_rows = day_rows
+        self.scalar_cache = functools.lru_cache(maxsize=SCALAR_CACHE_SIZE)(self.scalar_lookup)
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, columns: List[str]) -> "CPITable":
+        """
+        Builds the table from a DataFrame parsed from the CPI workbook.
+
+        Args:
+            df (pd.DataFrame): The CPI data with the date of each quarter as the index.
+            columns (List[str]): The names of the columns in `df` for each location in the order of `Location`.
+        """
+        dates = np.array(df.index, dtype="datetime64[D]")
+        values = np.asfortranarray(np.array(df[columns], dtype=float))
+        return cls(dates, values)
+
+    def column(self, location: Union[Location, str] = Location.AUSTRALIA) -> np.ndarray:
+        """Returns the contiguous array of CPI values for a location."""
+        return self.values[:, location_index(location)]
+
+    def columns(self, location) -> Union[int, np.ndarray]:
+        """
+        Returns the index of the column for a location or for each location in an array.
+
+        Args:
+            location (Location, str, array-like): A single location or an array of locations.
+
+        Returns:
+            Union[int, np.ndarray]: The index of the column for a single location or an array of indexes.
+        """
+        if isinstance(location, str):
+            return location_index(location)
+        return location_indices(location)
+
+    @instrument.timed("lookup", rows=lambda result: np.size(result[0]))
+    def rows(self, dates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the row of the quarter for each date.
+
+        Args:
+            dates (np.ndarray): The dates with the datatype datetime64[D].
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The row for each date and a boolean array which is True for dates
+                before the first quarter or missing dates. Dates after the last quarter are given the last row.
+        """
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        days = dates.view(np.int64) - self.first_day
+
+        # Days after the end of the table are clipped to the last quarter
+        rows = self.day_rows.take(days, mode="clip")
+        missing = (days < 0) | np.isnat(dates)
+
+        return rows, missing
+
+    def scalar_lookup(self, date, location: Union[Location, str], date_format: Optional[str] = None) -> float:
+        """
+        Returns the CPI for a single date and location without building any arrays.
+
+        Args:
+            date: A single date (see `scalar_to_days`).
+            location (Location, str): The location.
+            date_format (str, optional): The strftime format of date strings. If not given, then the format is inferred.
+
+        Returns:
+            float: The CPI. This is NaN for dates before the first quarter or missing dates.
+        """
+        column = location_index(location)
+        days = scalar_to_days(date, format=date_format)
+        if days is None or days < self.first_day:
+            return np.nan
+        row = self.day_rows[min(days - self.first_day, len(self.day_rows) - 1)]
+        return float(self.values[row, column])
+
+    def scalar(self, date, location: Union[Location, str], date_format: Optional[str] = None) -> Optional[float]:
+        """
+        Returns the CPI for a single date and location from a bounded LRU cache.
+
+        Naive datetimes are reduced to their date so that, for example, `datetime.now()` is cached for the whole day.
+        Only strings which always mean the same date are cached (see `DATE_PATTERN`), because pandas also accepts
+        relative strings like 'today' and 'now'. Other strings are parsed on every call.
+
+        Args:
+            date: A single date as a string, a date or datetime, a year (int), a decimal year (float)
+                or a np.datetime64.
+            location (Location, str): The location.
+            date_format (str, optional): The strftime format of date strings. If not given, then the format is inferred.
+
+        Returns:
+            float, optional: The CPI (NaN for dates before the first quarter) or None if `date` is not a single date
+                which can be looked up this way.
+        """
+        if isinstance(date, datetime):
+            if date.tzinfo is not None:
+                return None
+            date = date.date()
+        elif not isinstance(date, SCALAR_DATE_TYPES) or isinstance(date, bool):
+            return None
+        elif isinstance(date, str) and date_format is None and not DATE_PATTERN.match(date):
+            return self.scalar_lookup(date, location, date_format)
+        return self.scalar_cache(date, location, date_format)
+
+    def factor_matrix(self, column: int) -> np.ndarray:
+        """
+        Returns the matrix of inflation factors between every pair of quarters for a location.
+
+        Args:
+            column (int): The index of the column for the location.
+
+        Returns:
+            np.ndarray: A square float64 matrix where the entry at [evaluation row, original row] is
+                the CPI of the evaluation quarter divided by the CPI of the original quarter.
+        """
+        column_values = self.values[:, column]
+        return column_values[:, np.newaxis] / column_values[np.newaxis, :]
+
+    def lookup(self, dates: np.ndarray, columns: Union[int, np.ndarray]) -> np.ndarray:
+        """
+        Returns the CPI values for dates.
+
+        Dates before the first quarter (and missing dates) give NaN. Dates after the last quarter give the CPI of the last quarter.
+
+        Args:
+            dates (np.ndarray): The dates with the datatype datetime64[D].
+            columns (Union[int, np.ndarray]): The index of the column for all the dates or an array of indexes
+                (as given by `columns`) which is broadcast with the dates.
+
+        Returns:
+            np.ndarray: The CPI values.
+        """
+        rows, missing = self.rows(dates)
+
+        if isinstance(columns, np.ndarray):
+            cpis = self.values[rows, columns]
+            missing = missing | (columns < 0)
+        else:
+            cpis = np.asarray(self.values[:, columns].take(rows))
+
+        cpis[np.broadcast_to(missing, cpis.shape)] = np.nan
+        return cpis
+
+    def save(self, source: Union[str, Path]):
+        """
+        Saves the table in a layout which can be memory-mapped.
+
+        Each file is written atomically and the metadata file is written last so that
+        other processes only see a complete layout.
+
+        Args:
+            source (str, Path): The path to the workbook that the table was built from.
+        """
+        paths = table_paths(source)
+        atomic_write(paths["dates"], lambda f: np.save(f, self.dates))
+        atomic_write(paths["values"], lambda f: np.save(f, self.values))
+        atomic_write(paths["day_rows"], lambda f: np.save(f, np.asarray(self.day_rows, dtype=np.int64)))
+        metadata = dict(source=source_key(source, checksum=False), locations=[str(location) for location in LOCATIONS])
+        atomic_write(paths["metadata"], lambda f: f.write(json.dumps(metadata).encode()))
+
+    @classmethod
+    def load(cls, source: Union[str, Path]) -> Optional["CPITable"]:
+        """
+        Memory-maps the table saved for a source workbook.
+
+        The arrays are read-only and the pages are shared between all the processes which map the same files.
+        The layout is checked against the size and modification time of the workbook without reading it,
+        so that loading does not depend on the size of the workbook.
+
+        Args:
+            source (str, Path): The path to the workbook that the table was built from.
+
+        Returns:
+            CPITable, optional: The table. If the layout is missing, stale or corrupt then it returns None.
+        """
+        paths = table_paths(source)
+        try:
+            metadata = json.loads(paths["metadata"].read_text())
+            if metadata["source"] != source_key(source, checksum=False):
+                return None
+            if metadata["locations"] != [str(location) for location in LOCATIONS]:
+                return None
+
+            dates = np.load(paths["dates"], mmap_mode="r", allow_pickle=False)
+            values = np.load(paths["values"], mmap_mode="r", allow_pickle=False)
+            day_rows = np.load(paths["day_rows"], mmap_mode="r", allow_pickle=False)
+        except Exception:
+            return None
+
+        if dates.dtype != np.dtype("datetime64[D]") or values.shape != (len(dates), len(LOCATIONS)):
+            return None
+        days = int((dates[-1] - dates[0]).astype(np.int64)) + 1 if len(dates) else 0
+        if day_rows.dtype != np.dtype(np.int64) or day_rows.shape != (days,):
+            return None
+
+        return cls(dates, values, day_rows)
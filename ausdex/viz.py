@@ -12,9 +12,6 @@ from .inflation import latest_cpi_df, CPI
 from .dates import convert_date
 
 
-pio.kaleido.scope.mathjax = None
-
-
 def format_fig(fig):
     """Formats a plotly figure in a nicer way."""
     fig.update_layout(
@@ -54,6 +51,8 @@ def write_fig(fig, output: Union[Path, str]):
     if output.suffix.lower() == ".html":
         fig.write_html(output)
     else:
+        # Setting this loads kaleido so it is only done when writing images
+        pio.kaleido.scope.mathjax = None
         fig.write_image(output)
 
 
@@ -0,0 +1,29 @@
+from unittest.mock import patch
+
+import pytest
+
+from ausdex import inflation
+
+from tests.synthetic import write_synthetic_cpi_workbook
+
+
+@pytest.fixture(scope="session")
+def workbook(tmp_path_factory):
+    """A synthetic 640101-shaped workbook so that the benchmarks run without downloading data from the ABS."""
+    return write_synthetic_cpi_workbook(tmp_path_factory.mktemp("abs") / "640101-jun-2023.xlsx")
+
+
+@pytest.fixture
+def offline(workbook):
+    """Uses the synthetic workbook for every CPI object, including the module-level one."""
+    with patch.object(inflation, "cached_download_cpi", return_value=workbook):
+        with patch.object(inflation, "_cpi", inflation.CPI()):
+            yield workbook
+
+
+@pytest.fixture
+def cpi(offline):
+    """A CPI object with the data already loaded."""
+    cpi = inflation.CPI()
+    cpi.table
+    return cpi
@@ -0,0 +1,23 @@
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+
+def run(*args):
+    """Runs the `ausdex` command in a new interpreter so that the import time is included."""
+    subprocess.run([sys.executable, "-c", "from ausdex.main import app; app()", *args], check=True, capture_output=True)
+
+
+def test_version(benchmark):
+    benchmark.pedantic(run, args=("--version",), rounds=5)
+
+
+def test_help(benchmark):
+    benchmark.pedantic(run, args=("--help",), rounds=5)
+
+
+def test_import_ausdex(benchmark):
+    benchmark.pedantic(subprocess.run, args=([sys.executable, "-c", "import ausdex"],), rounds=5)
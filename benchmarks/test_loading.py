@@ -0,0 +1,35 @@
+import pytest
+
+from ausdex import inflation
+from ausdex.snapshot import snapshot_path
+
+pytest.importorskip("pytest_benchmark")
+
+
+def load(cpi):
+    return cpi.latest_cpi_df
+
+
+def test_latest_cpi_df_cold_workbook(benchmark, offline):
+    """Parses the workbook because there is no snapshot."""
+
+    def setup():
+        snapshot_path(offline).unlink(missing_ok=True)
+        return (inflation.CPI(),), {}
+
+    benchmark.pedantic(load, setup=setup, rounds=5)
+
+
+def test_latest_cpi_df_cold_snapshot(benchmark, offline):
+    """Reads the snapshot which was saved by another process."""
+    inflation.CPI().latest_cpi_df
+    benchmark.pedantic(load, setup=lambda: ((inflation.CPI(),), {}), rounds=20)
+
+
+def test_latest_cpi_df_warm(benchmark, cpi):
+    benchmark(load, cpi)
+
+
+def test_table_cold(benchmark, offline):
+    inflation.CPI().latest_cpi_df
+    benchmark.pedantic(lambda cpi: cpi.table, setup=lambda: ((inflation.CPI(),), {}), rounds=20)
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+SIZE = 100_000
+
+
+@pytest.fixture
+def arrays():
+    rng = np.random.default_rng(42)
+    values = rng.uniform(0, 100, SIZE)
+    dates = np.datetime64("1950-01-01") + rng.integers(0, 27000, SIZE).astype("timedelta64[D]")
+    locations = rng.choice(["Sydney", "Melbourne", "Perth", "Hobart"], SIZE)
+    return values, dates, locations
+
+
+def test_calc_inflation_scalar(benchmark, cpi):
+    benchmark(cpi.calc_inflation, 26, "July 21 1991", evaluation_date="Sep 1999")
+
+
+def test_calc_inflation_vector(benchmark, cpi, arrays):
+    values, dates, _ = arrays
+    benchmark(cpi.calc_inflation, values, dates, evaluation_date="2020-06-01")
+
+
+def test_calc_inflation_vector_locations(benchmark, cpi, arrays):
+    values, dates, locations = arrays
+    benchmark(cpi.calc_inflation, values, dates, evaluation_date=dates[::-1], location=locations)
+
+
+def test_cpi_at_scalar(benchmark, cpi):
+    benchmark(cpi.cpi_at, "1991-07-21", location="Sydney")
+
+
+def test_cpi_at_vector(benchmark, cpi, arrays):
+    _, dates, _ = arrays
+    benchmark(cpi.cpi_at, dates)
+
+
+def test_calc_inflation_timeseries(benchmark, cpi):
+    benchmark(cpi.calc_inflation_timeseries, "2020-01-01", start_date="1950-01-01", location="Perth")
@@ -0,0 +1,46 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ausdex.dates import convert_date
+
+pytest.importorskip("pytest_benchmark")
+
+SIZE = 100_000
+
+
+@pytest.fixture
+def dates():
+    rng = np.random.default_rng(42)
+    return np.datetime64("1950-01-01") + rng.integers(0, 27000, SIZE).astype("timedelta64[D]")
+
+
+def test_convert_date_string(benchmark):
+    benchmark(convert_date, "July 21 1991")
+
+
+def test_convert_date_float(benchmark):
+    benchmark(convert_date, 1991.5)
+
+
+def test_convert_date_datetime(benchmark):
+    benchmark(convert_date, datetime(1991, 7, 21))
+
+
+def test_convert_date_iso_strings(benchmark, dates):
+    benchmark(convert_date, pd.Series(dates.astype(str).astype(object)))
+
+
+def test_convert_date_formatted_strings(benchmark, dates):
+    strings = pd.Series(pd.DatetimeIndex(dates).strftime("%d/%m/%Y"))
+    benchmark(convert_date, strings, format="%d/%m/%Y")
+
+
+def test_convert_date_floats(benchmark, dates):
+    benchmark(convert_date, 1950 + np.arange(SIZE) / SIZE * 70)
+
+
+def test_convert_date_datetimes(benchmark, dates):
+    benchmark(convert_date, pd.Series(dates.astype("datetime64[ns]")))
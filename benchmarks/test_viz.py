@@ -0,0 +1,16 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+viz = pytest.importorskip("ausdex.viz")
+
+
+def test_plot_inflation_timeseries(benchmark, offline):
+    benchmark(viz.plot_inflation_timeseries, "01-01-2019", start_date="06-06-1949", end_date=2020)
+
+
+def test_plot_cpi_timeseries(benchmark, offline):
+    benchmark(viz.plot_cpi_timeseries, start_date="06-06-1949", end_date=2020)
+
+
+def test_plot_cpi_change(benchmark, offline):
+    benchmark(viz.plot_cpi_change, start_date="1990", end_date="2022")
@@ -0,0 +1,116 @@
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Union
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from ausdex import inflation
+from ausdex.location import Location
+
+
+def synthetic_cpi_dataframe(quarters: int = 300) -> pd.DataFrame:
+    """
+    Builds a DataFrame with the same layout as the 'Data1' sheet of the ABS 640101 workbook.
+
+    The CPI values are synthetic so that tests can run without downloading data from the ABS.
+    The first quarter is September 1948.
+    """
+    dates = [datetime(1948 + (8 + 3 * index) // 12, (8 + 3 * index) % 12 + 1, 1) for index in range(quarters)]
+    headers = [
+        ["Unit"],
+        ["Series Type"],
+        ["Data Type"],
+        ["Frequency"],
+        ["Collection Month"],
+        ["Series Start"],
+        ["Series End"],
+        ["No. Obs"],
+        ["Series ID"],
+    ]
+    columns = {}
+    for location_index, location in enumerate(Location):
+        growth = 1.0 + 0.01 + 0.001 * location_index
+        index_numbers = 3.9 * growth ** np.arange(quarters) + location_index * 0.1
+        previous_year = np.full(quarters, np.nan)
+        previous_year[4:] = (index_numbers[4:] / index_numbers[:-4] - 1.0) * 100.0
+        columns[f"Index Numbers ;  All groups CPI ;  {location} ;"] = index_numbers.round(1)
+        columns[f"Percentage Change from Corresponding Quarter of Previous Year ;  All groups CPI ;  {location} ;"] = (
+            previous_year.round(1)
+        )
+
+    rows = [header + ["Index Numbers"] * len(columns) for header in headers]
+    for row_index, date in enumerate(dates):
+        rows.append([date] + [values[row_index] for values in columns.values()])
+
+    return pd.DataFrame(rows, columns=[""] + list(columns.keys()))
+
+
+def write_synthetic_cpi_workbook(path: Union[str, Path], quarters: int = 300) -> Path:
+    """Writes a synthetic 640101-shaped workbook to `path` and returns the path."""
+    path = Path(path)
+    path.parent.mkdir(exist_ok=True, parents=True)
+    with pd.ExcelWriter(path) as writer:
+        synthetic_cpi_dataframe(quarters).to_excel(writer, sheet_name="Data1", index=False)
+    return path
+
+
+def synthetic_inputs(size: int = 1000, seed: int = 42) -> dict:
+    """
+    Builds random arrays of arguments for `CPI.calc_inflation`.
+
+    Every 97th original date is NaT and some of the dates fall before the first quarter of the synthetic workbook.
+
+    Args:
+        size (int): The number of rows. Default 1000.
+        seed (int): The seed for the random number generator. Default 42.
+
+    Returns:
+        dict: The arrays 'values', 'dates', 'evaluation_dates' and 'locations'.
+    """
+    rng = np.random.default_rng(seed)
+    values = rng.uniform(-100, 100, size)
+    dates = np.datetime64("1940-01-01") + rng.integers(0, 32000, size).astype("timedelta64[D]")
+    dates[::97] = np.datetime64("NaT")
+    evaluation_dates = np.datetime64("1950-01-01") + rng.integers(0, 30000, size).astype("timedelta64[D]")
+    locations = np.array([str(location) for location in Location])[rng.integers(0, len(Location), size)]
+    return dict(values=values, dates=dates, evaluation_dates=evaluation_dates, locations=locations)
+
+
+def use_synthetic_cpi(add_cleanup: Callable, quarters: int = 300) -> Path:
+    """
+    Writes a synthetic workbook to a temporary directory and makes `inflation.cached_download_cpi` return it.
+
+    Args:
+        add_cleanup (Callable): The function which registers the clean up,
+            e.g. `self.addCleanup` in `setUp` or `cls.addClassCleanup` in `setUpClass`.
+        quarters (int): The number of quarters in the workbook. Default 300.
+
+    Returns:
+        Path: The path to the workbook, which is named like the workbook for June 2023.
+    """
+    tmpdir = tempfile.TemporaryDirectory()
+    add_cleanup(tmpdir.cleanup)
+    workbook = write_synthetic_cpi_workbook(Path(tmpdir.name) / "640101-jun-2023.xlsx", quarters=quarters)
+    patcher = patch.object(inflation, "cached_download_cpi", return_value=workbook)
+    patcher.start()
+    add_cleanup(patcher.stop)
+    return workbook
+
+
+class SyntheticCPITestCase(unittest.TestCase):
+    """
+    A test case which uses a synthetic CPI workbook instead of downloading the workbook from the ABS.
+
+    The workbook is `self.workbook` in the temporary directory `self.tmp`
+    and `self.mock_download` is the mock which replaces `inflation.cached_download_cpi`.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.workbook = use_synthetic_cpi(self.addCleanup)
+        self.tmp = self.workbook.parent
+        self.mock_download = inflation.cached_download_cpi
@@ -0,0 +1,90 @@
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from ausdex import accessor, inflation
+
+from .synthetic import SyntheticCPITestCase
+from .test_main import imported_modules
+
+
+class TestAccessor(SyntheticCPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.cpi = inflation.CPI()
+        self.df = pd.DataFrame(
+            dict(
+                price=[10.0, 20.0, -30.0, 40.0],
+                cost=[1, 2, 3, 4],
+                sold=["1991-03-01", "1975-06-01", "1999-12-25", "1940-01-01"],
+                bought=pd.to_datetime(["1981-06-01", "1971-01-01", "1990-02-03", "2001-01-01"]),
+                valued=["2010-06-01", "2005-04-05", "2022-05-01", "2010-06-01"],
+                city=["Sydney", "Perth", "Darwin", "Sydney"],
+            ),
+            index=[10, 11, 12, 13],
+        )
+
+    def expected(self, value, date, location="city", to="valued"):
+        return self.cpi.calc_inflation(
+            self.df[value].to_numpy(dtype=float),
+            self.df[date],
+            evaluation_date=self.df[to] if to in self.df else to,
+            location=self.df[location] if location in self.df else location,
+        )
+
+    def test_inflate(self):
+        result = self.df.ausdex.inflate("price", "sold", location="city", to="valued", cpi=self.cpi)
+        self.assertIsInstance(result, pd.Series)
+        self.assertEqual(result.name, "price")
+        self.assertEqual(list(result.index), list(self.df.index))
+        np.testing.assert_allclose(result, self.expected("price", "sold"))
+        self.assertTrue(np.isnan(result[13]))
+
+    def test_inflate_scalars(self):
+        result = self.df.ausdex.inflate("price", "bought", location="Hobart", to="2015-01-01", cpi=self.cpi)
+        np.testing.assert_allclose(result, self.expected("price", "bought", location="Hobart", to="2015-01-01"))
+
+    def test_inflate_default_cpi(self):
+        with patch.object(inflation, "_cpi", self.cpi):
+            result = self.df.ausdex.inflate("price", "sold", location="city", to="valued")
+        np.testing.assert_allclose(result, self.expected("price", "sold"))
+
+    def test_inflate_several_columns(self):
+        with patch.object(accessor, "convert_date", wraps=accessor.convert_date) as mock_convert_date:
+            result = self.df.ausdex.inflate(["price", "cost"], "sold", location="city", to="valued", cpi=self.cpi)
+        # The shared date column is converted once and the evaluation dates are converted once
+        self.assertEqual(mock_convert_date.call_count, 2)
+        self.assertEqual(list(result.columns), ["price", "cost"])
+        np.testing.assert_allclose(result.price, self.expected("price", "sold"))
+        np.testing.assert_allclose(result.cost, self.expected("cost", "sold"))
+
+    def test_inflate_several_date_columns(self):
+        result = self.df.ausdex.inflate(
+            ["price", "cost"], ["sold", "bought"], location="city", to="valued", cpi=self.cpi
+        )
+        np.testing.assert_allclose(result.price, self.expected("price", "sold"))
+        np.testing.assert_allclose(result.cost, self.expected("cost", "bought"))
+
+        with self.assertRaises(ValueError):
+            self.df.ausdex.inflate(["price", "cost"], ["sold"], cpi=self.cpi)
+
+    def test_series_inflate(self):
+        result = self.df.price.ausdex.inflate(self.df.sold, location=self.df.city, to=self.df.valued, cpi=self.cpi)
+        self.assertEqual(result.name, "price")
+        self.assertEqual(list(result.index), list(self.df.index))
+        np.testing.assert_allclose(result, self.expected("price", "sold"))
+
+    def test_registered_with_pandas(self):
+        # The accessor does not depend on whether pandas or ausdex is imported first
+        for statement in [
+            "import pandas as pd; import ausdex.accessor; pd.DataFrame().ausdex",
+            "import ausdex.accessor; import pandas as pd; pd.DataFrame().ausdex",
+            "import ausdex; import pandas as pd; ausdex.register_accessors(); pd.Series(dtype=float).ausdex",
+            "import ausdex; import pandas as pd; ausdex.calc_inflation; pd.DataFrame().ausdex",
+        ]:
+            with self.subTest(statement=statement):
+                self.assertIn("ausdex", imported_modules(statement))
+
+    def test_not_registered_by_package(self):
+        self.assertNotIn("pandas", imported_modules("import ausdex"))
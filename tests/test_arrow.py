@@ -0,0 +1,144 @@
+import unittest
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+from ausdex import inflation
+from ausdex.arrow import is_arrow, to_numpy_values, to_numpy_dates, to_pandas_locations
+
+from .synthetic import SyntheticCPITestCase
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+
+@unittest.skipUnless(pa, "pyarrow is not installed")
+class TestArrow(SyntheticCPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.cpi = inflation.CPI()
+        self.values = [10.0, 20.0, -30.0, 40.0, 50.0]
+        self.dates = [date(1991, 3, 1), date(1975, 6, 1), date(1999, 12, 25), date(1940, 1, 1), None]
+        self.evaluation_dates = [
+            date(2010, 6, 1),
+            date(2005, 4, 5),
+            date(2022, 5, 1),
+            date(2010, 6, 1),
+            date(2000, 1, 1),
+        ]
+        self.locations = ["Sydney", "perth", "Darwin", "Sydney", "Hobart"]
+
+    def expected(self, location=None):
+        return self.cpi.calc_inflation(
+            np.array(self.values),
+            np.array(self.dates, dtype="datetime64[D]"),
+            evaluation_date=np.array(self.evaluation_dates, dtype="datetime64[D]"),
+            location=self.locations if location is None else location,
+        )
+
+    def test_is_arrow(self):
+        self.assertTrue(is_arrow(pa.array([1.0])))
+        self.assertTrue(is_arrow(pa.chunked_array([[1.0]])))
+        self.assertFalse(is_arrow(np.array([1.0])))
+        self.assertFalse(is_arrow(pd.Series([1.0])))
+
+    def test_values_zero_copy(self):
+        array = pa.array(self.values)
+        values = to_numpy_values(array)
+        self.assertEqual(values.ctypes.data, array.buffers()[1].address)
+        np.testing.assert_array_equal(to_numpy_values(pa.array([1, None, 3])), [1.0, np.nan, 3.0])
+
+    def test_dates(self):
+        expected = np.array(self.dates, dtype="datetime64[D]")
+        np.testing.assert_array_equal(to_numpy_dates(pa.array(self.dates, pa.date32())), expected)
+        np.testing.assert_array_equal(to_numpy_dates(pa.array(self.dates, pa.date64())), expected)
+
+        timestamps = [datetime(2000, 1, 2, 23, 59), datetime(1969, 12, 31, 1), None]
+        result = to_numpy_dates(pa.array(timestamps, pa.timestamp("ns")))
+        np.testing.assert_array_equal(result, np.array(["2000-01-02", "1969-12-31", "NaT"], dtype="datetime64[D]"))
+
+        chunked = pa.chunked_array([pa.array(self.dates[:2], pa.date32()), pa.array(self.dates[2:], pa.date32())])
+        np.testing.assert_array_equal(to_numpy_dates(chunked), expected)
+
+    def test_locations(self):
+        # Each chunk has its own dictionary
+        first = pa.array(self.locations[:3]).dictionary_encode()
+        second = pa.array(self.locations[3:] + [None]).dictionary_encode()
+        chunked = pa.chunked_array([first, second])
+        locations = to_pandas_locations(chunked)
+        self.assertIsInstance(locations.dtype, pd.CategoricalDtype)
+        self.assertEqual(list(locations.iloc[:-1]), self.locations)
+        self.assertTrue(pd.isna(locations.iloc[-1]))
+
+    def test_calc_inflation(self):
+        result = self.cpi.calc_inflation(
+            pa.array(self.values),
+            pa.array(self.dates, pa.date32()),
+            evaluation_date=pa.chunked_array([pa.array(self.evaluation_dates, pa.date32())]),
+            location=pa.array(self.locations).dictionary_encode(),
+        )
+        self.assertIsInstance(result, pa.Array)
+        self.assertEqual(result.type, pa.float64())
+        expected = self.expected()
+        np.testing.assert_allclose(result.to_numpy(zero_copy_only=False), expected)
+        # The CPI is not available for the early and missing dates so those values are null
+        self.assertEqual(result.null_count, np.isnan(expected).sum())
+
+    def test_calc_inflation_strings(self):
+        result = self.cpi.calc_inflation(
+            np.array(self.values), pa.array([str(d) if d else None for d in self.dates]), "2015-01-01", location="Perth"
+        )
+        expected = self.cpi.calc_inflation(
+            np.array(self.values), np.array(self.dates, dtype="datetime64[D]"), "2015-01-01", location="Perth"
+        )
+        np.testing.assert_allclose(result.to_numpy(zero_copy_only=False), expected)
+
+    def test_cpi_at(self):
+        result = self.cpi.cpi_at(pa.array(self.dates, pa.date32()), location=pa.array(self.locations))
+        self.assertIsInstance(result, pa.Array)
+        expected = self.cpi.cpi_at(np.array(self.dates, dtype="datetime64[D]"), location=self.locations)
+        np.testing.assert_allclose(result.to_numpy(zero_copy_only=False), expected)
+
+    def test_single_element(self):
+        # The result is an array whatever the length of the input
+        dates = pa.array([datetime(1991, 3, 1)], pa.timestamp("us"))
+        expected = self.cpi.cpi_at("1991-03-01", "Perth")
+        for result in [
+            self.cpi.cpi_at(dates, "Perth"),
+            self.cpi.cpi_at("1991-03-01", pa.array(["Perth"])),
+            self.cpi.calc_inflation(pa.array([100.0]), "1991-03-01", "1991-03-01", location="Perth"),
+        ]:
+            self.assertIsInstance(result, pa.Array)
+            self.assertEqual(len(result), 1)
+        np.testing.assert_allclose(self.cpi.cpi_at(dates, "Perth").to_numpy(zero_copy_only=False), [expected])
+
+    @unittest.skipUnless(pl, "polars is not installed")
+    def test_polars_single_element(self):
+        result = self.cpi.cpi_at(pl.Series("sold", [date(1991, 3, 1)]), "Perth")
+        self.assertIsInstance(result, pl.Series)
+        self.assertEqual(result.name, "sold")
+        np.testing.assert_allclose(result.to_numpy(), [self.cpi.cpi_at("1991-03-01", "Perth")])
+
+    @unittest.skipUnless(pl, "polars is not installed")
+    def test_polars(self):
+        df = pl.DataFrame(
+            dict(
+                price=self.values,
+                sold=self.dates,
+                valued=self.evaluation_dates,
+                city=pl.Series(self.locations, dtype=pl.Categorical),
+            )
+        )
+        result = self.cpi.calc_inflation(df["price"], df["sold"], evaluation_date=df["valued"], location=df["city"])
+        self.assertIsInstance(result, pl.Series)
+        self.assertEqual(result.name, "price")
+        np.testing.assert_allclose(result.to_numpy(), self.expected())
+        self.assertEqual(result.null_count(), np.isnan(self.expected()).sum())
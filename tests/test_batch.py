@@ -0,0 +1,124 @@
+import io
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+from typer.testing import CliRunner
+
+from ausdex import inflation, main
+from ausdex.batch import adjust_csv
+
+from .synthetic import SyntheticCPITestCase
+
+
+CSV = """price,sold,valued,city
+10,1991-03-01,2010-06-01,Sydney
+20,1975-06-01,2005-04-05,Perth
+-30,1999-12-25,2022-05-01,Darwin
+40,1940-01-01,2010-06-01,Sydney
+"""
+
+
+class TestAdjustCSV(SyntheticCPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.cpi = inflation.CPI()
+        self.cpi_patcher = patch("ausdex.batch._cpi", self.cpi)
+        self.cpi_patcher.start()
+        self.addCleanup(self.cpi_patcher.stop)
+        self.df = pd.read_csv(io.StringIO(CSV))
+
+    def expected(self, location_column=True):
+        return np.array(
+            [
+                self.cpi.calc_inflation(
+                    row.price, row.sold, evaluation_date=row.valued, location=row.city if location_column else "Australia"
+                )
+                for row in self.df.itertuples()
+            ]
+        )
+
+    def test_adjust_csv(self):
+        output = io.StringIO()
+        rows = adjust_csv(
+            io.StringIO(CSV),
+            output,
+            value_column="price",
+            original_date_column="sold",
+            evaluation_date_column="valued",
+            location_column="city",
+            chunksize=3,
+            cpi=self.cpi,
+        )
+        self.assertEqual(rows, 4)
+        result = pd.read_csv(io.StringIO(output.getvalue()))
+        self.assertEqual(list(result.columns), ["price", "sold", "valued", "city", "adjusted"])
+        np.testing.assert_allclose(result.adjusted, self.expected())
+        self.assertTrue(np.isnan(result.adjusted[3]))
+
+    def test_year_only_dates(self):
+        # The second chunk has a blank date so pandas would read it as floats rather than integers
+        output = io.StringIO()
+        adjust_csv(
+            io.StringIO("price,year\n10,2000\n20,1990\n30,\n40,2005\n"),
+            output,
+            value_column="price",
+            original_date_column="year",
+            evaluation_date="2010",
+            chunksize=2,
+            cpi=self.cpi,
+        )
+        result = pd.read_csv(io.StringIO(output.getvalue()))
+        expected = [self.cpi.calc_inflation(price, str(year), "2010") for price, year in [(10, 2000), (20, 1990)]]
+        np.testing.assert_allclose(result.adjusted[:2], expected)
+        self.assertTrue(np.isnan(result.adjusted[2]))
+        np.testing.assert_allclose(result.adjusted[3], self.cpi.calc_inflation(40, "2005", "2010"))
+
+    def test_adjust_csv_fixed_location(self):
+        output = self.tmp / "output.csv"
+        adjust_csv(
+            io.StringIO(CSV),
+            output,
+            value_column="price",
+            original_date_column="sold",
+            evaluation_date_column="valued",
+            output_column="real_price",
+            chunksize=1,
+            cpi=self.cpi,
+        )
+        result = pd.read_csv(output)
+        self.assertEqual(len(result), 4)
+        np.testing.assert_allclose(result.real_price, self.expected(location_column=False))
+
+    def test_cli(self):
+        input = self.tmp / "input.csv"
+        input.write_text(CSV)
+        result = CliRunner().invoke(
+            main.app,
+            [
+                "adjust-csv",
+                str(input),
+                "--value-column",
+                "price",
+                "--original-date-column",
+                "sold",
+                "--evaluation-date",
+                "2010-06-01",
+                "--location",
+                "sydney",
+            ],
+        )
+        assert result.exit_code == 0
+        output = pd.read_csv(io.StringIO(result.stdout))
+        expected = self.cpi.calc_inflation(self.df.price, self.df.sold, evaluation_date="2010-06-01", location="Sydney")
+        np.testing.assert_allclose(output.adjusted, expected)
+
+    def test_cli_stdin(self):
+        result = CliRunner().invoke(
+            main.app,
+            ["adjust-csv", "--value-column", "price", "--original-date-column", "sold", "--evaluation-date-column", "valued"],
+            input=CSV,
+        )
+        assert result.exit_code == 0
+        output = pd.read_csv(io.StringIO(result.stdout))
+        np.testing.assert_allclose(output.adjusted, self.expected(location_column=False))
@@ -0,0 +1,70 @@
+from unittest.mock import patch
+
+import numpy as np
+
+from ausdex import inflation, blocks
+
+from .synthetic import SyntheticCPITestCase, synthetic_inputs
+
+
+class TestBlocks(SyntheticCPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.cpi = inflation.CPI()
+
+        inputs = synthetic_inputs()
+        self.locations = inputs.pop("locations")
+        for name, array in inputs.items():
+            np.save(self.tmp / f"{name}.npy", array)
+            setattr(self, name, np.load(self.tmp / f"{name}.npy", mmap_mode="r"))
+
+    def test_memmap_output(self):
+        progress = []
+        result = self.cpi.calc_inflation_blocks(
+            self.values,
+            self.dates,
+            evaluation_date=self.evaluation_dates,
+            location=self.locations,
+            out=self.tmp / "adjusted.npy",
+            block_size=300,
+            progress=lambda done, total: progress.append((done, total)),
+        )
+        self.assertIsInstance(result, np.memmap)
+        self.assertEqual(progress, [(300, 1000), (600, 1000), (900, 1000), (1000, 1000)])
+
+        expected = self.cpi.calc_inflation(
+            np.asarray(self.values), np.asarray(self.dates), np.asarray(self.evaluation_dates), location=self.locations
+        )
+        np.testing.assert_array_equal(np.load(self.tmp / "adjusted.npy"), expected)
+
+    def test_blocks_are_bounded(self):
+        with patch.object(blocks, "convert_date", wraps=blocks.convert_date) as convert_date:
+            result = self.cpi.calc_inflation_blocks(
+                self.values, self.dates, "2010-06-01", location="Perth", block_size=64
+            )
+        # The single evaluation date is converted once and the dates are converted one block at a time
+        sizes = [np.size(call.args[0]) for call in convert_date.call_args_list]
+        self.assertEqual(sizes.count(1), 1)
+        self.assertLessEqual(max(sizes), 64)
+
+        expected = self.cpi.calc_inflation(
+            np.asarray(self.values), np.asarray(self.dates), "2010-06-01", location="Perth"
+        )
+        np.testing.assert_array_equal(result, expected)
+
+    def test_output_array(self):
+        out = np.full(len(self.values), -1.0)
+        result = self.cpi.calc_inflation_blocks(self.values, "1990-01-01", "2010-06-01", out=out)
+        self.assertIs(result, out)
+        np.testing.assert_allclose(out, self.values * self.cpi.calc_inflation(1, "1990-01-01", "2010-06-01"))
+
+        with self.assertRaises(ValueError):
+            self.cpi.calc_inflation_blocks(self.values, "1990-01-01", out=np.empty(10))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            self.cpi.calc_inflation_blocks(self.values, self.dates[:10])
+        with self.assertRaises(ValueError):
+            self.cpi.calc_inflation_blocks(self.values, self.dates, block_size=0)
+        with self.assertRaises(ValueError):
+            self.cpi.calc_inflation_blocks(1.0, "1990-01-01")
@@ -1,7 +1,7 @@
 import unittest
 from unittest.mock import patch
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime
 import numpy as np
 import pandas as pd
 import modin.pandas as mpd
@@ -9,7 +9,7 @@ import modin.config as cfg
 
 cfg.IsDebug.put(True)
 
-from ausdex.dates import convert_date, date_time_to_decimal_year
+from ausdex.dates import convert_date, date_time_to_decimal_year, parse_date_string, scalar_to_days
 
 
 class TestDates(unittest.TestCase):
@@ -24,6 +24,22 @@ class TestDates(unittest.TestCase):
     def test_float(self):
         np.testing.assert_equal(convert_date(2006.5), np.array("2006-07-02", dtype="datetime64[D]"))
 
+    def test_float_array(self):
+        np.testing.assert_equal(
+            convert_date(np.array([2006.5, 1996.0, 2000.999, np.nan])),
+            np.array(["2006-07-02", "1996-01-01", "2000-12-31", "NaT"], dtype="datetime64[D]"),
+        )
+
+    def test_float_series(self):
+        np.testing.assert_equal(
+            convert_date(pd.Series([2006.5, 1996.5])),
+            np.array(["2006-07-02", "1996-07-02"], dtype="datetime64[D]"),
+        )
+
+    def test_decimal_year_round_trip(self):
+        dates = np.datetime64("1800-01-01") + np.arange(0, 120_000).astype("timedelta64[D]")
+        np.testing.assert_equal(convert_date(date_time_to_decimal_year(dates)), dates)
+
     def test_datetime(self):
         np.testing.assert_equal(
             convert_date(datetime(2006, 7, 2)),
@@ -58,6 +74,44 @@ class TestDates(unittest.TestCase):
             np.array(["2009-07-31", "2010-01-10", "2006-03-01"], dtype="datetime64[D]"),
         )
 
+    def test_fast_formats(self):
+        strings = ["2006", "2006-05", "2006-05-06", "Mar-2020", "sep-1990", "2020Q1", "2020-q4", "Jul 31, 2009"]
+        np.testing.assert_equal(
+            convert_date(np.array(strings)),
+            np.array(pd.to_datetime(strings), dtype="datetime64[D]"),
+        )
+        self.assertIsNone(parse_date_string("Jul 31, 2009"))
+        self.assertIsNone(parse_date_string("2006-13-01"))
+
+    def test_format(self):
+        dates = pd.Series(["01/02/2003", "03/04/2005", "01/02/2003"])
+        np.testing.assert_equal(
+            convert_date(dates, format="%d/%m/%Y"),
+            np.array(["2003-02-01", "2005-04-03", "2003-02-01"], dtype="datetime64[D]"),
+        )
+
+    def test_duplicates_parsed_once(self):
+        dates = pd.Series(["Jul 31, 2009", None, "Jul 31, 2009", "2010-01-10"] * 1000)
+        with patch("pandas.to_datetime", wraps=pd.to_datetime) as mock_to_datetime:
+            result = convert_date(dates)
+        mock_to_datetime.assert_called_once()
+        self.assertEqual(len(mock_to_datetime.call_args.args[0]), 1)
+        self.assertEqual(result.shape, (4000,))
+        np.testing.assert_equal(
+            result[:4], np.array(["2009-07-31", "NaT", "2009-07-31", "2010-01-10"], dtype="datetime64[D]")
+        )
+
+    def test_scalar_to_days(self):
+        for value in ["2001-03-01", date(2001, 3, 1), datetime(2001, 3, 1, 23, 59), np.datetime64("2001-03-01"), 2001.162]:
+            with self.subTest(date=value):
+                self.assertEqual(scalar_to_days(value), convert_date(value).astype(int))
+        self.assertEqual(scalar_to_days(1970), 0)
+        self.assertIsNone(scalar_to_days(None))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            convert_date("2006-02-30")
+
 
 class TestDateToDecimalYear(unittest.TestCase):
     def test_int(self):
@@ -103,6 +157,12 @@ class TestDateToDecimalYear(unittest.TestCase):
         self.assertAlmostEqual(result[0], 1995.0, 4)
         self.assertEqual(result[1], 1996.5)
 
+    def test_datetime_array_leap_years(self):
+        dates = np.array(["1900-12-31", "2000-12-31", "2001-01-01", "NaT"], dtype="datetime64[D]")
+        result = date_time_to_decimal_year(dates)
+        np.testing.assert_allclose(result[:3], [1900 + 364 / 365, 2000 + 365 / 366, 2001.0])
+        self.assertTrue(np.isnan(result[3]))
+
     def test_str_array(self):
         result = date_time_to_decimal_year(np.array(["1995-01-01", "1996-07-02"]))
         self.assertIsInstance(result, np.ndarray)
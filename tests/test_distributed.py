@@ -0,0 +1,93 @@
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import modin.pandas as mpd
+import modin.config as cfg
+
+from ausdex import inflation, distributed
+
+from .synthetic import SyntheticCPITestCase
+
+cfg.IsDebug.put(True)
+
+try:
+    import dask.dataframe as dd
+except ImportError:
+    dd = None
+
+
+class TestDistributed(SyntheticCPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.cpi = inflation.CPI()
+        self.df = pd.DataFrame(
+            dict(
+                price=[10.0, 20.0, -30.0, 40.0, 50.0, 60.0],
+                sold=pd.to_datetime(["1991-03-01", "1975-06-01", "1999-12-25", "1940-01-01", "2030-01-01", None]),
+                valued=["2010-06-01", "2005-04-05", "2022-05-01", "2010-06-01", "1990-02-28", "2000-01-01"],
+                city=["Sydney", "perth", "Darwin", "Sydney", "CANBERRA", "Hobart"],
+            )
+        )
+
+    def expected(self, location="city", to="valued"):
+        return self.cpi.calc_inflation(
+            self.df.price.to_numpy(),
+            self.df.sold,
+            evaluation_date=self.df[to] if to in self.df else to,
+            location=self.df[location] if location in self.df else location,
+        )
+
+    def test_is_distributed(self):
+        self.assertTrue(distributed.is_distributed(mpd.Series([1.0])))
+        self.assertFalse(distributed.is_distributed(pd.Series([1.0])))
+        self.assertFalse(distributed.is_dask(np.array([1.0])))
+
+    def test_cpi_at_modin(self):
+        df = mpd.DataFrame(self.df)
+        result = self.cpi.cpi_at(df.sold, location=df.city)
+        self.assertIsInstance(result, mpd.Series)
+        np.testing.assert_allclose(result._to_pandas(), self.cpi.cpi_at(self.df.sold, location=self.df.city))
+
+        # Locations which are not recognized give NaN because checking them would need the whole column
+        result = self.cpi.cpi_at(df.sold, location=mpd.Series(["Auckland"] * len(df)))
+        self.assertTrue(result.isna().all())
+
+    def test_cpi_at_modin_strings(self):
+        df = mpd.DataFrame(self.df)
+        result = self.cpi.cpi_at(df.valued, location="Adelaide")
+        np.testing.assert_allclose(result._to_pandas(), self.cpi.cpi_at(self.df.valued, location="Adelaide"))
+
+    def test_calc_inflation_modin(self):
+        df = mpd.DataFrame(self.df)
+        # The values, dates and locations stay in their partitions rather than being collected into arrays
+        with patch.object(mpd.Series, "to_numpy", side_effect=AssertionError("Collected on the driver")):
+            result = self.cpi.calc_inflation(df.price, df.sold, evaluation_date=df.valued, location=df.city)
+        self.assertIsInstance(result, mpd.Series)
+        np.testing.assert_allclose(result._to_pandas(), self.expected())
+
+    def test_calc_inflation_modin_scalars(self):
+        df = mpd.DataFrame(self.df)
+        result = self.cpi.calc_inflation(df.price, df.sold, evaluation_date="2015-01-01", location="Hobart")
+        self.assertIsInstance(result, mpd.Series)
+        np.testing.assert_allclose(result._to_pandas(), self.expected(location="Hobart", to="2015-01-01"))
+
+        # Only the values are distributed
+        result = self.cpi.calc_inflation(df.price, "1990-01-01", evaluation_date="2015-01-01")
+        factor = self.cpi.calc_inflation(1, "1990-01-01", "2015-01-01")
+        np.testing.assert_allclose(result._to_pandas(), self.df.price * factor)
+
+    def test_unsupported(self):
+        df = mpd.DataFrame(self.df)
+        with self.assertRaises(ValueError):
+            self.cpi.cpi_at(mpd.Series([1990.5, 2000.25]))
+        with self.assertRaises(ValueError):
+            self.cpi.cpi_at(df.sold, location=self.df.city.to_numpy())
+
+    @unittest.skipUnless(dd, "dask is not installed")
+    def test_calc_inflation_dask(self):
+        df = dd.from_pandas(self.df, npartitions=2)
+        result = self.cpi.calc_inflation(df.price, df.sold, evaluation_date=df.valued, location=df.city)
+        self.assertIsInstance(result, dd.Series)
+        np.testing.assert_allclose(result.compute(), self.expected())
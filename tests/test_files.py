@@ -1,6 +1,14 @@
 from datetime import datetime, timedelta
-from io import StringIO
+from io import BytesIO, StringIO
+import os
+import json
+import functools
+import http.server
+import tempfile
+import threading
+import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch
 from pathlib import Path
 
@@ -11,26 +19,50 @@ def data_dir():
     return Path(__file__).parent.resolve() / "testdata" / "ausdex"
 
 
-def urlretrieve_fail():
+def fake_response(body: bytes):
+    response = BytesIO(body)
+    response.headers = {}
+    return response
+
+
+def urlopen_fail(url, timeout=None):
     raise Exception("failed download")
 
 
 class TestFiles(unittest.TestCase):
-    @patch("urllib.request.urlretrieve")
-    def test_cached_download_exists(self, mock_urlretrieve):
+    def setUp(self):
+        # The downloads and the failed probes are kept out of the user's real cache
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.patcher = patch.object(files, "get_cached_path", lambda filename: Path(self.cache_dir.name) / filename)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+        self.cache_dir.cleanup()
+
+    @patch("urllib.request.urlopen")
+    def test_cached_download_exists(self, mock_urlopen):
         files.cached_download("http://www.example.com", data_dir() / "download.html")
-        mock_urlretrieve.assert_not_called()
+        mock_urlopen.assert_not_called()
 
-    @patch("urllib.request.urlretrieve")
-    def test_cached_download_empty(self, mock_urlretrieve):
+    @patch("urllib.request.urlopen", return_value=fake_response(b""))
+    def test_cached_download_empty(self, mock_urlopen):
         with self.assertRaises(OSError) as context:
-            files.cached_download("http://www.example.com", data_dir() / "empty.html")
+            files.cached_download("http://www.example.com", Path(self.cache_dir.name) / "empty.html")
+        mock_urlopen.assert_called_once_with("http://www.example.com", timeout=files.DOWNLOAD_TIMEOUT)
 
-    @patch("urllib.request.urlretrieve", urlretrieve_fail)
+    @patch("urllib.request.urlopen", urlopen_fail)
     def test_cached_download_fail(self):
         with self.assertRaises(files.DownloadError) as context:
             files.cached_download("http://www.example.com", data_dir() / "empty.html")
 
+    @patch("urllib.request.urlopen", return_value=fake_response(b"data"))
+    def test_cached_download(self, mock_urlopen):
+        local_path = Path(self.cache_dir.name) / "download.xlsx"
+        files.cached_download("http://www.example.com/download.xlsx", local_path)
+        self.assertEqual(local_path.read_bytes(), b"data")
+        self.assertEqual(list(Path(self.cache_dir.name).glob(".*")), [])
+
     def test_cached_download_abs_excel_by_date(self):
         file = files.cached_download_abs_excel_by_date("640101", datetime(2021, 8, 26))
         self.assertIn("640101-jun-2021.xls", str(file))
@@ -46,4 +78,287 @@ class TestFiles(unittest.TestCase):
 
         with patch("sys.stderr", new=StringIO()) as fake_out:
             files.cached_download_abs_excel_by_date("640101", future)
-            self.assertIn(f"WARNING: CPI data for Quarter", fake_out.getvalue())
+        # The quarters which are not due yet are skipped without a warning
+        for quarter, year in files.previous_quarters(future):
+            if files.release_due(quarter, year) <= datetime.now():
+                break
+            self.assertNotIn(f"Quarter {quarter.title()} {year}", fake_out.getvalue())
+
+
+class ABSHandler(http.server.SimpleHTTPRequestHandler):
+    requests = []
+
+    def do_HEAD(self):
+        self.requests.append(("HEAD", self.path))
+        if self.path.startswith("/slow"):
+            time.sleep(2)
+        if self.path.startswith("/error"):
+            self.send_error(503)
+            return
+        super().do_HEAD()
+
+    def do_GET(self):
+        self.requests.append(("GET", self.path))
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestProbe(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        root = Path(cls.tmpdir.name) / "abs"
+        for online_dir in ["mar-2021", "jun-2021", "mar-quarter-2023"]:
+            extension = "xlsx" if "2023" in online_dir else "xls"
+            (root / online_dir).mkdir(parents=True)
+            (root / online_dir / f"640101.{extension}").write_bytes(b"data")
+
+        handler = functools.partial(ABSHandler, directory=str(root))
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.tmpdir.cleanup()
+
+    def setUp(self):
+        ABSHandler.requests.clear()
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.patchers = [
+            patch.object(files, "ABS_CPI_URL", self.url),
+            patch.object(files, "get_cached_path", lambda filename: Path(self.cache_dir.name) / filename),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+        self.cache_dir.cleanup()
+
+    def test_url_exists(self):
+        self.assertTrue(files.url_exists(f"{self.url}/mar-2021/640101.xls"))
+        self.assertFalse(files.url_exists(f"{self.url}/sep-2021/640101.xls"))
+        self.assertFalse(files.url_exists("http://127.0.0.1:1/640101.xls", timeout=1))
+
+    def test_probe_url(self):
+        self.assertTrue(files.probe_url(f"{self.url}/mar-2021/640101.xls"))
+        self.assertIs(files.probe_url(f"{self.url}/sep-2021/640101.xls"), False)
+        self.assertIsNone(files.probe_url(f"{self.url}/error/640101.xls"))
+        self.assertIsNone(files.probe_url("http://127.0.0.1:1/640101.xls", timeout=1))
+        self.assertIsNone(files.probe_url(f"{self.url}/slow/640101.xls", timeout=0.2))
+
+    def test_url_exists_timeout(self):
+        start = time.perf_counter()
+        self.assertFalse(files.url_exists(f"{self.url}/slow/640101.xls", timeout=0.2))
+        self.assertLess(time.perf_counter() - start, 2)
+
+    def test_previous_quarters(self):
+        quarters = list(files.previous_quarters(datetime(2020, 1, 12)))
+        self.assertEqual(quarters[:3], [("dec", 2019), ("sep", 2019), ("jun", 2019)])
+        self.assertEqual(quarters[-1], ("mar", 1948))
+
+    def test_newest_wins(self):
+        with patch("sys.stderr", new=StringIO()) as fake_out:
+            file = files.cached_download_abs_excel_by_date("640101", datetime(2021, 11, 1))
+        self.assertEqual(file.name, "640101-jun-2021.xls")
+        self.assertEqual(file.read_bytes(), b"data")
+        self.assertIn("WARNING: CPI data for Quarter Sep 2021 not yet available.", fake_out.getvalue())
+        # Only the newest available quarter is downloaded
+        self.assertEqual([path for method, path in ABSHandler.requests if method == "GET"], ["/jun-2021/640101.xls"])
+
+    def test_probes_in_parallel(self):
+        with patch("sys.stderr", new=StringIO()) as fake_out:
+            file = files.cached_download_abs_excel_by_date("640101", datetime(2024, 2, 1))
+        self.assertEqual(file.name, "640101-mar-2023.xlsx")
+        warnings = fake_out.getvalue()
+        for quarter in ["Dec 2023", "Sep 2023", "Jun 2023"]:
+            self.assertIn(f"WARNING: CPI data for Quarter {quarter} not yet available.", warnings)
+        heads = [path for method, path in ABSHandler.requests if method == "HEAD"]
+        self.assertEqual(len(heads), files.PROBE_QUARTERS)
+
+    def test_release_due(self):
+        self.assertEqual(files.release_due("mar", 2023), datetime(2023, 3, 31) + files.RELEASE_LAG)
+        self.assertEqual(files.release_due("dec", "2019"), datetime(2019, 12, 31) + files.RELEASE_LAG)
+
+    def test_failed_probes_cached(self):
+        with patch("sys.stderr", new=StringIO()):
+            file = files.cached_download_abs_excel_by_date("640101", datetime(2021, 11, 1))
+        self.assertEqual(file.name, "640101-jun-2021.xls")
+        self.assertIn(f"{self.url}/sep-2021/640101.xls", files.read_failed_probes())
+
+        # A cold start before the next release is due makes no network requests
+        ABSHandler.requests.clear()
+        with patch("sys.stderr", new=StringIO()) as fake_out:
+            self.assertEqual(files.cached_download_abs_excel_by_date("640101", datetime(2021, 11, 1)), file)
+        self.assertEqual(ABSHandler.requests, [])
+        self.assertEqual(fake_out.getvalue(), "")
+
+    def test_concurrent_cold_start(self):
+        # Only the first caller probes the ABS, the others find its download once they get the lock
+        barrier = threading.Barrier(4)
+
+        def resolve():
+            barrier.wait()
+            return files.cached_download_abs_excel_by_date("640101", datetime(2021, 11, 1))
+
+        with patch("sys.stderr", new=StringIO()), ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda _: resolve(), range(4)))
+        self.assertEqual({file.name for file in results}, {"640101-jun-2021.xls"})
+        heads = [path for method, path in ABSHandler.requests if method == "HEAD"]
+        self.assertEqual(len(heads), files.PROBE_QUARTERS)
+        self.assertEqual([path for method, path in ABSHandler.requests if method == "GET"], ["/jun-2021/640101.xls"])
+
+    def test_unreachable_not_recorded(self):
+        with patch.object(files, "ABS_CPI_URL", "http://127.0.0.1:1"), patch("sys.stderr", new=StringIO()) as fake_out:
+            with patch.object(files, "probe_url", wraps=files.probe_url) as probe_url:
+                self.assertIsNone(files.cached_download_abs_excel_by_date("640101", datetime(2021, 11, 1)))
+        # The search stops at the first quarter which cannot be checked rather than walking back to 1948
+        self.assertLessEqual(probe_url.call_count, files.PROBE_QUARTERS)
+        self.assertIn("WARNING: Cannot check whether CPI data for Quarter Sep 2021 is available.", fake_out.getvalue())
+        self.assertEqual(files.read_failed_probes(), {})
+
+        # Once the ABS is reachable again the quarters are probed as usual
+        with patch("sys.stderr", new=StringIO()):
+            file = files.cached_download_abs_excel_by_date("640101", datetime(2021, 11, 1))
+        self.assertEqual(file.name, "640101-jun-2021.xls")
+
+    def test_unreachable_uses_cached_workbook(self):
+        cached = Path(self.cache_dir.name) / "640101-mar-2021.xls"
+        cached.write_bytes(b"cached")
+        with patch.object(files, "ABS_CPI_URL", "http://127.0.0.1:1"), patch("sys.stderr", new=StringIO()):
+            self.assertEqual(files.cached_download_abs_excel_by_date("640101", datetime(2021, 11, 1)), cached)
+        self.assertEqual(files.read_failed_probes(), {})
+
+    def test_server_errors_not_recorded(self):
+        with patch.object(files, "ABS_CPI_URL", f"{self.url}/error"), patch("sys.stderr", new=StringIO()):
+            self.assertIsNone(files.cached_download_abs_excel_by_date("640101", datetime(2021, 11, 1)))
+        self.assertEqual(files.read_failed_probes(), {})
+
+    def test_failed_probes_expire(self):
+        files.failed_probes_path().write_text(json.dumps({"expired": time.time() - 1, "current": time.time() + 60}))
+        self.assertEqual(list(files.read_failed_probes()), ["current"])
+        files.failed_probes_path().write_text("[corrupt")
+        self.assertEqual(files.read_failed_probes(), {})
+
+    def test_quarters_not_due_are_not_probed(self):
+        future = datetime.now() + timedelta(days=400)
+        with patch("sys.stderr", new=StringIO()) as fake_out:
+            file = files.cached_download_abs_excel_by_date("640101", future)
+        self.assertEqual(file.name, "640101-mar-2023.xlsx")
+        heads = {path for method, path in ABSHandler.requests if method == "HEAD"}
+        for quarter, year in files.previous_quarters(future):
+            if files.release_due(quarter, year) <= datetime.now():
+                break
+            url, _ = files.abs_url_and_path("640101", quarter, year)
+            self.assertNotIn(url[len(self.url) :], heads)
+            self.assertNotIn(f"Quarter {quarter.title()} {year}", fake_out.getvalue())
+
+        ABSHandler.requests.clear()
+        with patch("sys.stderr", new=StringIO()):
+            files.cached_download_abs_excel_by_date("640101", future)
+        self.assertEqual(ABSHandler.requests, [])
+
+    def test_force_ignores_failed_probes(self):
+        with patch("sys.stderr", new=StringIO()):
+            files.cached_download_abs_excel_by_date("640101", datetime(2021, 11, 1))
+            ABSHandler.requests.clear()
+            files.cached_download_abs_excel_by_date("640101", datetime(2021, 11, 1), force=True)
+        self.assertIn(("HEAD", "/sep-2021/640101.xls"), ABSHandler.requests)
+
+    def test_cached_file_not_probed(self):
+        cached = Path(self.cache_dir.name) / "640101-sep-2021.xls"
+        cached.write_bytes(b"cached")
+        file = files.cached_download_abs_excel_by_date("640101", datetime(2021, 11, 1))
+        self.assertEqual(file, cached)
+        self.assertEqual(ABSHandler.requests, [])
+
+
+class TestFreshness(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.root = Path(cls.tmpdir.name)
+        handler = functools.partial(ABSHandler, directory=str(cls.root))
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/640101.xlsx"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.tmpdir.cleanup()
+
+    def setUp(self):
+        ABSHandler.requests.clear()
+        self.remote = self.root / "640101.xlsx"
+        self.remote.write_bytes(b"version 1")
+        os.utime(self.remote, (time.time() - 1000, time.time() - 1000))
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.local_path = Path(self.cache_dir.name) / "640101-jun-2023.xlsx"
+
+    def tearDown(self):
+        self.cache_dir.cleanup()
+
+    def make_stale(self):
+        metadata = files.read_metadata(self.local_path)
+        metadata["checked"] -= 100
+        files.metadata_path(self.local_path).write_text(json.dumps(metadata))
+        ABSHandler.requests.clear()
+
+    def test_metadata(self):
+        files.cached_download(self.url, self.local_path)
+        metadata = files.read_metadata(self.local_path)
+        self.assertEqual(metadata["url"], self.url)
+        self.assertIsNotNone(metadata["last_modified"])
+        self.assertAlmostEqual(metadata["checked"], time.time(), delta=10)
+        self.assertTrue(files.is_fresh(self.local_path, max_age=60))
+
+    def test_read_metadata_corrupt(self):
+        files.metadata_path(self.local_path).write_text("{corrupt")
+        self.assertEqual(files.read_metadata(self.local_path), {})
+
+    def test_fresh_not_revalidated(self):
+        files.cached_download(self.url, self.local_path)
+        ABSHandler.requests.clear()
+        files.cached_download(self.url, self.local_path, max_age=60)
+        self.assertEqual(ABSHandler.requests, [])
+
+    def test_trusted_without_max_age(self):
+        files.cached_download(self.url, self.local_path)
+        self.make_stale()
+        files.cached_download(self.url, self.local_path)
+        self.assertEqual(ABSHandler.requests, [])
+
+    def test_not_modified(self):
+        files.cached_download(self.url, self.local_path)
+        self.make_stale()
+        mtime = self.local_path.stat().st_mtime_ns
+        files.cached_download(self.url, self.local_path, max_age=60)
+        self.assertEqual(ABSHandler.requests, [("GET", "/640101.xlsx")])
+        self.assertEqual(self.local_path.stat().st_mtime_ns, mtime)
+        self.assertTrue(files.is_fresh(self.local_path, max_age=60))
+
+    def test_modified(self):
+        files.cached_download(self.url, self.local_path)
+        self.make_stale()
+        self.remote.write_bytes(b"version 2")
+        self.assertTrue(files.revalidate(self.url, self.local_path))
+        self.assertEqual(self.local_path.read_bytes(), b"version 2")
+        self.assertTrue(files.is_fresh(self.local_path, max_age=60))
+
+    def test_unreachable(self):
+        files.cached_download(self.url, self.local_path)
+        self.make_stale()
+        with patch("sys.stderr", new=StringIO()) as fake_out:
+            files.cached_download("http://127.0.0.1:1/640101.xlsx", self.local_path, max_age=60)
+        self.assertIn("WARNING: Cannot revalidate", fake_out.getvalue())
+        self.assertEqual(self.local_path.read_bytes(), b"version 1")
@@ -1,14 +1,20 @@
 from datetime import datetime, timedelta
+import time
+import threading
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import pandas as pd
 import modin.pandas as mpd
+import tempfile
 from pathlib import Path
 
 from unittest.mock import patch
 
 from ausdex import inflation
 
+from .synthetic import SyntheticCPITestCase, write_synthetic_cpi_workbook
+
 import modin.config as cfg
 
 cfg.IsDebug.put(True)
@@ -106,3 +112,163 @@ def test_latest_cpi_df():
     assert isinstance(df, pd.DataFrame)
     assert len(df) > 290
     assert "Index Numbers ;  All groups CPI ;  Australia ;" in df.columns
+
+
+class TestMixedLocations(SyntheticCPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.cpi = inflation.CPI()
+        self.dates = np.array(["1991-03-01", "1975-06-01", "1999-12-25", "1940-01-01"], dtype="datetime64[D]")
+        self.locations = ["Sydney", "perth", inflation.Location.DARWIN, "Sydney"]
+
+    def expected_cpis(self):
+        return np.array([self.cpi.cpi_at(date, location) for date, location in zip(self.dates, self.locations)])
+
+    def test_cpi_at_list(self):
+        np.testing.assert_array_equal(self.cpi.cpi_at(self.dates, self.locations), self.expected_cpis())
+
+    def test_cpi_at_categorical(self):
+        locations = pd.Series(self.locations, dtype="category")
+        np.testing.assert_array_equal(self.cpi.cpi_at(self.dates, locations), self.expected_cpis())
+
+    def test_cpi_at_scalar_date(self):
+        results = self.cpi.cpi_at("2001-01-01", np.array(["Hobart", "Canberra"]))
+        np.testing.assert_array_equal(results, [self.cpi.cpi_at("2001-01-01", "Hobart"), self.cpi.cpi_at("2001-01-01", "Canberra")])
+
+    def test_cpi_at_missing_location(self):
+        results = self.cpi.cpi_at(self.dates[:2], pd.Series(["Sydney", None]))
+        self.assertEqual(results[0], self.cpi.cpi_at(self.dates[0], "Sydney"))
+        self.assertTrue(np.isnan(results[1]))
+
+    def test_cpi_at_unknown_location(self):
+        with self.assertRaises(ValueError):
+            self.cpi.cpi_at(self.dates[:2], ["Sydney", "Auckland"])
+
+    def test_calc_inflation(self):
+        values = pd.Series([10.0, 20.0, -30.0, 40.0])
+        results = self.cpi.calc_inflation(values, self.dates, evaluation_date="2010-06-01", location=self.locations)
+        self.assertIsInstance(results, pd.Series)
+        expected = [
+            self.cpi.calc_inflation(value, date, evaluation_date="2010-06-01", location=location)
+            for value, date, location in zip(values, self.dates, self.locations)
+        ]
+        np.testing.assert_allclose(results, expected)
+
+
+class TestInflationFactors(SyntheticCPITestCase):
+    def test_inflation_factors(self):
+        cpi = inflation.CPI()
+        factors = cpi.inflation_factors("Perth")
+        self.assertFalse(factors.flags.writeable)
+        self.assertAlmostEqual(
+            factors[100, 20], cpi.calc_inflation(1, cpi.table.dates[20], cpi.table.dates[100], location="Perth")
+        )
+        self.assertEqual(cpi.factor_matrices, {})
+
+    def test_budget(self):
+        matrix_bytes = 300 * 300 * 8
+        cpi = inflation.CPI(factor_matrix_budget=matrix_bytes)
+        self.assertIs(cpi.inflation_factors("Perth"), cpi.inflation_factors("Perth"))
+        self.assertEqual(len(cpi.factor_matrices), 1)
+        cpi.inflation_factors("Sydney")
+        self.assertEqual(len(cpi.factor_matrices), 1)
+
+    def test_calc_inflation(self):
+        cpi = inflation.CPI()
+        cpi_with_factors = inflation.CPI(factor_matrix_budget=10_000_000)
+        values = np.array([30, 52.35, -63, 10])
+        dates = np.array(["1981-06-01", "1940-01-01", "2001-02-03", "NaT"], dtype="datetime64[D]")
+        expected = cpi.calc_inflation(values, dates, evaluation_date="Feb 2011", location="Hobart")
+        results = cpi_with_factors.calc_inflation(values, dates, evaluation_date="Feb 2011", location="Hobart")
+        self.assertEqual(len(cpi_with_factors.factor_matrices), 1)
+        np.testing.assert_allclose(results, expected)
+        self.assertTrue(np.isnan(results[1]))
+        self.assertTrue(np.isnan(results[3]))
+        self.assertAlmostEqual(
+            cpi_with_factors.calc_inflation(13, "March 1991", evaluation_date="June 2010"),
+            cpi.calc_inflation(13, "March 1991", evaluation_date="June 2010"),
+        )
+
+
+class TestTypedData(SyntheticCPITestCase):
+    def test_latest_cpi_df(self):
+        parsed = inflation.read_cpi_workbook(self.workbook)
+        # The second read comes from the snapshot
+        for df in [inflation.CPI().latest_cpi_df, inflation.CPI().latest_cpi_df]:
+            self.assertIsInstance(df.index, pd.DatetimeIndex)
+            self.assertEqual(df["Date"].dtype, np.dtype("datetime64[ns]"))
+            self.assertTrue((df.drop(columns="Date").dtypes == np.dtype(float)).all())
+            pd.testing.assert_frame_equal(df, parsed)
+
+    def test_cpi_series(self):
+        cpi = inflation.CPI()
+        series = cpi.cpi_series("Perth")
+        self.assertEqual(series.dtype, np.dtype(float))
+        self.assertIsInstance(series.index, pd.DatetimeIndex)
+        pd.testing.assert_series_equal(series, cpi.latest_cpi_df[cpi.column_name("Perth")])
+
+        # The series is a copy so that changing it does not change the table
+        series.iloc[0] = -1
+        self.assertNotEqual(cpi.table.column("Perth")[0], -1)
+
+    def test_calc_inflation_timeseries(self):
+        cpi = inflation.CPI()
+        series = cpi.calc_inflation_timeseries("2000-01-01", start_date="1999-03-01", end_date="2001-01-01", value=2)
+        australia = cpi.latest_cpi_df[cpi.column_name("Australia")]
+        expected = 2 * cpi.cpi_at("2000-01-01") / australia["1999-03-01":"2001-01-01"]
+        pd.testing.assert_series_equal(series, expected)
+        self.assertEqual(len(cpi.calc_inflation_timeseries("2000-01-01", location="Perth")), 300)
+
+
+class TestRefresh(SyntheticCPITestCase):
+    def test_refresh(self):
+        cpi = inflation.CPI(max_age=60)
+        self.assertFalse(cpi.refresh())
+        self.assertEqual(len(cpi.table.dates), 300)
+        self.assertFalse(cpi.refresh())
+        self.mock_download.assert_called_with(max_age=60)
+
+        # A revised workbook with another quarter replaces the cached file
+        self.assertEqual(cpi.calc_inflation(1, "2010-01-01", "2050-01-01"), cpi.calc_inflation(1, "2010-01-01", "2049"))
+        write_synthetic_cpi_workbook(self.workbook, quarters=301)
+        self.assertTrue(cpi.refresh())
+        self.assertEqual(len(cpi.table.dates), 301)
+        # The cached CPIs are replaced along with the table
+        self.assertEqual(cpi.table.scalar_cache.cache_info().currsize, 0)
+        self.assertFalse(cpi.refresh())
+
+
+class TestThreadSafety(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.workbook = write_synthetic_cpi_workbook(Path(self.tmpdir.name) / "640101-jun-2023.xlsx")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_single_flight(self):
+        read_cpi_workbook = inflation.read_cpi_workbook
+
+        def slow_read_cpi_workbook(path):
+            time.sleep(0.2)  # Widen the window in which other threads could start parsing too
+            return read_cpi_workbook(path)
+
+        threads = 16
+        barrier = threading.Barrier(threads)
+        cpi = inflation.CPI(factor_matrix_budget=10_000_000)
+
+        def adjust(index):
+            barrier.wait()
+            return cpi.calc_inflation(10 + index, "1991-03-01", evaluation_date="2010-06-01", location="Perth")
+
+        with patch.object(inflation, "cached_download_cpi", return_value=self.workbook) as mock_download:
+            with patch.object(inflation, "read_cpi_workbook", side_effect=slow_read_cpi_workbook) as mock_read:
+                with ThreadPoolExecutor(max_workers=threads) as executor:
+                    results = list(executor.map(adjust, range(threads)))
+
+        self.assertEqual(mock_read.call_count, 1)
+        self.assertEqual(mock_download.call_count, 1)
+        # Single values are looked up in the table's cache of CPIs rather than a matrix of factors
+        self.assertEqual(len(cpi.factor_matrices), 0)
+        factor = results[0] / 10
+        np.testing.assert_allclose(results, [(10 + index) * factor for index in range(threads)])
@@ -0,0 +1,145 @@
+import io
+import os
+import sys
+import subprocess
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from ausdex import files, inflation, instrument
+from ausdex.snapshot import snapshot_path
+
+from .synthetic import SyntheticCPITestCase
+
+
+class TestInstrument(unittest.TestCase):
+    def setUp(self):
+        self.was_enabled = instrument.enabled()
+        instrument.disable()
+        instrument.reset()
+
+    def tearDown(self):
+        if self.was_enabled:
+            instrument.enable()
+        else:
+            instrument.disable()
+        instrument.reset()
+
+    def test_disabled(self):
+        instrument.count("calls")
+        with instrument.timer("block"):
+            pass
+        self.assertIs(instrument.timer("block"), instrument.timer("another block"))
+        self.assertEqual(instrument.stats(), dict(counters={}, timers={}))
+
+    def test_instrumented(self):
+        events = []
+        with instrument.instrumented(sink=lambda *event: events.append(event)) as recorded:
+            instrument.count("calls")
+            instrument.count("calls", 2)
+            with instrument.timer("block"):
+                pass
+            with instrument.timer("block"):
+                pass
+
+        self.assertFalse(instrument.enabled())
+        stats = recorded()
+        self.assertEqual(stats["counters"], {"calls": 3})
+        self.assertEqual(stats["timers"]["block"]["calls"], 2)
+        self.assertGreaterEqual(stats["timers"]["block"]["total"], 0)
+        self.assertEqual([event[:2] for event in events], [("count", "calls")] * 2 + [("time", "block")] * 2)
+
+        # The sink is removed afterwards
+        with instrument.instrumented():
+            instrument.count("calls")
+        self.assertEqual(len(events), 4)
+
+    def test_timed(self):
+        @instrument.timed("double", rows=len)
+        def double(values):
+            return values * 2
+
+        self.assertEqual(double([1]), [1, 1])
+        with instrument.instrumented() as recorded:
+            double([1, 2])
+        self.assertEqual(recorded()["counters"], {"double.rows": 4})
+        self.assertEqual(recorded()["timers"]["double"]["calls"], 1)
+
+    def test_log_sink(self):
+        with self.assertLogs("ausdex.instrument", level="DEBUG") as logs:
+            with instrument.instrumented(sink=instrument.log_sink):
+                instrument.count("calls")
+        self.assertIn("calls +1", logs.output[0])
+
+    def test_report(self):
+        with instrument.instrumented():
+            instrument.count("calls", 2)
+            with instrument.timer("block"):
+                pass
+        output = io.StringIO()
+        instrument.report(output)
+        lines = output.getvalue().splitlines()
+        self.assertEqual(lines[0], "calls: 2")
+        self.assertTrue(lines[1].startswith("block: 1 calls"))
+
+    def test_environment_flag(self):
+        values = [("1", True), ("yes", True), ("log", True), ("0", False), (" False ", False), ("no", False)]
+        for value, expected in values:
+            with self.subTest(value=value), patch.dict(os.environ, {"AUSDEX_TEST_FLAG": value}):
+                self.assertEqual(instrument.environment_flag("AUSDEX_TEST_FLAG"), expected)
+        with patch.dict(os.environ, clear=True):
+            self.assertFalse(instrument.environment_flag("AUSDEX_TEST_FLAG"))
+
+    def test_prefer_bundled_environment_variable(self):
+        code = "from ausdex import inflation; print(inflation._cpi.prefer_bundled)"
+        for value, expected in [("1", "True"), ("0", "False"), ("false", "False")]:
+            environment = dict(os.environ, AUSDEX_PREFER_BUNDLED=value)
+            result = subprocess.run([sys.executable, "-c", code], env=environment, capture_output=True, text=True)
+            self.assertEqual(result.stdout.strip(), expected)
+
+    def test_environment_variable(self):
+        code = "from ausdex.dates import convert_date; convert_date('2000-01-01')"
+        environment = dict(os.environ, AUSDEX_INSTRUMENT="1")
+        result = subprocess.run([sys.executable, "-c", code], env=environment, capture_output=True, text=True)
+        self.assertIn("convert_date.rows: 1", result.stderr)
+
+        environment["AUSDEX_INSTRUMENT"] = "0"
+        result = subprocess.run([sys.executable, "-c", code], env=environment, capture_output=True, text=True)
+        self.assertEqual(result.stderr, "")
+
+        with patch.dict(os.environ, {"AUSDEX_INSTRUMENT": "log"}), patch.object(instrument, "atexit") as atexit:
+            instrument.enable_from_environment()
+        self.assertTrue(instrument.enabled())
+        self.assertIn(instrument.log_sink, instrument._sinks)
+        atexit.register.assert_called_once_with(instrument.report)
+        instrument.remove_sink(instrument.log_sink)
+
+
+class TestInstrumentedCPI(SyntheticCPITestCase):
+    def test_loading_and_lookups(self):
+        with instrument.instrumented() as recorded:
+            cpi = inflation.CPI()
+            cpi.calc_inflation(np.ones(10), np.full(10, np.datetime64("1990-01-01")), "2010-01-01")
+            inflation.CPI().latest_cpi_df
+
+        stats = recorded()
+        self.assertEqual(stats["counters"]["snapshot.misses"], 1)
+        self.assertEqual(stats["counters"]["snapshot.hits"], 1)
+        self.assertEqual(stats["timers"]["parse.workbook"]["calls"], 1)
+        self.assertEqual(stats["counters"]["convert_date.rows"], 11)
+        self.assertEqual(stats["counters"]["lookup.rows"], 11)
+        self.assertTrue(snapshot_path(self.workbook).exists())
+
+    def test_cache_hits_and_misses(self):
+        path = self.tmp / "cached.xlsx"
+        path.write_bytes(b"data")
+        with instrument.instrumented() as recorded:
+            files.cached_download("http://127.0.0.1:9/cached.xlsx", path)
+            with self.assertRaises(files.DownloadError):
+                files.cached_download("http://127.0.0.1:9/missing.xlsx", self.tmp / "missing.xlsx")
+
+        stats = recorded()
+        self.assertEqual(stats["counters"]["download.cache_hits"], 1)
+        self.assertEqual(stats["counters"]["download.cache_misses"], 1)
+        self.assertEqual(stats["timers"]["download"]["calls"], 1)
@@ -0,0 +1,176 @@
+import os
+import json
+import time
+import socket
+import functools
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+import http.server
+import multiprocessing
+from pathlib import Path
+from unittest.mock import patch
+
+from ausdex import files, lock
+
+
+def increment(path: str, lock_timeout: float):
+    path = Path(path)
+    with lock.file_lock(path, timeout=lock_timeout):
+        count = int(path.read_text())
+        time.sleep(0.01)
+        path.write_text(str(count + 1))
+
+
+def download(url: str, path: str):
+    files.cached_download(url, path)
+    return Path(path).read_bytes()
+
+
+class CountingHandler(http.server.SimpleHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(self.path)
+        time.sleep(0.2)  # Keep the download in progress while the other processes arrive
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestLock(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name) / "640101-jun-2023.xlsx"
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write_lock(self, **holder):
+        lock.lock_path(self.path).write_text(json.dumps(holder))
+
+    def test_lock_path(self):
+        self.assertEqual(lock.lock_path(self.path).name, "640101-jun-2023.xlsx.lock")
+
+    def test_acquire_release(self):
+        with lock.file_lock(self.path) as lock_path:
+            self.assertEqual(lock_path, lock.lock_path(self.path))
+            holder = json.loads(lock_path.read_text())
+            self.assertEqual(holder["pid"], os.getpid())
+            self.assertEqual(holder["host"], socket.gethostname())
+        self.assertFalse(lock_path.exists())
+
+    def test_released_after_exception(self):
+        with self.assertRaises(ValueError):
+            with lock.file_lock(self.path):
+                raise ValueError()
+        self.assertFalse(lock.lock_path(self.path).exists())
+
+    def test_timeout(self):
+        with lock.file_lock(self.path):
+            start = time.monotonic()
+            with self.assertRaises(lock.LockTimeoutError):
+                with lock.file_lock(self.path, timeout=0.2):
+                    pass
+            self.assertLess(time.monotonic() - start, 2)
+
+    def test_waits_for_release(self):
+        acquired = threading.Event()
+
+        def hold():
+            with lock.file_lock(self.path):
+                acquired.set()
+                time.sleep(0.2)
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        acquired.wait()
+        start = time.monotonic()
+        with lock.file_lock(self.path, timeout=5):
+            self.assertGreater(time.monotonic() - start, 0.05)
+        thread.join()
+
+    def test_stale_dead_process(self):
+        process = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True)
+        self.write_lock(pid=int(process.stdout), host=socket.gethostname(), created=time.time())
+        with lock.file_lock(self.path, timeout=0.5):
+            pass
+
+    def test_stale_old(self):
+        self.write_lock(pid=1, host="another-host", created=time.time() - 100)
+        with lock.file_lock(self.path, timeout=0.5, stale_after=10):
+            pass
+
+    def test_not_stale_on_another_host(self):
+        self.write_lock(pid=1, host="another-host", created=time.time())
+        with self.assertRaises(lock.LockTimeoutError):
+            with lock.file_lock(self.path, timeout=0.2):
+                pass
+
+    def test_stale_empty_lock_file(self):
+        lock_path = lock.lock_path(self.path)
+        lock_path.touch()
+        with self.assertRaises(lock.LockTimeoutError):
+            with lock.file_lock(self.path, timeout=0.2, stale_after=10):
+                pass
+
+        os.utime(lock_path, (time.time() - 100, time.time() - 100))
+        with lock.file_lock(self.path, timeout=0.5, stale_after=10):
+            pass
+
+    def test_taken_over_lock_not_removed(self):
+        with lock.file_lock(self.path) as lock_path:
+            lock_path.write_text("another holder")
+        self.assertEqual(lock_path.read_text(), "another holder")
+
+    def test_optional_file_lock(self):
+        ran = False
+        with patch.object(lock, "file_lock", side_effect=PermissionError):
+            with lock.optional_file_lock(self.path):
+                ran = True
+        self.assertTrue(ran)
+
+    def test_processes(self):
+        self.path.write_text("0")
+        context = multiprocessing.get_context("spawn")
+        processes = [context.Process(target=increment, args=(str(self.path), 60)) for _ in range(8)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        self.assertEqual(self.path.read_text(), "8")
+        self.assertFalse(lock.lock_path(self.path).exists())
+
+
+class TestDownloadLock(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        root = Path(self.tmpdir.name) / "abs"
+        root.mkdir()
+        self.content = os.urandom(1 << 20)
+        (root / "640101.xlsx").write_bytes(self.content)
+        CountingHandler.requests = []
+        handler = functools.partial(CountingHandler, directory=str(root))
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/640101.xlsx"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmpdir.cleanup()
+
+    def test_single_download(self):
+        path = Path(self.tmpdir.name) / "cache" / "640101-jun-2023.xlsx"
+        path.parent.mkdir()
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(8) as pool:
+            results = pool.starmap(download, [(self.url, str(path))] * 8)
+
+        self.assertEqual(CountingHandler.requests, ["/640101.xlsx"])
+        self.assertTrue(all(result == self.content for result in results))
+        self.assertEqual(sorted(path.name for path in path.parent.iterdir()), [path.name, f"{path.name}.meta.json"])
@@ -1,14 +1,45 @@
 from pathlib import Path
 import unittest
 import re
+import subprocess
+import sys
 from unittest.mock import patch
 
 from typer.testing import CliRunner
 from plotly.graph_objects import Figure
 from tempfile import NamedTemporaryFile
+import ausdex
 from ausdex import main
 
 
+def imported_modules(statement: str):
+    """Returns the top-level modules which are imported in a fresh interpreter after running a statement."""
+    code = f"import sys; {statement}; print(' '.join(sorted(set(name.split('.')[0] for name in sys.modules))))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+
+class TestImports(unittest.TestCase):
+    def test_main_imports(self):
+        modules = imported_modules("import ausdex.main")
+        for heavy_module in ["plotly", "kaleido", "modin", "pandas"]:
+            self.assertNotIn(heavy_module, modules)
+
+    def test_inflation_imports(self):
+        modules = imported_modules("from ausdex import calc_inflation")
+        self.assertIn("pandas", modules)
+        for heavy_module in ["plotly", "kaleido", "modin"]:
+            self.assertNotIn(heavy_module, modules)
+
+
+    def test_lazy_submodules(self):
+        modules = imported_modules("import ausdex; ausdex.files.cached_download_cpi; ausdex.inflation.CPI")
+        self.assertIn("pandas", modules)
+        self.assertNotIn("pandas", imported_modules("import ausdex"))
+        with self.assertRaises(AttributeError):
+            ausdex.missing_module
+
+
 class TestMain(unittest.TestCase):
     def setUp(self):
         self.runner = CliRunner()
@@ -0,0 +1,91 @@
+import os
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from ausdex import inflation, parallel
+
+from .synthetic import SyntheticCPITestCase, synthetic_inputs
+
+
+def shared_memory_blocks():
+    return set(os.listdir("/dev/shm")) if os.path.isdir("/dev/shm") else set()
+
+
+@patch.object(parallel, "PARALLEL_MIN_ROWS", 100)
+class TestParallel(SyntheticCPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.cpi = inflation.CPI()
+
+        for name, array in synthetic_inputs().items():
+            setattr(self, name, array)
+
+    def test_resolve_n_jobs(self):
+        self.assertEqual(parallel.resolve_n_jobs(None), 1)
+        self.assertEqual(parallel.resolve_n_jobs(3), 3)
+        self.assertEqual(parallel.resolve_n_jobs(-1), os.cpu_count())
+        self.assertEqual(parallel.resolve_n_jobs(-1000), 1)
+
+    def test_matches_single_process(self):
+        blocks = shared_memory_blocks()
+        expected = self.cpi.calc_inflation(
+            self.values, self.dates, evaluation_date=self.evaluation_dates, location=self.locations
+        )
+        result = self.cpi.calc_inflation(
+            self.values, self.dates, evaluation_date=self.evaluation_dates, location=self.locations, n_jobs=2
+        )
+        np.testing.assert_array_equal(result, expected)
+        self.assertTrue(np.isnan(result[::97]).all())
+        # The shared memory is released afterwards
+        self.assertEqual(shared_memory_blocks(), blocks)
+
+    def test_scalars(self):
+        expected = self.cpi.calc_inflation(self.values, self.dates, evaluation_date="2010-06-01", location="Perth")
+        result = self.cpi.calc_inflation(
+            self.values, self.dates, evaluation_date="2010-06-01", location="Perth", n_jobs=3
+        )
+        np.testing.assert_array_equal(result, expected)
+
+        expected = self.cpi.calc_inflation(26, self.dates, evaluation_date=self.evaluation_dates)
+        result = self.cpi.calc_inflation(26, self.dates, evaluation_date=self.evaluation_dates, n_jobs=2)
+        np.testing.assert_array_equal(result, expected)
+
+    def test_series(self):
+        series = pd.Series(self.values, index=np.arange(len(self.values)) * 2, name="price")
+        result = self.cpi.calc_inflation(series, self.dates, evaluation_date="2010-06-01", n_jobs=2)
+        self.assertIsInstance(result, pd.Series)
+        self.assertEqual(result.name, "price")
+        pd.testing.assert_index_equal(result.index, series.index)
+        np.testing.assert_array_equal(result, self.cpi.calc_inflation(series, self.dates, evaluation_date="2010-06-01"))
+
+    def test_dates_converted_by_workers(self):
+        strings = np.datetime_as_string(self.dates).astype(object)
+        strings[::97] = None
+        series = pd.Series(self.evaluation_dates.astype("datetime64[ns]"))
+        expected = self.cpi.calc_inflation(self.values, strings, evaluation_date=series, location=self.locations)
+        with patch.object(parallel, "convert_date", wraps=parallel.convert_date) as convert_date:
+            result = self.cpi.calc_inflation(
+                self.values, list(strings), evaluation_date=series, location=self.locations, n_jobs=2
+            )
+        # The arrays of dates are parsed in the workers rather than in this process
+        convert_date.assert_not_called()
+        np.testing.assert_array_equal(result, expected)
+
+        formatted = pd.to_datetime(self.evaluation_dates).strftime("%d/%m/%Y").to_numpy()
+        expected = self.cpi.calc_inflation(self.values, "01/03/1991", formatted, date_format="%d/%m/%Y")
+        result = self.cpi.calc_inflation(self.values, "01/03/1991", formatted, date_format="%d/%m/%Y", n_jobs=2)
+        np.testing.assert_array_equal(result, expected)
+
+    def test_small_arrays_in_process(self):
+        with patch.object(parallel, "ProcessPoolExecutor") as executor:
+            result = self.cpi.calc_inflation(self.values[:10], self.dates[:10], evaluation_date="2010-06-01", n_jobs=4)
+        executor.assert_not_called()
+        np.testing.assert_array_equal(
+            result, self.cpi.calc_inflation(self.values[:10], self.dates[:10], evaluation_date="2010-06-01")
+        )
+
+    def test_mismatched_sizes(self):
+        with self.assertRaises(ValueError):
+            self.cpi.calc_inflation(self.values, self.dates[:500], evaluation_date="2010-06-01", n_jobs=2)
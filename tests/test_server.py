@@ -0,0 +1,194 @@
+import io
+import json
+import time
+import asyncio
+import threading
+import unittest
+import http.client
+from unittest.mock import patch
+
+import numpy as np
+
+from ausdex import inflation
+from ausdex.files import DownloadError
+from ausdex.server import CPIService, start_server
+
+from .synthetic import SyntheticCPITestCase, use_synthetic_cpi, write_synthetic_cpi_workbook
+
+
+class TestServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        use_synthetic_cpi(cls.addClassCleanup)
+        cls.cpi = inflation.CPI()
+
+        cls.loop = asyncio.new_event_loop()
+        cls.server = cls.loop.run_until_complete(start_server(port=0, cpi=cls.cpi))
+        cls.port = cls.server.sockets[0].getsockname()[1]
+        cls.thread = threading.Thread(target=cls.loop.run_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        async def close():
+            cls.server.close()
+            await cls.server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(close(), cls.loop).result()
+        cls.loop.call_soon_threadsafe(cls.loop.stop)
+        cls.thread.join()
+        cls.loop.close()
+
+    def request(self, method, target, body=None, content_type="application/json"):
+        connection = http.client.HTTPConnection("127.0.0.1", self.port, timeout=10)
+        try:
+            connection.request(method, target, body=body, headers={"Content-Type": content_type})
+            response = connection.getresponse()
+            return response.status, response.read().decode()
+        finally:
+            connection.close()
+
+    def test_health(self):
+        status, body = self.request("GET", "/health")
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body), {"status": "ok"})
+
+    def test_inflation(self):
+        status, body = self.request(
+            "GET", "/inflation?value=13&original_date=1991-03-01&evaluation_date=2010-06-01&location=sydney"
+        )
+        self.assertEqual(status, 200)
+        expected = self.cpi.calc_inflation(13, "1991-03-01", evaluation_date="2010-06-01", location="Sydney")
+        self.assertAlmostEqual(json.loads(body)["value"], expected)
+
+    def test_cpi(self):
+        status, body = self.request("GET", "/cpi?date=1975-06-01&location=Perth")
+        self.assertEqual(status, 200)
+        self.assertAlmostEqual(json.loads(body)["cpi"], self.cpi.cpi_at("1975-06-01", "Perth"))
+
+        status, body = self.request("GET", "/cpi?date=1900")
+        self.assertEqual(status, 200)
+        self.assertIsNone(json.loads(body)["cpi"])
+
+    def test_timeseries(self):
+        status, body = self.request(
+            "GET", "/timeseries?compare_date=2000-01-01&start_date=1999-01-01&end_date=2001-01-01"
+        )
+        self.assertEqual(status, 200)
+        result = json.loads(body)
+        expected = self.cpi.calc_inflation_timeseries("2000-01-01", start_date="1999-01-01", end_date="2001-01-01")
+        self.assertEqual(len(result["dates"]), len(expected))
+        np.testing.assert_allclose(result["values"], expected.to_numpy(dtype=float))
+
+    def test_batch_json(self):
+        body = json.dumps(
+            dict(
+                value=[10, 20, 30],
+                original_date=["1991-03-01", "1975-06-01", "1940-01-01"],
+                evaluation_date="2010-06-01",
+                location=["Sydney", "Perth", "Darwin"],
+            )
+        )
+        status, response = self.request("POST", "/inflation", body)
+        self.assertEqual(status, 200)
+        values = json.loads(response)["value"]
+        self.assertAlmostEqual(
+            values[0], self.cpi.calc_inflation(10, "1991-03-01", evaluation_date="2010-06-01", location="Sydney")
+        )
+        self.assertAlmostEqual(
+            values[1], self.cpi.calc_inflation(20, "1975-06-01", evaluation_date="2010-06-01", location="Perth")
+        )
+        self.assertIsNone(values[2])
+
+    def test_batch_ndjson(self):
+        records = [
+            dict(date="1991-03-01", location="Sydney"),
+            dict(date="2005-04-05", location="Hobart"),
+        ]
+        body = "\n".join(json.dumps(record) for record in records)
+        status, response = self.request("POST", "/cpi", body, content_type="application/x-ndjson")
+        self.assertEqual(status, 200)
+        lines = [json.loads(line) for line in response.splitlines()]
+        self.assertEqual(len(lines), 2)
+        for line, record in zip(lines, records):
+            self.assertAlmostEqual(line["cpi"], self.cpi.cpi_at(record["date"], record["location"]))
+
+    def test_batch_ndjson_defaults(self):
+        # The fields which a record leaves out get the defaults of the endpoint
+        records = [
+            dict(value=10, original_date="1991-03-01", evaluation_date="2010-06-01", location="Perth"),
+            dict(value=10, original_date="1991-03-01"),
+        ]
+        body = "\n".join(json.dumps(record) for record in records)
+        status, response = self.request("POST", "/inflation", body, content_type="application/x-ndjson")
+        self.assertEqual(status, 200)
+        lines = [json.loads(line) for line in response.splitlines()]
+        self.assertAlmostEqual(lines[0]["value"], self.cpi.calc_inflation(10, "1991-03-01", "2010-06-01", "Perth"))
+        self.assertAlmostEqual(lines[1]["value"], self.cpi.calc_inflation(10, "1991-03-01"))
+
+    def test_errors(self):
+        self.assertEqual(self.request("GET", "/unknown")[0], 404)
+        self.assertEqual(self.request("GET", "/inflation?value=10")[0], 400)
+        self.assertEqual(self.request("GET", "/cpi?date=2000&colour=blue")[0], 400)
+        self.assertEqual(self.request("GET", "/cpi?date=2000&location=Auckland")[0], 400)
+        self.assertEqual(self.request("POST", "/cpi", "{not json")[0], 400)
+        self.assertEqual(self.request("POST", "/timeseries", "{}")[0], 405)
+
+    def test_internal_error(self):
+        connection = http.client.HTTPConnection("127.0.0.1", self.port, timeout=10)
+        try:
+            with patch.object(self.cpi, "cpi_at", side_effect=DownloadError("Cannot download")), patch(
+                "sys.stderr", new=io.StringIO()
+            ):
+                connection.request("GET", "/cpi?date=2000")
+                response = connection.getresponse()
+                self.assertEqual(response.status, 500)
+                self.assertEqual(json.loads(response.read()), {"error": "DownloadError: Cannot download"})
+
+            # The connection is kept open for the next request
+            connection.request("GET", "/health")
+            self.assertEqual(connection.getresponse().status, 200)
+        finally:
+            connection.close()
+
+
+class TestRefresh(SyntheticCPITestCase):
+    def test_refresh_in_background(self):
+        cpi = inflation.CPI(max_age=60)
+        service = CPIService(cpi)
+        service.warm()
+        self.assertIsNone(service.reload())
+
+        read_cpi_workbook = inflation.read_cpi_workbook
+        reloading = threading.Event()
+
+        def slow_read_cpi_workbook(path):
+            reloading.set()
+            time.sleep(0.5)
+            return read_cpi_workbook(path)
+
+        async def run():
+            task = asyncio.ensure_future(service.refresh_periodically(0.01))
+            try:
+                while not reloading.is_set():
+                    await asyncio.sleep(0.01)
+
+                # The event loop keeps answering with the current data while the new data is parsed
+                start = time.perf_counter()
+                await asyncio.sleep(0.01)
+                self.assertLess(time.perf_counter() - start, 0.25)
+                self.assertIs(service.cpi, cpi)
+                self.assertEqual(service.inflation(1, "2000-01-01", "2000-01-01")["value"], 1.0)
+
+                while service.cpi is cpi:
+                    await asyncio.sleep(0.01)
+            finally:
+                task.cancel()
+
+        write_synthetic_cpi_workbook(self.workbook, quarters=301)
+        with patch.object(inflation, "read_cpi_workbook", side_effect=slow_read_cpi_workbook):
+            asyncio.run(asyncio.wait_for(run(), timeout=10))
+
+        # The new data is swapped in once it is loaded
+        self.assertEqual(len(service.cpi.table.dates), 301)
+        self.assertEqual(len(cpi.table.dates), 300)
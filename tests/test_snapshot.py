@@ -0,0 +1,167 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+from typer.testing import CliRunner
+
+from ausdex import files, inflation, main, snapshot
+from ausdex.location import Location
+
+from .synthetic import write_synthetic_cpi_workbook
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.workbook = write_synthetic_cpi_workbook(Path(self.tmpdir.name) / "640101-jun-2023.xlsx")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_snapshot_path(self):
+        self.assertEqual(snapshot.snapshot_path(self.workbook).name, "640101-jun-2023.snapshot.npz")
+
+    def test_round_trip(self):
+        df = inflation.read_cpi_workbook(self.workbook)
+        snapshot.write_snapshot(df, self.workbook)
+        pd.testing.assert_frame_equal(snapshot.read_snapshot(self.workbook), df)
+
+    def test_missing(self):
+        self.assertIsNone(snapshot.read_snapshot(self.workbook))
+
+    def test_stale(self):
+        df = inflation.read_cpi_workbook(self.workbook)
+        snapshot.write_snapshot(df, self.workbook)
+        stat = self.workbook.stat()
+        os.utime(self.workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertIsNone(snapshot.read_snapshot(self.workbook))
+
+    def test_corrupt(self):
+        snapshot.snapshot_path(self.workbook).write_bytes(b"not a snapshot")
+        self.assertIsNone(snapshot.read_snapshot(self.workbook))
+
+    def test_latest_cpi_df_skips_excel(self):
+        with patch.object(inflation, "cached_download_cpi", return_value=self.workbook):
+            df = inflation.CPI().latest_cpi_df
+            self.assertTrue(snapshot.snapshot_path(self.workbook).exists())
+
+            with patch.object(pd, "ExcelFile") as mock_excel_file:
+                pd.testing.assert_frame_equal(inflation.CPI().latest_cpi_df, df)
+                mock_excel_file.assert_not_called()
+
+    def test_latest_cpi_df_rebuilds_corrupt(self):
+        snapshot.snapshot_path(self.workbook).write_bytes(b"not a snapshot")
+        with patch.object(inflation, "cached_download_cpi", return_value=self.workbook):
+            df = inflation.CPI().latest_cpi_df
+        pd.testing.assert_frame_equal(snapshot.read_snapshot(self.workbook), df)
+
+
+class TestBundledSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        bundled_dir = Path(self.tmpdir.name) / "bundled"
+        self.bundled_workbook = write_synthetic_cpi_workbook(bundled_dir / "640101-jun-2023.xlsx")
+        self.bundled = Path(self.tmpdir.name) / "data" / "640101.snapshot.npz"
+        self.bundled.parent.mkdir()
+        self.df = inflation.read_cpi_workbook(self.bundled_workbook)
+        snapshot.write_snapshot(self.df, self.bundled_workbook, path=self.bundled)
+
+        self.patchers = [
+            patch.object(snapshot, "BUNDLED_SNAPSHOT", self.bundled),
+            patch.object(inflation, "BUNDLED_SNAPSHOT", self.bundled),
+            patch.object(inflation, "latest_cached_workbook", return_value=None),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+        self.tmpdir.cleanup()
+
+    def test_bundled_snapshot_date(self):
+        self.assertEqual(snapshot.bundled_snapshot_date(), datetime(2023, 6, 1))
+        pd.testing.assert_frame_equal(snapshot.read_bundled_snapshot(), self.df)
+
+    def test_no_bundled_snapshot(self):
+        with patch.object(snapshot, "BUNDLED_SNAPSHOT", Path(self.tmpdir.name) / "missing.npz"):
+            self.assertIsNone(snapshot.bundled_snapshot_date())
+            self.assertIsNone(snapshot.read_bundled_snapshot())
+
+    def test_prefer_bundled(self):
+        with patch.object(inflation, "cached_download_cpi") as mock_download:
+            with patch.object(pd, "ExcelFile") as mock_excel:
+                cpi = inflation.CPI(prefer_bundled=True)
+                pd.testing.assert_frame_equal(cpi.latest_cpi_df, self.df)
+                expected = self.df.loc[self.df["Date"] == datetime(1991, 3, 1), cpi.column_name("Perth")].item()
+                self.assertEqual(cpi.cpi_at("1991-03-01", "Perth"), expected)
+        mock_download.assert_not_called()
+        mock_excel.assert_not_called()
+
+    def test_download_fails(self):
+        with patch.object(inflation, "cached_download_cpi", return_value=None):
+            with patch("sys.stderr", new=StringIO()) as fake_out:
+                cpi = inflation.CPI(memory_map=True)
+                pd.testing.assert_frame_equal(cpi.latest_cpi_df, self.df)
+                self.assertEqual(len(cpi.table.dates), 300)
+        self.assertIn("Using the data bundled up to Jun 2023", fake_out.getvalue())
+
+    def test_newer_cached_workbook(self):
+        workbook = write_synthetic_cpi_workbook(Path(self.tmpdir.name) / "640101-sep-2023.xlsx", quarters=301)
+        with patch.object(inflation, "latest_cached_workbook", return_value=workbook):
+            self.assertEqual(len(inflation.CPI(prefer_bundled=True).table.dates), 301)
+        with patch.object(inflation, "cached_download_cpi", return_value=workbook):
+            self.assertEqual(len(inflation.CPI().table.dates), 301)
+
+    def test_older_cached_workbook(self):
+        workbook = write_synthetic_cpi_workbook(Path(self.tmpdir.name) / "640101-mar-2023.xlsx", quarters=299)
+        with patch.object(inflation, "latest_cached_workbook", return_value=workbook):
+            self.assertEqual(len(inflation.CPI(prefer_bundled=True).table.dates), 300)
+        with patch.object(inflation, "cached_download_cpi", return_value=workbook):
+            self.assertEqual(len(inflation.CPI().table.dates), 300)
+
+    def test_nothing_available(self):
+        with patch.object(snapshot, "BUNDLED_SNAPSHOT", Path(self.tmpdir.name) / "missing.npz"):
+            with patch.object(inflation, "cached_download_cpi", side_effect=files.DownloadError):
+                with self.assertRaises(files.DownloadError):
+                    inflation.CPI().latest_cpi_df
+
+    def test_cli(self):
+        result = CliRunner().invoke(main.app, ["bundle-snapshot", str(self.bundled_workbook)])
+        assert result.exit_code == 0
+        self.assertIn("Wrote the CPI data", result.stdout)
+        pd.testing.assert_frame_equal(snapshot.read_bundled_snapshot(), self.df)
+
+
+@unittest.skipUnless(
+    snapshot.BUNDLED_SNAPSHOT.exists(), "The bundled CPI data is built with `ausdex bundle-snapshot` before a release"
+)
+class TestShippedSnapshot(unittest.TestCase):
+    """Checks the snapshot which is actually shipped in ausdex/data rather than a temporary one."""
+
+    def test_bundled_data(self):
+        df = snapshot.read_bundled_snapshot()
+        self.assertIsNotNone(df, f"Cannot read {snapshot.BUNDLED_SNAPSHOT}")
+        self.assertGreater(len(df), 290)
+        self.assertEqual(df.index[0], datetime(1948, 9, 1))
+        self.assertEqual(df.index[-1], snapshot.bundled_snapshot_date())
+        self.assertTrue((df.drop(columns="Date").dtypes == np.dtype(float)).all())
+
+    def test_offline(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        with patch.object(files, "get_cached_path", lambda filename: Path(cache_dir.name) / filename):
+            with patch.object(inflation, "cached_download_cpi", side_effect=files.DownloadError), patch(
+                "sys.stderr", new=StringIO()
+            ):
+                cpi = inflation.CPI()
+                self.assertEqual(cpi.workbook_path(), snapshot.BUNDLED_SNAPSHOT)
+                self.assertEqual(cpi.table.values.shape[1], len(Location))
+                self.assertFalse(np.isnan(cpi.table.column("Australia")).any())
+                self.assertAlmostEqual(cpi.calc_inflation(1, "1990-01-01", "1990-01-01"), 1.0)
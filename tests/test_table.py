@@ -0,0 +1,158 @@
+from datetime import date, datetime, timezone
+from unittest.mock import patch
+
+import numpy as np
+
+from ausdex import inflation, table as table_module
+from ausdex.location import Location
+from ausdex.table import CPITable, location_index, table_paths
+
+from .synthetic import SyntheticCPITestCase
+
+
+class TestTable(SyntheticCPITestCase):
+    def test_location_index(self):
+        self.assertEqual(location_index(Location.AUSTRALIA), 0)
+        self.assertEqual(location_index("perth"), list(Location).index(Location.PERTH))
+        with self.assertRaises(ValueError):
+            location_index("Auckland")
+
+    def test_build_table(self):
+        cpi = inflation.CPI()
+        table = cpi.table
+        self.assertEqual(table.dates.dtype, np.dtype("datetime64[D]"))
+        self.assertEqual(table.values.dtype, np.dtype(float))
+        self.assertEqual(table.values.shape, (300, len(Location)))
+        self.assertTrue(table.column("Sydney").flags.c_contiguous)
+        np.testing.assert_array_equal(table.column("Sydney"), np.array(cpi.cpi_series("Sydney"), dtype=float))
+
+    def test_save_load(self):
+        table = inflation.CPI().table
+        table.save(self.workbook)
+        loaded = CPITable.load(self.workbook)
+        self.assertIsInstance(loaded.values, np.memmap)
+        self.assertFalse(loaded.values.flags.writeable)
+        np.testing.assert_array_equal(loaded.dates, table.dates)
+        np.testing.assert_array_equal(loaded.values, table.values)
+        np.testing.assert_array_equal(loaded.day_rows, table.day_rows)
+
+    def test_load_without_reading_workbook(self):
+        inflation.CPI().table.save(self.workbook)
+        with patch("hashlib.sha256", side_effect=AssertionError("The workbook should not be hashed")):
+            loaded = CPITable.load(self.workbook)
+        self.assertIsInstance(loaded.day_rows, np.memmap)
+
+        # A workbook which has changed (or been replaced) is detected by its size and modification time
+        self.workbook.write_bytes(self.workbook.read_bytes() + b"\0")
+        self.assertIsNone(CPITable.load(self.workbook))
+
+    def test_load_missing(self):
+        self.assertIsNone(CPITable.load(self.workbook))
+
+    def test_load_corrupt(self):
+        inflation.CPI().table.save(self.workbook)
+        table_paths(self.workbook)["values"].write_bytes(b"corrupt")
+        self.assertIsNone(CPITable.load(self.workbook))
+
+    def test_memory_map(self):
+        cpi = inflation.CPI(memory_map=True)
+        self.assertIsInstance(cpi.table.values, np.memmap)
+        self.assertTrue(table_paths(self.workbook)["metadata"].exists())
+
+        dates = np.array(["1948-08-31", "1991-03-01", "2030-01-01"], dtype="datetime64[D]")
+        np.testing.assert_array_equal(cpi.cpi_at(dates, "Perth"), inflation.CPI().cpi_at(dates, "Perth"))
+        self.assertTrue(np.isnan(cpi.cpi_at("1900")))
+
+    def test_lookup(self):
+        table = inflation.CPI().table
+        column = list(Location).index(Location.HOBART)
+        dates = np.array(
+            ["1948-08-31", "1948-09-01", "1948-11-30", "1948-12-01", "2023-06-01", "2099-01-01", "NaT"],
+            dtype="datetime64[D]",
+        )
+        hobart = table.column("Hobart")
+        np.testing.assert_array_equal(
+            table.lookup(dates, column),
+            [np.nan, hobart[0], hobart[0], hobart[1], hobart[-1], hobart[-1], np.nan],
+        )
+        self.assertEqual(table.lookup(np.datetime64("1948-12-25"), column).item(), hobart[1])
+
+    def test_lookup_matches_search(self):
+        table = inflation.CPI().table
+        days = np.random.default_rng(42).integers(-9000, 30000, 1000)
+        dates = np.datetime64("1970-01-01") + days.astype("timedelta64[D]")
+        rows = np.searchsorted(table.dates, dates, side="right") - 1
+        expected = np.where(rows >= 0, table.column("Perth")[rows], np.nan)
+        np.testing.assert_array_equal(table.lookup(dates, list(Location).index(Location.PERTH)), expected)
+
+    def test_factor_matrix(self):
+        table = inflation.CPI().table
+        matrix = table.factor_matrix(list(Location).index(Location.DARWIN))
+        darwin = table.column("Darwin")
+        self.assertEqual(matrix.shape, (300, 300))
+        self.assertEqual(matrix[10, 3], darwin[10] / darwin[3])
+        np.testing.assert_array_equal(np.diag(matrix), np.ones(300))
+
+    def test_scalar(self):
+        cpi = inflation.CPI()
+        table = cpi.table
+        dates = [
+            "1948-08-31",
+            "1991-03-01",
+            "2099-01-01",
+            1990,
+            1990.5,
+            date(2001, 3, 1),
+            datetime(2001, 3, 1, 12),
+            np.datetime64("2010-06-30"),
+        ]
+        for value in dates:
+            with self.subTest(date=value):
+                expected = table.lookup(inflation.convert_date(value), location_index("Perth")).item()
+                np.testing.assert_array_equal(table.scalar(value, "Perth"), expected)
+        self.assertEqual(table.scalar("01/03/1991", "Perth", date_format="%d/%m/%Y"), table.scalar(1991.2, "Perth"))
+
+        # Arrays, timezones and other types are left to the array lookups
+        self.assertIsNone(table.scalar(np.array(["1991-03-01"]), "Perth"))
+        self.assertIsNone(table.scalar(datetime(2001, 3, 1, tzinfo=timezone.utc), "Perth"))
+        self.assertIsNone(table.scalar(True, "Perth"))
+        with self.assertRaises(ValueError):
+            table.scalar("1991-03-01", "Auckland")
+
+    def test_scalar_calc_inflation(self):
+        cpi = inflation.CPI()
+        for original, evaluation in [("2001-03-01", "2024-01-01"), (1950.25, "1991"), ("1900", "2000"), (1990, None)]:
+            with self.subTest(original=original, evaluation=evaluation):
+                expected = cpi.calc_inflation(np.array([13.0]), original, evaluation, location="Darwin").item()
+                np.testing.assert_array_equal(cpi.calc_inflation(13, original, evaluation, location="Darwin"), expected)
+                np.testing.assert_array_equal(
+                    cpi.cpi_at(original, "Darwin"), cpi.cpi_at(np.array([original]), "Darwin")
+                )
+
+    def test_scalar_cache(self):
+        with patch.object(table_module, "SCALAR_CACHE_SIZE", 2):
+            cpi = inflation.CPI()
+            table = cpi.table
+        with patch.object(inflation, "convert_date", wraps=inflation.convert_date) as convert_date:
+            for _ in range(3):
+                cpi.calc_inflation(1, "1991-03-01", "2010-06-01", location="Sydney")
+        convert_date.assert_not_called()
+        info = table.scalar_cache.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize, info.maxsize), (4, 2, 2, 2))
+
+        # A third date evicts the least recently used one
+        cpi.cpi_at("2020-01-01", "Sydney")
+        self.assertEqual(table.scalar_cache.cache_info().currsize, 2)
+
+    def test_relative_dates_not_cached(self):
+        table = inflation.CPI().table
+        for relative in ["today", "now"]:
+            with self.subTest(date=relative):
+                self.assertEqual(table.scalar(relative, "Perth"), table.scalar(date.today(), "Perth"))
+        self.assertEqual(table.scalar_cache.cache_info().currsize, 1)
+
+        # The same string gives a new quarter once the day it refers to has moved on
+        days = [table_module.scalar_to_days("1991-03-01"), table_module.scalar_to_days("2010-06-01")]
+        expected = [table.scalar("1991-03-01", "Perth"), table.scalar("2010-06-01", "Perth")]
+        with patch.object(table_module, "scalar_to_days", side_effect=days):
+            self.assertEqual([table.scalar("today", "Perth"), table.scalar("today", "Perth")], expected)